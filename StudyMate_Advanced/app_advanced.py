@@ -6,13 +6,21 @@ Hackathon Project - TripleMind Team
 
 import streamlit as st
 import os
+import sys
 import json
 from datetime import datetime
 from dotenv import load_dotenv
 
+# Shared StudyMate modules live in the project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 # Import our custom modules
-from rag_engine import AdvancedRAGEngine
+from rag_engine import AdvancedRAGEngine, score_label
 from watsonx_client import WatsonxClient
+from streaming import TimedStream
+from http_transport import get_transport
+from answer_cache import get_answer_cache
+from coalescing import get_coalescer, normalize_question, LeaderInterrupted
 
 # Load environment variables
 load_dotenv()
@@ -105,6 +113,11 @@ def initialize_components():
             with st.spinner("🔄 Initializing Advanced RAG Engine..."):
                 st.session_state.rag_engine = AdvancedRAGEngine()
             st.success("✅ RAG Engine initialized successfully!")
+            
+            # Reuse a previously saved index instead of re-embedding the library
+            if st.session_state.rag_engine.load_index():
+                st.session_state.documents_processed = True
+                st.info("📂 Loaded saved document index from disk")
         
         if st.session_state.watsonx_client is None:
             with st.spinner("🔄 Initializing IBM Watsonx Client..."):
@@ -129,7 +142,16 @@ def process_documents(uploaded_files):
             
             if success:
                 st.session_state.documents_processed = True
+                st.session_state.rag_engine.save_index()
                 st.success(f"✅ Successfully processed {len(uploaded_files)} document(s)")
+                ingestion = st.session_state.rag_engine.last_ingestion_stats
+                if ingestion.get('pages'):
+                    st.caption(
+                        f"⚡ {ingestion['pages']} pages → {ingestion['chunks']} chunks in {ingestion['seconds']}s "
+                        f"({ingestion['pages_per_second']} pages/sec, {ingestion['workers']} extraction workers)"
+                    )
+                for failure in ingestion.get('failed', []):
+                    st.warning(f"⚠️ Skipped {failure['filename']}: {failure['error']}")
                 return True
             else:
                 st.error("❌ Failed to process documents")
@@ -139,20 +161,42 @@ def process_documents(uploaded_files):
         st.error(f"❌ Error processing documents: {str(e)}")
         return False
 
-def generate_answer(question: str):
-    """Generate answer using RAG pipeline and Watsonx"""
+def stream_watsonx_answer(client, question: str, context: str, cache_key, scope=None, embedding=None):
+    """Stream a Watsonx answer and add it to the answer cache once it is complete"""
+    parts = []
+    for piece in client.generate_response_stream(question, context):
+        parts.append(piece)
+        yield piece
+    get_answer_cache().store(cache_key, "".join(parts), scope, embedding)
+    return True
+
+def generate_answer(question: str, filenames=None, page_start=None, page_end=None):
+    """
+    Generate answer using RAG pipeline and Watsonx, optionally searching only some documents and pages
+    
+    The answer is streamed into the page as Watsonx generates it, unless the
+    same prompt (or, with ANSWER_CACHE_SIMILARITY set, a similar question over
+    the same documents) was already answered in this process. An identical
+    question over the same documents that is being answered right now for
+    another session is not sent again: this request follows that answer as it
+    streams. Returns the answer, the search results and answer info: the
+    cache source ('exact', 'semantic' or None), whether the generation was
+    shared, and the time to first token and total time.
+    """
     if not st.session_state.rag_engine or not st.session_state.watsonx_client:
         st.error("❌ Components not initialized")
-        return None, None
+        return None, None, None
     
     try:
         # Get relevant context using semantic search
         with st.spinner("🔍 Performing semantic search..."):
-            search_results = st.session_state.rag_engine.semantic_search(question, top_k=3)
+            search_results = st.session_state.rag_engine.semantic_search(
+                question, top_k=3, filenames=filenames, page_start=page_start, page_end=page_end
+            )
         
         if not search_results:
             st.warning("⚠️ No relevant context found for your question")
-            return None, None
+            return None, None, None
         
         # Prepare context for LLM
         context_parts = []
@@ -160,8 +204,9 @@ def generate_answer(question: str):
             chunk = result['chunk']
             similarity = result['similarity_score']
             
-            context_part = f"Context {i+1} (Similarity: {similarity:.3f}):\n"
-            context_part += f"Source: {chunk['filename']}, Chunk {chunk['chunk_id']}\n"
+            context_part = f"Context {i+1} ({score_label(result)}: {similarity:.3f}):\n"
+            context_part += f"Source: {chunk['filename']}, Chunk {chunk['chunk_id']}, "
+            context_part += f"Pages {chunk.get('page_start', 1)}-{chunk.get('page_end', 1)}\n"
             context_part += f"Text: {chunk['text']}\n"
             context_part += "-" * 50 + "\n"
             
@@ -169,20 +214,63 @@ def generate_answer(question: str):
         
         context = "\n".join(context_parts)
         
-        # Generate answer using Watsonx
-        with st.spinner("🧠 Generating AI response with IBM Watsonx..."):
-            result = st.session_state.watsonx_client.generate_response(question, context)
+        # Students asking the same question over the same documents share one generation
+        client = st.session_state.watsonx_client
+        answer_cache = get_answer_cache()
+        cache_key = answer_cache.make_key('watsonx', client.model_id, client.generation_params(), question, context)
+        scope = embedding = None
+        if answer_cache.semantic:
+            scope = st.session_state.rag_engine.corpus_key(filenames, page_start, page_end)
+            embedding = st.session_state.rag_engine.encode_query(question)
+        cached = answer_cache.lookup(cache_key, scope, embedding)
+        if cached is not None:
+            return str(cached), search_results, {
+                'cache': cached.source,
+                'similarity': cached.similarity,
+                'shared': False,
+                'first_token_seconds': None,
+                'total_seconds': None
+            }
         
-        if result and result.get('success'):
-            return result['response'], search_results
+        # Generate answer using Watsonx, showing the text as it is generated
+        placeholder = st.empty()
+        placeholder.info("🧠 Generating AI response with IBM Watsonx...")
+        # Identical questions over the same documents share one in-flight Watsonx call
+        flight_key = (
+            'watsonx', client.model_id, json.dumps(client.generation_params(), sort_keys=True),
+            normalize_question(question), st.session_state.rag_engine.corpus_key(filenames, page_start, page_end)
+        )
+        coalesced = get_coalescer().stream(
+            flight_key, lambda: stream_watsonx_answer(client, question, context, cache_key, scope, embedding)
+        )
+        stream = TimedStream(coalesced)
+        try:
+            for _ in stream:
+                placeholder.markdown(stream.text + "▌")
+        except LeaderInterrupted:
+            placeholder.empty()
+            st.error("❌ The identical question this one joined was interrupted. Please ask again.")
+            return None, None, None
+        except RuntimeError as e:
+            placeholder.empty()
+            st.error(f"❌ Failed to generate answer from Watsonx: {str(e)}")
+            return None, None, None
+        placeholder.empty()
+        
+        if coalesced.shared and not coalesced.result:
+            st.error("❌ The identical question this one joined did not finish. Please ask again.")
+            return None, None, None
+        if stream.text:
+            return stream.text, search_results, dict(
+                stream.timings(), cache=None, similarity=None, shared=coalesced.shared
+            )
         else:
-            error_msg = result.get('error', 'Unknown error') if result else 'No response'
-            st.error(f"❌ Failed to generate answer from Watsonx: {error_msg}")
-            return None, None
+            st.error("❌ Failed to generate answer from Watsonx: No response generated")
+            return None, None, None
             
     except Exception as e:
         st.error(f"❌ Error generating answer: {str(e)}")
-        return None, None
+        return None, None, None
 
 def main():
     """Main application function"""
@@ -222,6 +310,18 @@ def main():
                 if process_documents(uploaded_files):
                     st.rerun()
         
+        # Remove an indexed document without rebuilding the rest of the index
+        if st.session_state.rag_engine and st.session_state.rag_engine.document_mapping:
+            document_to_remove = st.selectbox(
+                "Indexed Documents",
+                options=list(st.session_state.rag_engine.document_mapping.keys())
+            )
+            if st.button("🗑️ Remove Document"):
+                if st.session_state.rag_engine.remove_document(document_to_remove):
+                    st.session_state.rag_engine.save_index()
+                    st.session_state.documents_processed = bool(st.session_state.rag_engine.chunks)
+                    st.rerun()
+        
         # System status
         st.header("🔧 System Status")
         
@@ -241,8 +341,32 @@ def main():
             if stats['total_chunks'] > 0:
                 st.success("✅ Advanced RAG Pipeline: ACTIVE")
                 st.info(f"🎯 Processing: {stats['chunk_size']} words per chunk, {stats['chunk_overlap']} overlap")
+                cache_stats = stats['embedding_cache']
+                st.caption(
+                    f"🗄️ Embedding cache: {cache_stats['memory_hits'] + cache_stats['disk_hits']} hits, "
+                    f"{cache_stats['misses']} misses ({cache_stats['hit_rate']:.0%} hit rate)"
+                )
+                st.caption(
+                    f"⚡ Retrieval cache: {stats['query_cache']['hit_rate']:.0%} query / "
+                    f"{stats['result_cache']['hit_rate']:.0%} result hit rate"
+                )
+                reranker_stats = stats['reranker']
+                if reranker_stats and reranker_stats['calls']:
+                    st.caption(
+                        f"🎯 Re-ranking: {reranker_stats['ms_per_pair']} ms/pair, "
+                        f"{reranker_stats['score_cache']['hit_rate']:.0%} score cache hit rate, "
+                        f"{reranker_stats['skipped_over_budget'] + reranker_stats['truncated_over_budget']} "
+                        f"of {reranker_stats['calls']} over budget"
+                    )
             else:
                 st.warning("⚠️ RAG Pipeline: Waiting for documents")
+            
+            model_stats = stats['embedding_model']
+            if 'load_time_seconds' in model_stats:
+                st.caption(
+                    f"🧠 Shared embedding model: loaded in {model_stats['load_time_seconds']}s, "
+                    f"{model_stats['memory_mb']} MB"
+                )
         
         if st.session_state.watsonx_client:
             model_info = st.session_state.watsonx_client.get_model_info()
@@ -258,6 +382,31 @@ def main():
                 st.metric("🔗 API Status", "Connected")
             
             st.success("✅ IBM Watsonx AI: Ready for Generation")
+            token_stats = model_info['iam_token']
+            if token_stats['expires_in_seconds'] is not None:
+                st.caption(
+                    f"🔑 IAM token: {token_stats['hit_rate']:.0%} of requests skipped the IAM round-trip, "
+                    f"renews in the background, expires in {token_stats['expires_in_seconds'] // 60} min"
+                )
+            answer_cache_stats = get_answer_cache().stats()
+            if answer_cache_stats['exact_hits'] + answer_cache_stats['semantic_hits'] + answer_cache_stats['misses']:
+                st.caption(
+                    f"⚡ Answer cache: {answer_cache_stats['hit_rate']:.0%} hit rate "
+                    f"({answer_cache_stats['exact_hits']} exact, {answer_cache_stats['semantic_hits']} similar), "
+                    f"{answer_cache_stats['answers']} answers shared by all sessions"
+                )
+            coalescing_stats = get_coalescer().stats()
+            if coalescing_stats['coalesced_requests']:
+                st.caption(
+                    f"🤝 {coalescing_stats['coalesced_requests']} identical questions joined an answer "
+                    f"already in progress ({coalescing_stats['upstream_calls']} Watsonx calls)"
+                )
+            for host, host_stats in get_transport().stats()['hosts'].items():
+                if host_stats['avg_ms'] is not None:
+                    st.caption(
+                        f"🔌 {host}: {host_stats['requests']} requests, "
+                        f"{host_stats['reuse_rate']:.0%} on reused connections, {host_stats['avg_ms']:.0f} ms avg"
+                    )
         
         # Test connections
         st.header("🧪 Test Connections")
@@ -328,14 +477,42 @@ def main():
             placeholder="e.g., What is machine learning? Explain neural networks..."
         )
         
+        # Optional search scope
+        with st.expander("🎯 Search Scope (optional)"):
+            scope_documents = st.multiselect(
+                "Only search these documents:",
+                options=sorted(st.session_state.rag_engine.document_mapping)
+            )
+            scope_col1, scope_col2 = st.columns(2)
+            with scope_col1:
+                scope_page_start = st.number_input("From page", min_value=0, value=0, help="0 = first page")
+            with scope_col2:
+                scope_page_end = st.number_input("To page", min_value=0, value=0, help="0 = last page")
+        
         if st.button("🚀 Generate Answer", type="primary") and question:
-            answer, search_results = generate_answer(question)
+            answer, search_results, answer_info = generate_answer(
+                question,
+                filenames=scope_documents or None,
+                page_start=int(scope_page_start) or None,
+                page_end=int(scope_page_end) or None
+            )
             
             if answer and search_results:
                 # Display answer
                 st.header("🤖 AI-Generated Answer")
                 st.markdown(f"**Question:** {question}")
                 st.markdown(f"**Answer:** {answer}")
+                if answer_info['cache'] == 'exact':
+                    st.caption("⚡ Answer from cache: this question was already answered over these documents")
+                elif answer_info['cache'] == 'semantic':
+                    st.caption(f"⚡ Answer from cache: a similar question (similarity {answer_info['similarity']:.2f}) "
+                               f"was already answered over these documents")
+                else:
+                    st.caption(f"⏱️ First token after {answer_info['first_token_seconds']:.1f}s · "
+                               f"total {answer_info['total_seconds']:.1f}s")
+                if answer_info['shared']:
+                    st.caption("🤝 The same question was already being answered for another student; "
+                               "this answer was shared instead of asking Watsonx again")
                 
                 # Display source chunks
                 st.header("📚 Source Context (Retrieved Chunks)")
@@ -343,8 +520,9 @@ def main():
                     chunk = result['chunk']
                     similarity = result['similarity_score']
                     
-                    with st.expander(f"Context {i+1} - {chunk['filename']} (Similarity: {similarity:.3f})"):
-                        st.markdown(f"**Source:** {chunk['filename']}, Chunk {chunk['chunk_id']}")
+                    with st.expander(f"Context {i+1} - {chunk['filename']} ({score_label(result)}: {similarity:.3f})"):
+                        st.markdown(f"**Source:** {chunk['filename']}, Chunk {chunk['chunk_id']}, "
+                                    f"Pages {chunk.get('page_start', 1)}-{chunk.get('page_end', 1)}")
                         st.markdown(f"**Word Count:** {chunk['word_count']}")
                         st.markdown(f"**Text:**")
                         # Display text content directly without HTML wrapping
@@ -362,7 +540,8 @@ def main():
                     'timestamp': timestamp,
                     'question': question,
                     'answer': answer,
-                    'sources': [r['chunk']['filename'] for r in search_results]
+                    'sources': [r['chunk']['filename'] for r in search_results],
+                    'answer_info': answer_info
                 }
                 st.session_state.chat_history.append(chat_entry)
                 
@@ -0,0 +1,527 @@
+"""
+StudyMate Advanced Benchmarks
+Performance measurements for the RAG engine components
+Hackathon Project - TripleMind Team
+
+Usage:
+    python benchmark.py index [--vectors 100000] [--dimension 384] [--queries 200] [--top-k 10]
+    python benchmark.py index --embeddings chunk_embeddings.npy   # real vectors instead of synthetic
+    python benchmark.py search [--chunks 5000] [--queries 500] [--top-k 3]
+    python benchmark.py chunks [--chunks 200000]
+    python benchmark.py extract [--pdf big.pdf] [--size-mb 900] [--pages 3000]
+    python benchmark.py chunking [--size-mb 20]
+    python benchmark.py lexical [--chunks 100000] [--queries 1000] [--top-k 20]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List, Tuple
+import numpy as np
+import faiss
+import fitz  # PyMuPDF
+
+from vector_index import load_index_config, build_index, configure_search
+from chunk_store import ChunkStore
+from chunk_text_store import ChunkTextStore
+
+# Shared StudyMate modules live in the project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pdf_extraction import pdf_path, iter_pages
+from chunking import stream_chunks, stream_character_chunks, chunk_characters
+from lexical_index import BM25Index, reciprocal_rank_fusion
+
+
+def synthetic_embeddings(n_vectors: int, dimension: int, n_clusters: int = 1000, seed: int = 42) -> np.ndarray:
+    """Clustered unit vectors, closer to sentence embeddings than uniform noise"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(n_clusters, dimension)).astype('float32')
+    assignments = rng.integers(0, n_clusters, size=n_vectors)
+    vectors = centers[assignments] + 1.0 * rng.normal(size=(n_vectors, dimension)).astype('float32')
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype('float32')
+
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray) -> float:
+    """Fraction of the exact top-k neighbours that the approximate search returned"""
+    hits = sum(len(set(f) & set(t)) for f, t in zip(found, truth))
+    return hits / truth.size
+
+
+def benchmark_index(args) -> List[Dict]:
+    """Recall and latency of each index backend against the flat baseline"""
+    if args.embeddings:
+        data = np.load(args.embeddings).astype('float32')
+        np.random.default_rng(0).shuffle(data)
+        args.vectors, args.dimension = len(data) - args.queries, data.shape[1]
+    else:
+        data = synthetic_embeddings(args.vectors + args.queries, args.dimension)
+    vectors, queries = data[:args.vectors], data[args.vectors:]
+    ids = np.arange(args.vectors, dtype='int64')
+
+    base_config = load_index_config()
+    sweeps = [
+        ('flat', [{}]),
+        ('ivf', [{'ivf_nprobe': nprobe} for nprobe in (4, 16, 64)]),
+        ('hnsw', [{'hnsw_ef_search': ef} for ef in (32, 64, 128)]),
+        ('ivfpq', [{'ivf_nprobe': nprobe} for nprobe in (16, 64)])
+    ]
+
+    truth = None
+    rows = []
+    for index_type, param_sets in sweeps:
+        start = time.perf_counter()
+        index = build_index(index_type, args.dimension, base_config, vectors)
+        index.add_with_ids(vectors, ids)
+        build_seconds = time.perf_counter() - start
+
+        for overrides in param_sets:
+            configure_search(index, dict(base_config, **overrides))
+
+            # One query at a time, like semantic_search
+            start = time.perf_counter()
+            found = np.vstack([index.search(queries[i:i + 1], args.top_k)[1] for i in range(len(queries))])
+            latency_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+            if truth is None:
+                truth = found
+            rows.append({
+                'index': index_type,
+                'params': ', '.join(f"{k}={v}" for k, v in overrides.items()) or '-',
+                'build_s': build_seconds,
+                'latency_ms': latency_ms,
+                'recall': recall_at_k(found, truth)
+            })
+
+    print(f"\nIndex benchmark: {args.vectors} vectors, {args.dimension}D, "
+          f"{args.queries} queries, recall@{args.top_k} vs flat")
+    print(f"{'index':<8} {'params':<18} {'build (s)':>10} {'query (ms)':>11} {'recall':>8}")
+    for row in rows:
+        print(f"{row['index']:<8} {row['params']:<18} {row['build_s']:>10.2f} "
+              f"{row['latency_ms']:>11.3f} {row['recall']:>8.3f}")
+    return rows
+
+
+def synthetic_chunks(n_chunks: int, seed: int = 7) -> List[Dict]:
+    """Short pseudo-academic chunks for end-to-end engine benchmarks"""
+    rng = np.random.default_rng(seed)
+    vocabulary = ("neural network gradient descent backpropagation loss function matrix vector "
+                  "probability distribution entropy regression classification kernel optimization "
+                  "convolution recurrent attention transformer embedding layer activation").split()
+    chunks = []
+    for i in range(n_chunks):
+        words = rng.choice(vocabulary, size=120)
+        chunks.append({'text': ' '.join(words) + '.', 'filename': f"doc{i % 20}.pdf", 'chunk_id': i})
+    return chunks
+
+
+def benchmark_search(args):
+    """Per-query cost of looping semantic_search versus one semantic_search_many call"""
+    from rag_engine import AdvancedRAGEngine
+
+    engine = AdvancedRAGEngine()
+    chunks = synthetic_chunks(args.chunks)
+    engine.build_faiss_index(engine.generate_embeddings(chunks), chunks)
+
+    questions = [f"what is {chunk['text'][:40]}?" for chunk in synthetic_chunks(args.queries, seed=11)]
+
+    start = time.perf_counter()
+    for question in questions:
+        engine.semantic_search(question, args.top_k)
+    loop_ms = (time.perf_counter() - start) * 1000 / len(questions)
+
+    start = time.perf_counter()
+    engine.semantic_search_many(questions, args.top_k)
+    batch_ms = (time.perf_counter() - start) * 1000 / len(questions)
+
+    print(f"\nSearch benchmark: {args.chunks} chunks, {args.queries} queries, top_k={args.top_k}")
+    print(f"semantic_search loop:  {loop_ms:.3f} ms/query")
+    print(f"semantic_search_many:  {batch_ms:.3f} ms/query ({loop_ms / batch_ms:.1f}x faster)")
+
+
+def engine_chunks(n_chunks: int, words_per_chunk: int = 120, chunks_per_document: int = 200):
+    """Chunk dicts shaped like stream_chunks output, built one at a time"""
+    rng = np.random.default_rng(3)
+    vocabulary = ("neural network gradient descent backpropagation loss function matrix vector "
+                  "probability distribution entropy regression classification kernel").split()
+    for i in range(n_chunks):
+        chunk_id = i % chunks_per_document
+        words = [vocabulary[w] for w in rng.integers(0, len(vocabulary), size=words_per_chunk)]
+        yield {
+            'text': ' '.join(words),
+            'filename': f"lecture_notes_{i // chunks_per_document:05d}.pdf",
+            'chunk_id': chunk_id,
+            'page_start': chunk_id // 2 + 1,
+            'page_end': chunk_id // 2 + 2,
+            'word_count': words_per_chunk,
+            'start_word': chunk_id * (words_per_chunk - 20),
+            'end_word': chunk_id * (words_per_chunk - 20) + words_per_chunk,
+            'vector_id': i
+        }
+
+
+def fill_chunk_store(store: ChunkStore, n_chunks: int, batch_size: int = 1000) -> ChunkStore:
+    """Append synthetic chunks to a store in ingestion-sized batches"""
+    batch = []
+    for chunk in engine_chunks(n_chunks):
+        batch.append(chunk)
+        if len(batch) == batch_size:
+            store.extend(batch, [c['vector_id'] for c in batch])
+            batch = []
+    store.extend(batch, [c['vector_id'] for c in batch])
+    return store
+
+
+def time_chunk_load(records: List[Dict], text_store: ChunkTextStore = None) -> float:
+    """Seconds to parse saved chunk records and rebuild the store, as load_index does"""
+    payload = json.dumps({'chunks': records})
+    start = time.perf_counter()
+    ChunkStore.from_chunks(json.loads(payload)['chunks'], text_store=text_store)
+    return time.perf_counter() - start
+
+
+def benchmark_chunks(args) -> Dict:
+    """Memory per chunk of chunk dicts, the columnar ChunkStore and ChunkStore with text on disk"""
+    tracemalloc.start()
+
+    start = tracemalloc.get_traced_memory()[0]
+    chunks = {chunk['vector_id']: chunk for chunk in engine_chunks(args.chunks)}
+    dict_bytes = tracemalloc.get_traced_memory()[0] - start
+    del chunks
+
+    start = tracemalloc.get_traced_memory()[0]
+    store = fill_chunk_store(ChunkStore(), args.chunks)
+    store_bytes = tracemalloc.get_traced_memory()[0] - start
+    text_bytes = store.memory_usage()['text_bytes']
+    memory_records = store.to_dicts()
+    del store
+
+    with tempfile.TemporaryDirectory() as directory:
+        text_store = ChunkTextStore(os.path.join(directory, 'chunk_text.sqlite'))
+        start = tracemalloc.get_traced_memory()[0]
+        store = fill_chunk_store(ChunkStore(text_store=text_store), args.chunks)
+        disk_store_bytes = tracemalloc.get_traced_memory()[0] - start
+        tracemalloc.stop()
+
+        memory_load_s = time_chunk_load(memory_records)
+        disk_load_s = time_chunk_load(store.to_dicts(), text_store)
+        disk_bytes = text_store.stats()['disk_bytes']
+
+    print(f"\nChunk memory benchmark: {args.chunks} chunks, {text_bytes / args.chunks:.0f} bytes of text each")
+    print(f"{'storage':<22} {'RAM (B/chunk)':>14} {'excl. text (B/chunk)':>21} {'load (s)':>9}")
+    rows = (
+        ('chunk dicts', dict_bytes, dict_bytes - text_bytes, None),
+        ('ChunkStore', store_bytes, store_bytes - text_bytes, memory_load_s),
+        ('ChunkStore + SQLite', disk_store_bytes, disk_store_bytes, disk_load_s)
+    )
+    for name, total, metadata, load_s in rows:
+        load = f"{load_s:>9.2f}" if load_s is not None else f"{'-':>9}"
+        print(f"{name:<22} {total / args.chunks:>14.1f} {metadata / args.chunks:>21.1f} {load}")
+    print(f"SQLite text on disk: {disk_bytes / args.chunks:.1f} bytes/chunk (zlib)")
+    return {'dict_bytes': dict_bytes, 'store_bytes': store_bytes, 'disk_store_bytes': disk_store_bytes}
+
+
+def generate_pdf(path: str, size_mb: int, n_pages: int, seed: int = 5):
+    """Text pages, each with an incompressible image so the file reaches the target size"""
+    rng = np.random.default_rng(seed)
+    side = max(int((size_mb * 1024 * 1024 / n_pages / 3) ** 0.5), 1)
+    paragraph = ("Gradient descent updates the parameters in the direction of the negative gradient "
+                 "of the loss function, scaled by the learning rate. ") * 12
+    doc = fitz.open()
+    for page_num in range(n_pages):
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(50, 50, 550, 400), f"Section {page_num + 1}. {paragraph}", fontsize=9)
+        noise = rng.integers(0, 256, size=side * side * 3, dtype=np.uint8).tobytes()
+        image = fitz.Pixmap(fitz.csRGB, side, side, noise, 0)
+        page.insert_image(fitz.Rect(50, 420, 550, 790), stream=image.tobytes("png"))
+    doc.save(path)
+    doc.close()
+
+
+def _extract_whole_upload(path: str) -> int:
+    """Previous extraction: read the upload into bytes and concatenate page text"""
+    with open(path, 'rb') as pdf_file:
+        doc = fitz.open(stream=pdf_file.read(), filetype="pdf")
+    text = ""
+    for page_num in range(len(doc)):
+        text += f"\n--- Page {page_num + 1} ---\n{doc.load_page(page_num).get_text()}\n"
+    doc.close()
+    return len(text)
+
+
+def _extract_lazily(path: str) -> int:
+    """Current extraction: spooled upload opened by path, pages read lazily, linear join"""
+    with open(path, 'rb') as pdf_file, pdf_path(pdf_file) as spooled:
+        text = "".join(f"\n--- Page {page_num} ---\n{page_text}\n" for page_num, page_text in iter_pages(spooled))
+    return len(text)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB"""
+    try:
+        # VmHWM belongs to this process image; ru_maxrss survives exec on Linux
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _measure_extraction(method, path: str, results):
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    characters = method(path)
+    seconds = time.perf_counter() - start
+    results.put((baseline, peak_rss_mb(), seconds, characters))
+
+
+def benchmark_extract(args) -> List[Dict]:
+    """Peak RSS and time to extract one large PDF, whole-upload versus lazy extraction"""
+    directory = tempfile.mkdtemp()
+    path = args.pdf
+    if not path:
+        path = os.path.join(directory, 'generated.pdf')
+        print(f"📄 Generating a {args.size_mb} MB, {args.pages}-page PDF...")
+        generate_pdf(path, args.size_mb, args.pages)
+
+    context = multiprocessing.get_context('spawn')
+    rows = []
+    try:
+        for name, method in (('read() + text +=', _extract_whole_upload), ('path + lazy pages', _extract_lazily)):
+            # A fresh process per method so each peak RSS is its own
+            results = context.Queue()
+            process = context.Process(target=_measure_extraction, args=(method, path, results))
+            process.start()
+            baseline, peak, seconds, characters = results.get()
+            process.join()
+            rows.append({'method': name, 'baseline_mb': baseline, 'peak_mb': peak,
+                         'seconds': seconds, 'characters': characters})
+    finally:
+        if not args.pdf:
+            os.remove(path)
+        os.rmdir(directory)
+
+    size_mb = args.size_mb if not args.pdf else os.path.getsize(args.pdf) / (1024 * 1024)
+    print(f"\nExtraction benchmark: {size_mb:.0f} MB PDF")
+    print(f"{'method':<20} {'peak RSS (MB)':>14} {'above start (MB)':>17} {'time (s)':>9}")
+    for row in rows:
+        print(f"{row['method']:<20} {row['peak_mb']:>14.0f} {row['peak_mb'] - row['baseline_mb']:>17.0f} "
+              f"{row['seconds']:>9.2f}")
+    return rows
+
+
+def _legacy_chunk_text(text: str, chunk_size: int = 1000, overlap: int = 200) -> List[str]:
+    """Previous utils.chunk_text: character windows over the whole document"""
+    if len(text) <= chunk_size:
+        return [text]
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = start + chunk_size
+        if end < len(text):
+            for i in range(end, max(start, end - 100), -1):
+                if text[i] in '.!?':
+                    end = i + 1
+                    break
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        start = end - overlap
+        if start >= len(text):
+            break
+    return chunks
+
+
+def _legacy_page_chunks(pages_data: List[Dict], chunk_size: int = 1000, overlap: int = 200) -> List[Dict]:
+    """Previous app_simple.create_chunks_with_metadata: per-page character windows"""
+    chunks = []
+    for page_data in pages_data:
+        page_num = page_data['page']
+        text = page_data['text']
+        start = 0
+        while start < len(text):
+            end = start + chunk_size
+            chunk_text = text[start:end]
+            if start > 0:
+                chunk_text = text[start - overlap:end]
+            chunks.append({'doc': 'Unknown', 'page': page_num, 'text': chunk_text.strip(), 'start_pos': start})
+            start = end - overlap
+            if start >= len(text):
+                break
+    return chunks
+
+
+def _legacy_word_chunks(text: str, chunk_size: int = 500, chunk_overlap: int = 100) -> List[Dict]:
+    """Previous AdvancedRAGEngine.create_intelligent_chunks: word windows over the re-split document"""
+    words = text.split()
+    chunks = []
+    start = 0
+    chunk_id = 0
+    while start < len(words):
+        end = start + chunk_size
+        if end < len(words):
+            for i in range(end, max(start, end - 50), -1):
+                if i < len(words) and words[i].endswith(('.', '!', '?')):
+                    end = i + 1
+                    break
+        chunk_words = words[start:end]
+        chunks.append({'text': ' '.join(chunk_words), 'filename': 'doc.pdf', 'chunk_id': chunk_id,
+                       'page_start': 1, 'page_end': 1, 'word_count': len(chunk_words),
+                       'start_word': start, 'end_word': end})
+        chunk_id += 1
+        start = end - chunk_overlap
+        if start >= len(words):
+            break
+    return chunks
+
+
+def synthetic_pages(size_mb: int, page_words: int = 450, seed: int = 9) -> List[Tuple[int, str]]:
+    """Pages of sentences built from a fixed vocabulary, totalling about size_mb of text"""
+    rng = np.random.default_rng(seed)
+    vocabulary = ("the model learns a mapping from inputs to outputs by minimizing the expected loss "
+                  "over training examples while regularization controls its capacity").split()
+    pages = []
+    total = 0
+    while total < size_mb * 1024 * 1024:
+        words = [vocabulary[i] for i in rng.integers(0, len(vocabulary), size=page_words)]
+        for i in range(11, page_words, 12):
+            words[i] += '.'
+        text = ' '.join(words)
+        pages.append((len(pages) + 1, text))
+        total += len(text)
+    return pages
+
+
+def benchmark_chunking(args) -> List[Dict]:
+    """Throughput (MB/s) of the shared streaming chunker against the three previous chunkers"""
+    pages = synthetic_pages(args.size_mb)
+    document = '\n'.join(text for _, text in pages)
+    pages_data = [{'page': page_num, 'text': text} for page_num, text in pages]
+    megabytes = len(document.encode('utf-8')) / (1024 * 1024)
+
+    runs = [
+        ('utils.chunk_text (before)', lambda: _legacy_chunk_text(document)),
+        ('utils.chunk_text (shared)', lambda: list(chunk_characters(document, 1000, 200))),
+        ('app_simple chunks (before)', lambda: _legacy_page_chunks(pages_data)),
+        ('app_simple chunks (shared)', lambda: list(stream_character_chunks(pages, 1000, 200))),
+        ('engine words (before)', lambda: _legacy_word_chunks(document)),
+        ('engine words (shared)', lambda: list(stream_chunks(pages, 500, 100, 'doc.pdf')))
+    ]
+
+    rows = []
+    for name, run in runs:
+        start = time.perf_counter()
+        chunks = run()
+        seconds = time.perf_counter() - start
+        rows.append({'chunker': name, 'chunks': len(chunks), 'seconds': seconds, 'mb_per_s': megabytes / seconds})
+
+    print(f"\nChunking benchmark: {megabytes:.1f} MB of text in {len(pages)} pages")
+    print(f"{'chunker':<28} {'chunks':>8} {'time (s)':>9} {'MB/s':>8}")
+    for row in rows:
+        print(f"{row['chunker']:<28} {row['chunks']:>8} {row['seconds']:>9.2f} {row['mb_per_s']:>8.1f}")
+    return rows
+
+
+def zipf_texts(n_texts: int, words_per_text: int = 120, vocabulary_size: int = 50000, seed: int = 13) -> List[str]:
+    """Texts whose word frequencies follow Zipf's law, like real prose"""
+    rng = np.random.default_rng(seed)
+    ranks = np.minimum(rng.zipf(1.2, size=(n_texts, words_per_text)), vocabulary_size)
+    return [' '.join(f"term{rank}" for rank in row) for row in ranks]
+
+
+def benchmark_lexical(args) -> Dict:
+    """Indexing rate, memory and per-query latency of the BM25 index used by hybrid search"""
+    texts = zipf_texts(args.chunks)
+    index = BM25Index()
+
+    start = time.perf_counter()
+    for batch_start in range(0, len(texts), 64):
+        batch = texts[batch_start:batch_start + 64]
+        index.add(range(batch_start, batch_start + len(batch)), batch)
+    add_seconds = time.perf_counter() - start
+
+    # Questions of three words drawn from random chunks
+    rng = np.random.default_rng(17)
+    queries = [' '.join(rng.choice(texts[i].split(), size=3)) for i in rng.integers(0, len(texts), args.queries)]
+    vector_ranking = list(range(args.top_k))
+
+    start = time.perf_counter()
+    for query in queries:
+        lexical_ranking = [doc_id for doc_id, _ in index.search(query, args.top_k)]
+        reciprocal_rank_fusion([vector_ranking, lexical_ranking])
+    query_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    candidates = np.arange(0, args.chunks, 10)
+    start = time.perf_counter()
+    for query in queries:
+        index.search(query, args.top_k, candidate_ids=candidates)
+    filtered_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    stats = index.stats()
+    result = {
+        'chunks': args.chunks,
+        'chunks_per_s': args.chunks / add_seconds,
+        'memory_mb': stats['memory_bytes'] / (1024 * 1024),
+        'query_ms': query_ms,
+        'filtered_query_ms': filtered_ms
+    }
+    print(f"\nLexical benchmark: {args.chunks} chunks, {stats['terms']} terms, {stats['postings']} postings")
+    print(f"indexing:              {result['chunks_per_s']:,.0f} chunks/s")
+    print(f"postings memory:       {result['memory_mb']:.1f} MB")
+    print(f"BM25 search + fusion:  {query_ms:.3f} ms/query (top_k={args.top_k})")
+    print(f"filtered to 10%:       {filtered_ms:.3f} ms/query")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="StudyMate Advanced benchmarks")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    index_parser = subparsers.add_parser('index', help="Recall vs latency of FAISS index backends")
+    index_parser.add_argument('--vectors', type=int, default=100000)
+    index_parser.add_argument('--dimension', type=int, default=384)
+    index_parser.add_argument('--queries', type=int, default=200)
+    index_parser.add_argument('--top-k', type=int, default=10)
+    index_parser.add_argument('--embeddings', help="Path to a .npy matrix of real chunk embeddings")
+    index_parser.set_defaults(func=benchmark_index)
+
+    search_parser = subparsers.add_parser('search', help="Looped vs batched semantic search")
+    search_parser.add_argument('--chunks', type=int, default=5000)
+    search_parser.add_argument('--queries', type=int, default=500)
+    search_parser.add_argument('--top-k', type=int, default=3)
+    search_parser.set_defaults(func=benchmark_search)
+
+    chunks_parser = subparsers.add_parser('chunks', help="Memory per chunk: chunk dicts vs ChunkStore")
+    chunks_parser.add_argument('--chunks', type=int, default=200000)
+    chunks_parser.set_defaults(func=benchmark_chunks)
+
+    extract_parser = subparsers.add_parser('extract', help="Peak RSS of whole-upload vs lazy PDF extraction")
+    extract_parser.add_argument('--pdf', help="Existing PDF to extract instead of a generated one")
+    extract_parser.add_argument('--size-mb', type=int, default=900)
+    extract_parser.add_argument('--pages', type=int, default=3000)
+    extract_parser.set_defaults(func=benchmark_extract)
+
+    chunking_parser = subparsers.add_parser('chunking', help="Throughput of the shared chunker vs the old ones")
+    chunking_parser.add_argument('--size-mb', type=int, default=20)
+    chunking_parser.set_defaults(func=benchmark_chunking)
+
+    lexical_parser = subparsers.add_parser('lexical', help="Indexing rate and query latency of the BM25 index")
+    lexical_parser.add_argument('--chunks', type=int, default=100000)
+    lexical_parser.add_argument('--queries', type=int, default=1000)
+    lexical_parser.add_argument('--top-k', type=int, default=20)
+    lexical_parser.set_defaults(func=benchmark_lexical)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
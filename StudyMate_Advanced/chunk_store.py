@@ -0,0 +1,316 @@
+"""
+StudyMate Advanced Chunk Store
+Columnar chunk records: one text buffer (or an on-disk text store), NumPy metadata columns
+and an interned filename table
+Hackathon Project - TripleMind Team
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+import numpy as np
+
+from chunk_text_store import ChunkTextStore, TEXT_KEY_SIZE, text_key
+
+# Integer chunk fields kept as NumPy columns, with the value used when a chunk lacks one
+INT_FIELDS = {
+    'chunk_id': 0,
+    'page_start': 1,
+    'page_end': 1,
+    'word_count': 0,
+    'start_word': 0,
+    'end_word': 0,
+    'token_count': 0
+}
+CHUNK_FIELDS = ('text', 'filename') + tuple(INT_FIELDS) + ('vector_id',)
+
+INITIAL_CAPACITY = 256
+
+
+class ChunkView(Mapping):
+    """Read-only dict-like view of one stored chunk, created only for the chunks a caller asks for"""
+
+    __slots__ = ('_store', '_row', '_text')
+
+    def __init__(self, store: 'ChunkStore', row: int, text: Optional[str] = None):
+        self._store = store
+        self._row = row
+        self._text = text
+
+    def __getitem__(self, key: str) -> Any:
+        store, row = self._store, self._row
+        if key == 'text':
+            if self._text is None:
+                self._text = store.text_at(row)
+            return self._text
+        if key == 'filename':
+            return store.filename_table[store.filename_codes[row]]
+        if key == 'vector_id':
+            return int(store.ids[row])
+        if key in INT_FIELDS:
+            return int(store.columns[key][row])
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(CHUNK_FIELDS)
+
+    def __len__(self) -> int:
+        return len(CHUNK_FIELDS)
+
+    def __repr__(self) -> str:
+        return f"ChunkView(vector_id={self['vector_id']}, filename={self['filename']!r}, chunk_id={self['chunk_id']})"
+
+
+class ChunkStore:
+    """
+    Append-only columnar storage for chunk records, addressed by vector ID
+
+    Chunk text lives in one UTF-8 buffer with an offsets array, integer
+    metadata in NumPy columns and each filename once in an interned table.
+    Vector IDs are appended in increasing order, so lookups are a binary
+    search. Removal only clears a live flag; compacted() returns a new
+    store without the removed rows, which keeps existing views valid.
+
+    With a ChunkTextStore, text is written to disk and RAM holds only a
+    16-byte content key per chunk; text is read back just for the chunks
+    a caller asks for.
+    """
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY, text_store: Optional[ChunkTextStore] = None):
+        """Initialize an empty store with room for the given number of chunks"""
+        self.size = 0  # rows, including removed ones
+        self.live_count = 0
+        self.text_store = text_store
+        self.text_buffer = bytearray()
+        self.text_keys = np.zeros((capacity if text_store else 0, TEXT_KEY_SIZE), dtype='uint8')
+        self.offsets = np.zeros(capacity + 1, dtype='int64')
+        self.ids = np.zeros(capacity, dtype='int64')
+        self.live = np.zeros(capacity, dtype=bool)
+        self.filename_codes = np.zeros(capacity, dtype='int32')
+        self.columns = {field: np.zeros(capacity, dtype='int32') for field in INT_FIELDS}
+        self.filename_table: List[str] = []
+        self._filename_index: Dict[str, int] = {}
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[Dict], text_store: Optional[ChunkTextStore] = None) -> 'ChunkStore':
+        """Build a store from chunk dicts that carry their vector_id (and text or text_key)"""
+        chunks = sorted(chunks, key=lambda chunk: chunk['vector_id'])
+        store = cls(capacity=max(len(chunks), INITIAL_CAPACITY), text_store=text_store)
+        store.extend(chunks, [chunk['vector_id'] for chunk in chunks])
+        return store
+
+    def __len__(self) -> int:
+        return self.live_count
+
+    def __contains__(self, vector_id) -> bool:
+        return self._row_of(vector_id) is not None
+
+    def __iter__(self) -> Iterator[ChunkView]:
+        """Views of the live chunks in vector ID order"""
+        for row in np.flatnonzero(self.live[:self.size]):
+            yield ChunkView(self, int(row))
+
+    def _grow(self, needed: int):
+        """Double the column capacity until it holds the needed number of rows"""
+        capacity = len(self.ids)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+
+        def resized(array: np.ndarray, length: int) -> np.ndarray:
+            grown = np.zeros(length, dtype=array.dtype)
+            grown[:len(array)] = array
+            return grown
+
+        self.offsets = resized(self.offsets, capacity + 1)
+        self.ids = resized(self.ids, capacity)
+        self.live = resized(self.live, capacity)
+        self.filename_codes = resized(self.filename_codes, capacity)
+        if self.text_store is not None:
+            keys = np.zeros((capacity, TEXT_KEY_SIZE), dtype='uint8')
+            keys[:len(self.text_keys)] = self.text_keys
+            self.text_keys = keys
+        self.columns = {field: resized(column, capacity) for field, column in self.columns.items()}
+
+    def _intern(self, filename: str) -> int:
+        code = self._filename_index.get(filename)
+        if code is None:
+            code = len(self.filename_table)
+            self.filename_table.append(filename)
+            self._filename_index[filename] = code
+        return code
+
+    def extend(self, chunks: List[Dict], vector_ids: List[int]):
+        """Append chunks under the given vector IDs (which must be larger than any stored ID)"""
+        if not chunks:
+            return
+        if self.size and vector_ids[0] <= self.ids[self.size - 1]:
+            raise ValueError("vector IDs must be appended in increasing order")
+
+        n = len(chunks)
+        self._grow(self.size + n)
+        rows = slice(self.size, self.size + n)
+
+        # Fill whole column slices per batch rather than one NumPy scalar at a time
+        if self.text_store is None:
+            encoded = [chunk['text'].encode('utf-8') for chunk in chunks]
+            lengths = np.fromiter(map(len, encoded), dtype='int64', count=n)
+            self.offsets[self.size + 1:self.size + n + 1] = len(self.text_buffer) + np.cumsum(lengths)
+            self.text_buffer += b''.join(encoded)
+        else:
+            new_texts = {}
+            keys = []
+            for chunk in chunks:
+                if 'text' in chunk:
+                    key = text_key(chunk['text'])
+                    new_texts[key] = chunk['text']
+                else:
+                    # Reloaded from a saved index; the text is already on disk
+                    key = bytes.fromhex(chunk['text_key'])
+                keys.append(key)
+            self.text_keys[rows] = np.frombuffer(b''.join(keys), dtype='uint8').reshape(n, TEXT_KEY_SIZE)
+            self.text_store.put_many(new_texts.items())
+
+        self.ids[rows] = vector_ids
+        self.live[rows] = True
+        self.filename_codes[rows] = [self._intern(chunk['filename']) for chunk in chunks]
+        for field, default in INT_FIELDS.items():
+            self.columns[field][rows] = [chunk.get(field, default) for chunk in chunks]
+        self.size += n
+        self.live_count += n
+
+    def _rows_of(self, vector_ids) -> np.ndarray:
+        """Row of each vector ID, or -1 where the ID is unknown or removed"""
+        vector_ids = np.asarray(vector_ids, dtype='int64')
+        ids = self.ids[:self.size]
+        rows = np.searchsorted(ids, vector_ids)
+        inside = rows < self.size
+        found = np.zeros(len(vector_ids), dtype=bool)
+        found[inside] = (ids[rows[inside]] == vector_ids[inside]) & self.live[rows[inside]]
+        return np.where(found, rows, -1)
+
+    def _row_of(self, vector_id) -> Optional[int]:
+        row = int(self._rows_of([vector_id])[0])
+        return row if row >= 0 else None
+
+    def get(self, vector_id, default=None) -> Optional[ChunkView]:
+        """View of one chunk, or default if it is not stored"""
+        row = self._row_of(vector_id)
+        return default if row is None else ChunkView(self, row)
+
+    def __getitem__(self, vector_id) -> ChunkView:
+        row = self._row_of(vector_id)
+        if row is None:
+            raise KeyError(vector_id)
+        return ChunkView(self, row)
+
+    def get_many(self, vector_ids) -> List[Optional[ChunkView]]:
+        """Views for a batch of vector IDs (e.g. a row of FAISS results), None where missing"""
+        rows = [int(row) for row in self._rows_of(vector_ids)]
+        texts = {}
+        if self.text_store is not None:
+            # One disk read for the whole batch instead of one per view
+            texts = self.text_store.get_many([self._text_key(row) for row in rows if row >= 0])
+        return [
+            ChunkView(self, row, texts.get(self._text_key(row)) if texts else None) if row >= 0 else None
+            for row in rows
+        ]
+
+    def _text_key(self, row: int) -> bytes:
+        return self.text_keys[row].tobytes()
+
+    def text_at(self, row: int) -> str:
+        """Decoded text of a row"""
+        if self.text_store is not None:
+            return self.text_store.get(self._text_key(row))
+        return self.text_buffer[self.offsets[row]:self.offsets[row + 1]].decode('utf-8')
+
+    def remove(self, vector_ids) -> int:
+        """Mark chunks as removed; returns how many were live"""
+        rows = self._rows_of(vector_ids)
+        rows = np.unique(rows[rows >= 0])
+        self.live[rows] = False
+        self.live_count -= len(rows)
+        return len(rows)
+
+    def vector_ids(self) -> np.ndarray:
+        """Vector IDs of all live chunks in increasing order"""
+        return self.ids[:self.size][self.live[:self.size]]
+
+    def ids_for(self, filename: str) -> np.ndarray:
+        """Vector IDs of a document's live chunks"""
+        return self.select(filenames=[filename])
+
+    def select(self, filenames: Optional[List[str]] = None,
+               page_start: Optional[int] = None, page_end: Optional[int] = None) -> np.ndarray:
+        """Vector IDs of live chunks in the given documents that overlap the given page range"""
+        mask = self.live[:self.size].copy()
+        if filenames:
+            codes = [self._filename_index[name] for name in filenames if name in self._filename_index]
+            mask &= np.isin(self.filename_codes[:self.size], codes)
+        if page_start is not None:
+            mask &= self.columns['page_end'][:self.size] >= page_start
+        if page_end is not None:
+            mask &= self.columns['page_start'][:self.size] <= page_end
+        return self.ids[:self.size][mask]
+
+    def garbage_ratio(self) -> float:
+        """Fraction of stored rows that belong to removed chunks"""
+        return (self.size - self.live_count) / self.size if self.size else 0.0
+
+    def compacted(self) -> 'ChunkStore':
+        """New store holding only the live chunks (views of this store stay valid)"""
+        store = ChunkStore(capacity=max(self.live_count, INITIAL_CAPACITY), text_store=self.text_store)
+        rows = np.flatnonzero(self.live[:self.size])
+        n = len(rows)
+
+        if self.text_store is not None:
+            store.text_keys[:n] = self.text_keys[rows]
+        else:
+            lengths = self.offsets[rows + 1] - self.offsets[rows]
+            store.offsets[1:n + 1] = np.cumsum(lengths)
+            store.text_buffer = bytearray(b''.join(
+                self.text_buffer[self.offsets[row]:self.offsets[row + 1]] for row in rows
+            ))
+        store.ids[:n] = self.ids[rows]
+        store.live[:n] = True
+        for field in INT_FIELDS:
+            store.columns[field][:n] = self.columns[field][rows]
+
+        # Re-intern so filenames of removed documents are dropped from the table
+        for i, code in enumerate(self.filename_codes[rows]):
+            store.filename_codes[i] = store._intern(self.filename_table[code])
+
+        store.size = store.live_count = n
+        return store
+
+    def to_dicts(self) -> List[Dict]:
+        """Plain dicts of the live chunks, e.g. for JSON persistence (text_key instead of text on disk)"""
+        if self.text_store is None:
+            return [dict(view) for view in self]
+
+        fields = [field for field in CHUNK_FIELDS if field != 'text']
+        records = []
+        for view in self:
+            record = {field: view[field] for field in fields}
+            record['text_key'] = self._text_key(view._row).hex()
+            records.append(record)
+        return records
+
+    def memory_usage(self) -> Dict[str, Any]:
+        """Bytes held by the store, in total and per live chunk"""
+        column_bytes = (self.offsets.nbytes + self.ids.nbytes + self.live.nbytes + self.text_keys.nbytes +
+                        self.filename_codes.nbytes + sum(column.nbytes for column in self.columns.values()))
+        filename_bytes = sum(len(name.encode('utf-8')) for name in self.filename_table)
+        total = len(self.text_buffer) + column_bytes + filename_bytes
+        usage = {
+            'chunks': self.live_count,
+            'rows': self.size,
+            'text_bytes': len(self.text_buffer),
+            'metadata_bytes': column_bytes + filename_bytes,
+            'total_bytes': total,
+            'bytes_per_chunk': round(total / self.live_count, 1) if self.live_count else 0.0
+        }
+        if self.text_store is not None:
+            usage['text_store'] = self.text_store.stats()
+        return usage
@@ -0,0 +1,81 @@
+"""
+StudyMate Advanced Chunk Text Store
+Content-addressed, zlib-compressed chunk text in SQLite so only retrieved chunks are read into RAM
+Hackathon Project - TripleMind Team
+"""
+
+import os
+import hashlib
+import sqlite3
+import threading
+import zlib
+from typing import Dict, Iterable, List, Tuple
+
+# Bytes of the BLAKE2b digest used as a chunk's text key
+TEXT_KEY_SIZE = 16
+
+
+def text_key(text: str) -> bytes:
+    """Content address of a chunk's text"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=TEXT_KEY_SIZE).digest()
+
+
+class ChunkTextStore:
+    """
+    Chunk text keyed by content hash, compressed on disk
+
+    Keys are content addresses, so engines (and saved indexes) that hold the
+    same chunk share one row and nothing ever has to be deleted.
+    """
+
+    def __init__(self, path: str, compression_level: int = 6):
+        """Open (or create) the SQLite database at the given path"""
+        self.path = path
+        self.compression_level = compression_level
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS chunk_text (key BLOB PRIMARY KEY, text BLOB NOT NULL)")
+        self._db.commit()
+        # Counted once here, then kept up to date by put_many
+        self._count = self._db.execute("SELECT COUNT(*) FROM chunk_text").fetchone()[0]
+        self.reads = 0
+
+    def put_many(self, items: Iterable[Tuple[bytes, str]]):
+        """Store (key, text) pairs, skipping texts that are already stored"""
+        rows = [(key, zlib.compress(text.encode('utf-8'), self.compression_level)) for key, text in items]
+        if not rows:
+            return
+        with self._lock:
+            cursor = self._db.executemany("INSERT OR IGNORE INTO chunk_text (key, text) VALUES (?, ?)", rows)
+            self._db.commit()
+            # Ignored rows (texts already stored) are not in rowcount
+            self._count += max(cursor.rowcount, 0)
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, str]:
+        """Fetch and decompress the texts for the given keys"""
+        found = {}
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ','.join('?' * len(batch))
+                rows = self._db.execute(
+                    f"SELECT key, text FROM chunk_text WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, blob in rows:
+                    found[bytes(key)] = zlib.decompress(blob).decode('utf-8')
+            self.reads += len(keys)
+        return found
+
+    def get(self, key: bytes) -> str:
+        """Text for one key (empty if it is missing)"""
+        return self.get_many([key]).get(key, '')
+
+    def stats(self) -> Dict:
+        """Get the size of the database and how many texts were read"""
+        return {
+            'path': self.path,
+            'texts': self._count,
+            'disk_bytes': os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+            'reads': self.reads
+        }
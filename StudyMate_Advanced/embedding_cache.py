@@ -0,0 +1,136 @@
+"""
+StudyMate Advanced Embedding Cache
+Content-addressed cache for chunk embeddings (in-memory LRU + on-disk SQLite)
+Hackathon Project - TripleMind Team
+"""
+
+import os
+import sys
+import hashlib
+import sqlite3
+import threading
+import unicodedata
+from typing import Callable, Dict, List, Optional
+import numpy as np
+
+# Shared StudyMate modules live in the project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from caching import LRUCache
+
+
+def normalize_text(text: str) -> str:
+    """Normalize chunk text so trivially different copies share a cache entry"""
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+class EmbeddingCache:
+    """Cache embeddings keyed by (model name, normalized text hash)"""
+
+    def __init__(self, model_name: str, max_memory_items: int = 20000, disk_path: Optional[str] = None):
+        """Initialize the memory tier and, if a path is given, the SQLite disk tier"""
+        self.model_name = model_name
+        self.memory = LRUCache(max_size=max_memory_items)
+        self.disk_path = disk_path
+        self._disk = None
+        self._disk_lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if disk_path:
+            self._disk = sqlite3.connect(disk_path, check_same_thread=False)
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._disk.commit()
+
+    def key(self, text: str) -> str:
+        """Content address of a chunk for the current model"""
+        payload = f"{self.model_name}\n{normalize_text(text)}".encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()
+
+    def _read_disk(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Fetch stored vectors for the given keys from the disk tier"""
+        found = {}
+        if self._disk is None or not keys:
+            return found
+
+        with self._disk_lock:
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ','.join('?' * len(batch))
+                rows = self._disk.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype='float32')
+        return found
+
+    def _write_disk(self, items: Dict[str, np.ndarray]):
+        """Store vectors in the disk tier"""
+        if self._disk is None or not items:
+            return
+
+        with self._disk_lock:
+            self._disk.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, vector.astype('float32').tobytes()) for key, vector in items.items()]
+            )
+            self._disk.commit()
+
+    def encode(self, texts: List[str], encode_func: Callable[[List[str]], np.ndarray],
+               dimension: int = 0) -> np.ndarray:
+        """Return embeddings for texts, calling encode_func only for cache misses (no texts: shape (0, dimension))"""
+        if not texts:
+            return np.empty((0, dimension), dtype=np.float32)
+
+        keys = [self.key(text) for text in texts]
+        vectors: List[Optional[np.ndarray]] = [None] * len(texts)
+
+        # Memory tier
+        pending = {}
+        for i, key in enumerate(keys):
+            vector = self.memory.get(key)
+            if vector is not None:
+                vectors[i] = vector
+                self.memory_hits += 1
+            else:
+                pending.setdefault(key, []).append(i)
+
+        # Disk tier
+        for key, vector in self._read_disk(list(pending.keys())).items():
+            self.memory.put(key, vector)
+            for i in pending.pop(key):
+                vectors[i] = vector
+                self.disk_hits += 1
+
+        # Model, once per distinct missing text
+        if pending:
+            miss_keys = list(pending.keys())
+            miss_texts = [texts[pending[key][0]] for key in miss_keys]
+            self.misses += sum(len(positions) for positions in pending.values())
+
+            embeddings = np.asarray(encode_func(miss_texts), dtype='float32')
+            new_items = {}
+            for key, vector in zip(miss_keys, embeddings):
+                new_items[key] = vector
+                self.memory.put(key, vector)
+                for i in pending[key]:
+                    vectors[i] = vector
+            self._write_disk(new_items)
+
+        return np.vstack(vectors).astype('float32')
+
+    def stats(self) -> Dict:
+        """Get hit/miss counts for both tiers"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            'memory_items': len(self.memory),
+            'disk_path': self.disk_path
+        }
@@ -0,0 +1,158 @@
+"""
+StudyMate Advanced IAM Token Manager
+Cached, expiry-aware IBM Cloud access tokens shared by every Watsonx client
+Hackathon Project - TripleMind Team
+"""
+
+import os
+import sys
+import threading
+import time
+from typing import Dict, Any, Optional
+
+# Shared StudyMate modules live in the project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from http_transport import get_transport
+
+IAM_TOKEN_URL = "https://iam.cloud.ibm.com/identity/token"
+
+# IBM Cloud IAM tokens are valid for an hour; assumed when a response has no expiry
+DEFAULT_TOKEN_LIFETIME = 3600
+
+# A token is refreshed in the background once it has less than this many seconds left...
+REFRESH_MARGIN = 600
+
+# ...and is no longer handed out once it has less than this many seconds left
+EXPIRY_SKEW = 60
+
+_token_managers: Dict[str, "IAMTokenManager"] = {}
+_managers_lock = threading.Lock()
+
+
+class IAMTokenManager:
+    """
+    Caches an IBM Cloud IAM access token until shortly before it expires
+
+    The first request fetches a token; later requests reuse it without a
+    round-trip to IAM. When a request finds the token within the refresh
+    margin of its expiry, a background thread fetches the next one while the
+    current token keeps being used, so requests only wait for IAM when the
+    token has actually expired (e.g. after the app was idle for an hour).
+    Only one refresh is in flight at a time: concurrent requests that need a
+    new token wait for that refresh instead of starting their own.
+    """
+
+    def __init__(self, api_key: str, auth_url: str = IAM_TOKEN_URL,
+                 refresh_margin: float = REFRESH_MARGIN, expiry_skew: float = EXPIRY_SKEW):
+        """Prepare a token manager for an API key; no request is made until a token is needed"""
+        self.api_key = api_key
+        self.auth_url = auth_url
+        self.refresh_margin = refresh_margin
+        self.expiry_skew = expiry_skew
+
+        self._token: Optional[str] = None
+        self._expires_at = 0.0  # time.monotonic() deadline of the cached token
+        self._lock = threading.Lock()
+        # Held by whichever thread is fetching a token
+        self._refresh_lock = threading.Lock()
+
+        self.fetches = 0
+        self.cache_hits = 0
+        self.background_refreshes = 0
+        self.failed_refreshes = 0
+
+    def get_token(self) -> str:
+        """
+        Get a valid access token, fetching one only if the cached token has expired
+
+        Raises:
+            requests.exceptions.RequestException: If IAM cannot be reached or rejects the API key
+        """
+        with self._lock:
+            token, remaining = self._token, self._expires_at - time.monotonic()
+            if token is not None and remaining > self.expiry_skew:
+                self.cache_hits += 1
+                refresh_ahead = remaining <= self.refresh_margin
+            else:
+                token = None
+
+        if token is not None:
+            if refresh_ahead and self._refresh_lock.acquire(blocking=False):
+                threading.Thread(target=self._background_refresh, daemon=True).start()
+            return token
+
+        with self._refresh_lock:
+            # Another thread may have fetched a token while we waited
+            with self._lock:
+                if self._token is not None and self._expires_at - time.monotonic() > self.expiry_skew:
+                    self.cache_hits += 1
+                    return self._token
+            return self._fetch()
+
+    def _background_refresh(self):
+        """Fetch the next token while the current one is still in use (holds the refresh lock)"""
+        try:
+            self._fetch()
+            with self._lock:
+                self.background_refreshes += 1
+        except Exception as e:
+            # The current token is still valid; the next request will try again
+            with self._lock:
+                self.failed_refreshes += 1
+            print(f"⚠️ Background IAM token refresh failed: {str(e)}")
+        finally:
+            self._refresh_lock.release()
+
+    def _fetch(self) -> str:
+        """Request a new token from IAM and cache it"""
+        auth_data = {
+            "grant_type": "urn:ibm:params:oauth:grant-type:apikey",
+            "apikey": self.api_key
+        }
+        requested_at = time.monotonic()
+        response = get_transport().post(self.auth_url, data=auth_data)
+        response.raise_for_status()
+        result = response.json()
+
+        lifetime = float(result.get("expires_in") or DEFAULT_TOKEN_LIFETIME)
+        with self._lock:
+            self._token = result["access_token"]
+            # Counted from when the request was sent, so network time never extends the lifetime
+            self._expires_at = requested_at + lifetime
+            self.fetches += 1
+            return self._token
+
+    def invalidate(self, token: str):
+        """Drop a token the API rejected, so the next request fetches a new one"""
+        with self._lock:
+            if self._token == token:
+                self._token = None
+                self._expires_at = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get fetch and cache counts and the remaining lifetime of the cached token"""
+        with self._lock:
+            remaining = self._expires_at - time.monotonic() if self._token is not None else None
+            # Background refreshes were not waited for by any request
+            requests_served = self.cache_hits + self.fetches - self.background_refreshes
+            return {
+                'fetches': self.fetches,
+                'cache_hits': self.cache_hits,
+                'hit_rate': self.cache_hits / requests_served if requests_served else 0.0,
+                'background_refreshes': self.background_refreshes,
+                'failed_refreshes': self.failed_refreshes,
+                'expires_in_seconds': round(max(remaining, 0)) if remaining is not None else None
+            }
+
+
+def get_token_manager(api_key: str) -> IAMTokenManager:
+    """Get the token manager for an API key, shared by every client in this process"""
+    with _managers_lock:
+        manager = _token_managers.get(api_key)
+        if manager is None:
+            manager = IAMTokenManager(
+                api_key,
+                refresh_margin=float(os.getenv('IAM_TOKEN_REFRESH_MARGIN', REFRESH_MARGIN))
+            )
+            _token_managers[api_key] = manager
+        return manager
@@ -0,0 +1,218 @@
+"""
+StudyMate Advanced Index Store
+Versioned on-disk persistence for the FAISS index, chunks and document mapping
+Hackathon Project - TripleMind Team
+"""
+
+import os
+import json
+import time
+import hashlib
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
+import faiss
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Bump whenever the on-disk layout changes so old stores are rebuilt, not misread
+INDEX_STORE_VERSION = 4
+
+MANIFEST_FILE = "manifest.json"
+INDEX_FILE = "index.faiss"
+CHUNKS_FILE = "chunks.json"
+
+# Names the snapshot directory holding the current index, chunks and manifest
+CURRENT_FILE = "CURRENT"
+LOCK_FILE = ".lock"
+SNAPSHOT_PREFIX = "snapshot-"
+
+# Manifest fields that must match the running engine for a store to be reusable
+COMPATIBILITY_FIELDS = ('embedding_model', 'embedding_dimension', 'chunk_size', 'chunk_overlap',
+                        'chunk_unit', 'chunk_text_store')
+
+
+class StaleIndexError(ValueError):
+    """Raised when a stored index was built with different model or chunking settings"""
+
+
+class IndexStore:
+    """
+    Save and load a RAG index (FAISS vectors + chunk metadata + manifest) on disk
+
+    Every save writes a new snapshot directory, and then switches the CURRENT
+    pointer file to it with one atomic rename. Readers therefore see either
+    the old snapshot or the new one, never files from two different saves.
+    The manifest records a checksum of each file. Saves and loads of the same
+    directory, from any session or process, take turns on a file lock.
+    """
+
+    def __init__(self, directory: str):
+        """Initialize the store rooted at the given directory"""
+        self.directory = directory
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    @contextmanager
+    def _locked(self, shared: bool = False):
+        """Hold the store's file lock (shared for loads, exclusive for saves)"""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(LOCK_FILE), 'a+b') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _current_snapshot(self) -> Optional[str]:
+        """Path of the snapshot CURRENT points to, or None if nothing was saved"""
+        try:
+            with open(self._path(CURRENT_FILE), 'r', encoding='utf-8') as f:
+                name = f.read().strip()
+        except FileNotFoundError:
+            return None
+        snapshot = self._path(name)
+        return snapshot if os.path.exists(os.path.join(snapshot, MANIFEST_FILE)) else None
+
+    def exists(self) -> bool:
+        """Check whether a complete store is present"""
+        return self._current_snapshot() is not None
+
+    def read_manifest(self) -> Dict[str, Any]:
+        """Read the manifest of the current snapshot"""
+        with self._locked(shared=True):
+            snapshot = self._current_snapshot()
+            if snapshot is None:
+                raise FileNotFoundError(f"No index store found in {self.directory}")
+            return _read_json(os.path.join(snapshot, MANIFEST_FILE))
+
+    def _publish(self, snapshot: str):
+        """Point CURRENT at a complete snapshot with one atomic rename"""
+        with tempfile.NamedTemporaryFile('w', dir=self.directory, prefix=CURRENT_FILE, suffix='.tmp',
+                                         delete=False, encoding='utf-8') as f:
+            f.write(os.path.basename(snapshot))
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.replace(f.name, self._path(CURRENT_FILE))
+        except OSError:
+            os.remove(f.name)
+            raise
+
+    def _remove_old_snapshots(self, current: str):
+        """Drop replaced snapshots and leftovers of interrupted saves (the lock keeps readers out)"""
+        for name in os.listdir(self.directory):
+            path = self._path(name)
+            if name.startswith(SNAPSHOT_PREFIX) and path != current:
+                shutil.rmtree(path, ignore_errors=True)
+            elif name.startswith(CURRENT_FILE) and name.endswith('.tmp'):
+                os.remove(path)
+
+    def save(self, index, chunks: List[Dict], document_mapping: Dict, settings: Dict[str, Any],
+             deleted_ids: Optional[List[int]] = None, next_vector_id: int = 0):
+        """Persist the index, chunks and document mapping together with a manifest"""
+        with self._locked():
+            snapshot = tempfile.mkdtemp(prefix=SNAPSHOT_PREFIX, dir=self.directory)
+            try:
+                faiss.write_index(index, os.path.join(snapshot, INDEX_FILE))
+                with open(os.path.join(snapshot, CHUNKS_FILE), 'w', encoding='utf-8') as f:
+                    json.dump({
+                        'chunks': chunks,
+                        'document_mapping': document_mapping,
+                        'deleted_ids': deleted_ids or [],
+                        'next_vector_id': next_vector_id
+                    }, f)
+
+                manifest = {
+                    'version': INDEX_STORE_VERSION,
+                    'created_at': time.strftime("%Y-%m-%d %H:%M:%S"),
+                    'total_vectors': int(index.ntotal),
+                    'total_chunks': len(chunks),
+                    'total_documents': len(document_mapping),
+                    'checksums': {
+                        name: _file_digest(os.path.join(snapshot, name)) for name in (INDEX_FILE, CHUNKS_FILE)
+                    }
+                }
+                manifest.update(settings)
+                with open(os.path.join(snapshot, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+                    json.dump(manifest, f, indent=2)
+
+                self._publish(snapshot)
+            except BaseException:
+                shutil.rmtree(snapshot, ignore_errors=True)
+                raise
+            self._remove_old_snapshots(snapshot)
+        return manifest
+
+    def validate(self, manifest: Dict[str, Any], settings: Dict[str, Any]):
+        """Raise StaleIndexError if the manifest does not match the expected settings"""
+        if manifest.get('version') != INDEX_STORE_VERSION:
+            raise StaleIndexError(
+                f"store version {manifest.get('version')} != expected {INDEX_STORE_VERSION}"
+            )
+
+        mismatches = []
+        for field in COMPATIBILITY_FIELDS:
+            if manifest.get(field) != settings.get(field):
+                mismatches.append(f"{field}: stored={manifest.get(field)!r}, current={settings.get(field)!r}")
+
+        if mismatches:
+            raise StaleIndexError("; ".join(mismatches))
+
+    def load(self, settings: Dict[str, Any]) -> Dict[str, Any]:
+        """Load a stored index after checking it is compatible with the given settings"""
+        with self._locked(shared=True):
+            snapshot = self._current_snapshot()
+            if snapshot is None:
+                raise FileNotFoundError(f"No index store found in {self.directory}")
+
+            manifest = _read_json(os.path.join(snapshot, MANIFEST_FILE))
+            self.validate(manifest, settings)
+
+            checksums = manifest.get('checksums', {})
+            for name in (INDEX_FILE, CHUNKS_FILE):
+                if checksums.get(name) != _file_digest(os.path.join(snapshot, name)):
+                    raise StaleIndexError(f"{name} does not match the manifest checksum")
+
+            index = faiss.read_index(os.path.join(snapshot, INDEX_FILE))
+            data = _read_json(os.path.join(snapshot, CHUNKS_FILE))
+
+        if index.ntotal != manifest['total_vectors'] or len(data['chunks']) != manifest['total_chunks']:
+            raise StaleIndexError("index or chunk files do not match the manifest")
+
+        return {
+            'index': index,
+            'chunks': data['chunks'],
+            'document_mapping': data['document_mapping'],
+            'deleted_ids': data['deleted_ids'],
+            'next_vector_id': data['next_vector_id'],
+            'manifest': manifest
+        }
+
+
+def _read_json(path: str) -> Any:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _file_digest(path: str) -> str:
+    """Checksum of a file, read in 1 MB blocks"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
@@ -0,0 +1,297 @@
+"""
+StudyMate Advanced Ingestion Pipeline
+Streaming extract -> chunk -> embed -> index pipeline with bounded queues
+Hackathon Project - TripleMind Team
+"""
+
+import os
+import sys
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+# Shared StudyMate modules live in the project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pdf_extraction import iter_document_pages
+
+# Queue markers passed between stages
+_DOCUMENT_START = 'document_start'
+_DOCUMENT_END = 'document_end'
+_DOCUMENT_FAILED = 'document_failed'
+_DONE = object()
+
+# Seconds a blocked stage waits on a queue before checking whether the pipeline stopped
+_POLL_INTERVAL = 0.1
+
+
+class _StageError:
+    """Wraps an exception raised inside a stage so the indexing loop can re-raise it"""
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+class _Stopped(Exception):
+    """Raised inside a stage once the pipeline has stopped, to end the stage"""
+
+
+class _DocumentFailed(Exception):
+    """Raised while chunking a document whose extraction failed"""
+
+
+class IngestPipeline:
+    """
+    Stream documents through extraction, chunking, batched embedding and indexing
+
+    Each stage runs in its own thread and hands work to the next one through a
+    bounded queue, so peak memory is set by the queue sizes rather than by the
+    size of the upload. Indexing runs in the calling thread and every embedded
+    batch is searchable as soon as it is added. A document that cannot be read
+    is skipped (and any of its chunks already indexed removed); any other
+    failure stops every stage and is raised from run().
+    """
+
+    def __init__(self, engine):
+        """Initialize the pipeline for a RAG engine"""
+        self.engine = engine
+        self.page_queue_size = int(os.getenv('INGEST_PAGE_QUEUE_SIZE', 64))
+        self.chunk_queue_size = int(os.getenv('INGEST_CHUNK_QUEUE_SIZE', 256))
+        self.batch_queue_size = int(os.getenv('INGEST_BATCH_QUEUE_SIZE', 4))
+        self.embedding_batch_size = int(os.getenv('INGEST_EMBEDDING_BATCH_SIZE', 64))
+        self.pages_per_task = int(os.getenv('PDF_PAGES_PER_TASK', 50))
+        # Set by run() when it returns or fails; stages end instead of blocking on a queue
+        self._stop = threading.Event()
+
+    def _put(self, output: queue.Queue, item):
+        """Put an item on a bounded queue, giving up once the pipeline stopped"""
+        while not self._stop.is_set():
+            try:
+                output.put(item, timeout=_POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+        raise _Stopped()
+
+    def _get(self, source: queue.Queue):
+        """Get an item from a queue, giving up once the pipeline stopped"""
+        while not self._stop.is_set():
+            try:
+                return source.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+        raise _Stopped()
+
+    def _run_stage(self, target, output: queue.Queue, *args):
+        """Run a stage, forwarding any exception downstream"""
+        try:
+            target(output, *args)
+        except _Stopped:
+            pass
+        except Exception as e:
+            try:
+                self._put(output, _StageError(e))
+            except _Stopped:
+                pass
+
+    def _extract(self, output: queue.Queue, uploaded_files: List):
+        """Stage 1: pages of each document, in order (page ranges of all documents extracted in parallel)"""
+        workers = self.engine.extraction_workers
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        pages = iter_document_pages(uploaded_files, pool, self.pages_per_task, max_in_flight=workers)
+        started = set()
+        try:
+            for index, page, error in pages:
+                uploaded_file = uploaded_files[index]
+                if error is not None:
+                    # Skip unreadable documents instead of failing the whole batch
+                    print(f"❌ Error extracting text from {uploaded_file.name}: {str(error)}")
+                    self._put(output, (_DOCUMENT_FAILED, uploaded_file.name, str(error)))
+                    continue
+                if index not in started:
+                    started.add(index)
+                    self._put(output, (_DOCUMENT_START, uploaded_file.name, uploaded_file.size))
+                if page is None:
+                    self._put(output, (_DOCUMENT_END, uploaded_file.name, None))
+                else:
+                    self._put(output, page)
+        finally:
+            pages.close()
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+        self._put(output, _DONE)
+
+    def _chunk(self, output: queue.Queue, pages: queue.Queue):
+        """Stage 2: chunks of each document as soon as enough words are buffered"""
+
+        def document_pages(stats: Dict):
+            while True:
+                item = self._get(pages)
+                if isinstance(item, _StageError):
+                    raise item.error
+                if item[0] == _DOCUMENT_END:
+                    return
+                if item[0] == _DOCUMENT_FAILED:
+                    raise _DocumentFailed(item[2])
+                stats['pages'] += 1
+                yield item
+
+        while True:
+            item = self._get(pages)
+            if item is _DONE:
+                break
+            if isinstance(item, _StageError):
+                self._put(output, item)
+                return
+            if item[0] == _DOCUMENT_FAILED:
+                # Failed before any of its pages were read
+                self._put(output, item)
+                continue
+
+            _, filename, file_size = item
+            stats = {'filename': filename, 'file_size': file_size, 'pages': 0}
+            self._put(output, (_DOCUMENT_START, filename, None))
+            try:
+                for chunk in self.engine.stream_chunks(document_pages(stats), filename):
+                    self._put(output, chunk)
+            except _DocumentFailed as e:
+                self._put(output, (_DOCUMENT_FAILED, filename, str(e)))
+                continue
+            self._put(output, (_DOCUMENT_END, filename, stats))
+        self._put(output, _DONE)
+
+    def _embed(self, output: queue.Queue, chunks: queue.Queue):
+        """Stage 3: embeddings for batches of chunks (a batch never spans two documents)"""
+        batch = []
+
+        def flush():
+            if batch:
+                embeddings = self.engine.embedding_cache.encode(
+                    [chunk['text'] for chunk in batch],
+                    lambda misses: self.engine.encode_texts(misses, batch_size=self.embedding_batch_size),
+                    dimension=self.engine.embedding_dimension
+                )
+                self._put(output, (list(batch), embeddings))
+                batch.clear()
+
+        while True:
+            item = self._get(chunks)
+            if item is _DONE:
+                break
+            if isinstance(item, _StageError):
+                self._put(output, item)
+                return
+            if isinstance(item, tuple):
+                if item[0] == _DOCUMENT_END:
+                    flush()
+                elif item[0] == _DOCUMENT_FAILED:
+                    # Chunks of a failed document are not worth embedding
+                    batch.clear()
+                self._put(output, item)
+                continue
+
+            batch.append(item)
+            if len(batch) >= self.embedding_batch_size:
+                flush()
+        self._put(output, _DONE)
+
+    def run(self, uploaded_files: List, content_hashes: Dict[str, str]) -> Dict:
+        """
+        Ingest documents, indexing each batch as it arrives; returns throughput stats
+
+        Args:
+            uploaded_files (List): PDF uploads to index
+            content_hashes (Dict[str, str]): Hash of each upload's bytes by filename
+        """
+        start_time = time.perf_counter()
+        self._stop.clear()
+        page_queue = queue.Queue(maxsize=self.page_queue_size)
+        chunk_queue = queue.Queue(maxsize=self.chunk_queue_size)
+        batch_queue = queue.Queue(maxsize=self.batch_queue_size)
+
+        threads = [
+            threading.Thread(target=self._run_stage, args=(self._extract, page_queue, uploaded_files), daemon=True),
+            threading.Thread(target=self._run_stage, args=(self._chunk, chunk_queue, page_queue), daemon=True),
+            threading.Thread(target=self._run_stage, args=(self._embed, batch_queue, chunk_queue), daemon=True)
+        ]
+        for thread in threads:
+            thread.start()
+
+        # Stage 4: index batches in the calling thread
+        totals = {'documents': 0, 'pages': 0, 'chunks': 0, 'failed': []}
+        try:
+            self._index(batch_queue, totals, content_hashes)
+        finally:
+            # After a failure the stages may be blocked on full queues: stop them and free the queues
+            self._stop.set()
+            for stage_queue in (page_queue, chunk_queue, batch_queue):
+                _drain(stage_queue)
+            for thread in threads:
+                thread.join()
+
+        elapsed = time.perf_counter() - start_time
+        totals.update({
+            'workers': self.engine.extraction_workers,
+            'seconds': round(elapsed, 3),
+            'pages_per_second': round(totals['pages'] / elapsed, 1) if elapsed > 0 else 0.0,
+            'queue_sizes': {
+                'pages': self.page_queue_size,
+                'chunks': self.chunk_queue_size,
+                'batches': self.batch_queue_size
+            }
+        })
+        return totals
+
+    def _index(self, batches: queue.Queue, totals: Dict, content_hashes: Dict[str, str]):
+        """Stage 4: add embedded batches to the engine's index"""
+        document_chunks = 0
+        document_words = 0
+        while True:
+            item = batches.get()
+            if item is _DONE:
+                break
+            if isinstance(item, _StageError):
+                raise item.error
+
+            if isinstance(item[0], str):
+                marker, filename, stats = item
+                if marker == _DOCUMENT_START:
+                    document_chunks, document_words = 0, 0
+                    print(f"📚 Processing document: {filename}")
+                elif marker == _DOCUMENT_FAILED:
+                    # Drop what was indexed of a document that could not be read to the end
+                    if document_chunks:
+                        self.engine.remove_document(filename)
+                    totals['failed'].append({'filename': filename, 'error': stats})
+                elif document_chunks:
+                    self.engine.document_mapping[filename] = {
+                        'total_chunks': document_chunks,
+                        'total_words': document_words,
+                        'total_pages': stats['pages'],
+                        'file_size': stats['file_size'],
+                        # Fingerprint of the file: unchanged re-uploads are skipped, cached answers scoped to it
+                        'content_hash': content_hashes[filename]
+                    }
+                    totals['documents'] += 1
+                    totals['pages'] += stats['pages']
+                if marker != _DOCUMENT_START:
+                    # A document that fails before it starts must not see the previous one's count
+                    document_chunks, document_words = 0, 0
+                continue
+
+            chunks, embeddings = item
+            self.engine.add_to_index(embeddings, chunks)
+            document_chunks += len(chunks)
+            # The last chunk's end offset is the number of words seen so far
+            document_words = chunks[-1]['end_word']
+            totals['chunks'] += len(chunks)
+
+
+def _drain(stage_queue: queue.Queue):
+    """Discard whatever is left in a queue"""
+    while True:
+        try:
+            stage_queue.get_nowait()
+        except queue.Empty:
+            return
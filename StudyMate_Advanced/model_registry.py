@@ -0,0 +1,179 @@
+"""
+StudyMate Advanced Model Registry
+Process-wide, lazily loaded embedding models shared by every RAG engine
+Hackathon Project - TripleMind Team
+"""
+
+import os
+import sys
+import copy
+import threading
+import time
+from typing import Dict, Any, Optional
+from sentence_transformers import SentenceTransformer
+
+from embedding_cache import EmbeddingCache
+from chunk_text_store import ChunkTextStore
+from reranker import Reranker
+
+# Shared StudyMate modules live in the project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from caching import LRUCache
+
+_models: Dict[str, SentenceTransformer] = {}
+_model_info: Dict[str, Dict[str, Any]] = {}
+_embedding_caches: Dict[str, EmbeddingCache] = {}
+_query_caches: Dict[str, LRUCache] = {}
+_chunk_text_stores: Dict[str, ChunkTextStore] = {}
+_chunk_tokenizers: Dict[str, Any] = {}
+_rerankers: Dict[str, Reranker] = {}
+
+# One lock for the registry dicts, one per model so different models load in parallel
+_registry_lock = threading.Lock()
+_model_locks: Dict[str, threading.Lock] = {}
+_encode_locks: Dict[str, threading.Lock] = {}
+
+
+def _model_lock(model_name: str) -> threading.Lock:
+    with _registry_lock:
+        return _model_locks.setdefault(model_name, threading.Lock())
+
+
+def get_encode_lock(model_name: str) -> threading.Lock:
+    """
+    Get the lock to hold around every encode() call on a shared model
+
+    encode() reconfigures the model's fast tokenizer for truncation, and a fast
+    tokenizer cannot be used from two threads at once ("Already borrowed"), so
+    sessions and the ingest pipeline take turns.
+    """
+    with _registry_lock:
+        return _encode_locks.setdefault(model_name, threading.Lock())
+
+
+def _model_memory_bytes(model) -> int:
+    """Size of the model's parameters and buffers in bytes"""
+    tensors = list(model.parameters()) + list(model.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
+def get_embedding_model(model_name: str) -> SentenceTransformer:
+    """Get the shared embedding model, loading it on first use"""
+    model = _models.get(model_name)
+    if model is not None:
+        return model
+
+    with _model_lock(model_name):
+        # Another thread may have finished loading while we waited
+        model = _models.get(model_name)
+        if model is not None:
+            return model
+
+        print(f"🔄 Loading embedding model: {model_name}")
+        start_time = time.perf_counter()
+        model = SentenceTransformer(model_name)
+        load_time = time.perf_counter() - start_time
+
+        with _registry_lock:
+            _model_info[model_name] = {
+                'model_name': model_name,
+                'load_time_seconds': round(load_time, 3),
+                'memory_mb': round(_model_memory_bytes(model) / (1024 * 1024), 1),
+                'loaded_at': time.strftime("%Y-%m-%d %H:%M:%S")
+            }
+            _models[model_name] = model
+
+        print(f"✅ Loaded {model_name} in {load_time:.2f}s (shared across sessions)")
+        return model
+
+
+def get_embedding_cache(model_name: str) -> EmbeddingCache:
+    """Get the shared embedding cache for a model"""
+    with _registry_lock:
+        cache = _embedding_caches.get(model_name)
+        if cache is None:
+            cache = EmbeddingCache(
+                model_name,
+                max_memory_items=int(os.getenv('EMBEDDING_CACHE_SIZE', 20000)),
+                disk_path=os.getenv('EMBEDDING_CACHE_PATH', 'embedding_cache.sqlite') or None
+            )
+            _embedding_caches[model_name] = cache
+        return cache
+
+
+def get_query_cache(model_name: str) -> LRUCache:
+    """Get the shared cache of query embeddings (keyed by normalized query text) for a model"""
+    with _registry_lock:
+        cache = _query_caches.get(model_name)
+        if cache is None:
+            ttl = float(os.getenv('QUERY_CACHE_TTL', 0))
+            cache = LRUCache(
+                max_size=int(os.getenv('QUERY_CACHE_SIZE', 1000)),
+                ttl=ttl if ttl > 0 else None
+            )
+            _query_caches[model_name] = cache
+        return cache
+
+
+def get_chunk_tokenizer(model_name: str):
+    """
+    Get a shared copy of a model's tokenizer for sizing chunks in tokens
+
+    encode() reconfigures the model's own fast tokenizer for truncation, and a
+    fast tokenizer cannot be reconfigured while another thread is using it, so
+    chunking threads get their own copy.
+    """
+    with _registry_lock:
+        tokenizer = _chunk_tokenizers.get(model_name)
+    if tokenizer is not None:
+        return tokenizer
+
+    tokenizer = copy.deepcopy(get_embedding_model(model_name).tokenizer)
+    with _registry_lock:
+        return _chunk_tokenizers.setdefault(model_name, tokenizer)
+
+
+def get_chunk_text_store() -> Optional[ChunkTextStore]:
+    """Get the shared on-disk chunk text store, or None to keep chunk text in memory"""
+    path = os.getenv('CHUNK_TEXT_PATH', '')
+    if not path:
+        return None
+    with _registry_lock:
+        store = _chunk_text_stores.get(path)
+        if store is None:
+            store = ChunkTextStore(path, compression_level=int(os.getenv('CHUNK_TEXT_COMPRESSION', 6)))
+            _chunk_text_stores[path] = store
+        return store
+
+
+def get_reranker() -> Optional[Reranker]:
+    """Get the shared cross-encoder re-ranker, or None when RERANKER_MODEL is not set"""
+    model_name = os.getenv('RERANKER_MODEL', '')
+    if not model_name:
+        return None
+    with _registry_lock:
+        reranker = _rerankers.get(model_name)
+        if reranker is None:
+            ttl = float(os.getenv('RERANK_CACHE_TTL', 0))
+            reranker = Reranker(
+                model_name,
+                max_length=int(os.getenv('RERANKER_MAX_LENGTH', 512)),
+                cache_size=int(os.getenv('RERANK_CACHE_SIZE', 20000)),
+                cache_ttl=ttl if ttl > 0 else None
+            )
+            _rerankers[model_name] = reranker
+        return reranker
+
+
+def get_model_info(model_name: str) -> Dict[str, Any]:
+    """Get load time and memory footprint of a loaded model"""
+    return dict(_model_info.get(model_name, {'model_name': model_name, 'loaded': False}))
+
+
+def get_registry_statistics() -> Dict[str, Any]:
+    """Get information about every model loaded in this process"""
+    with _registry_lock:
+        return {
+            'loaded_models': len(_models),
+            'models': [dict(info) for info in _model_info.values()]
+        }
@@ -5,55 +5,120 @@ Hackathon Project - TripleMind Team
 """
 
 import os
-import fitz  # PyMuPDF
+import sys
+import hashlib
 import numpy as np
 import pandas as pd
-from typing import List, Dict, Tuple, Optional
-from sentence_transformers import SentenceTransformer
+from typing import List, Dict, Tuple, Optional, Iterable, Iterator
 import faiss
 import json
+import re
 from dotenv import load_dotenv
 
+# Shared StudyMate modules live in the project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from caching import LRUCache
+from chunking import stream_chunks
+from lexical_index import BM25Index, reciprocal_rank_fusion, RRF_K
+from pdf_extraction import get_extraction_workers, pdf_path, iter_pages, content_hash
+from ingest_pipeline import IngestPipeline
+from index_store import IndexStore, StaleIndexError
+from chunk_store import ChunkStore
+from model_registry import (
+    get_embedding_model, get_embedding_cache, get_query_cache, get_model_info, get_chunk_text_store,
+    get_chunk_tokenizer, get_reranker, get_encode_lock
+)
+from vector_index import (
+    load_index_config, build_index, target_index_type, configure_search,
+    describe_index, search_parameters, needs_rebuild, filtered_search_parameters, reconstruct_vectors
+)
+
 # Load environment variables
 load_dotenv()
 
+SEARCH_MODES = ('vector', 'hybrid')
+
+
+def score_label(result: Dict) -> str:
+    """Name of a search result's similarity_score: a fused rank score in hybrid results"""
+    return "Relevance (RRF)" if 'vector_similarity' in result else "Similarity"
+
+
 class AdvancedRAGEngine:
     """Advanced RAG Engine with semantic search and intelligent chunking"""
     
     def __init__(self):
         """Initialize the RAG engine with embedding model and FAISS index"""
-        self.chunk_size = int(os.getenv('MAX_CHUNK_SIZE', 500))
-        self.chunk_overlap = int(os.getenv('CHUNK_OVERLAP', 100))
         self.embedding_model_name = os.getenv('EMBEDDING_MODEL', 'all-MiniLM-L6-v2')
+        self.index_store_dir = os.getenv('INDEX_STORE_DIR', 'studymate_index')
         
-        # Initialize embedding model
-        print(f"🔄 Loading embedding model: {self.embedding_model_name}")
-        self.embedding_model = SentenceTransformer(self.embedding_model_name)
+        # Embedding model and cache are shared process-wide; only the index is per engine
+        self.embedding_model = get_embedding_model(self.embedding_model_name)
+        self.encode_lock = get_encode_lock(self.embedding_model_name)
         self.embedding_dimension = self.embedding_model.get_sentence_embedding_dimension()
+        self.embedding_cache = get_embedding_cache(self.embedding_model_name)
+        
+        # Chunks are sized in words, or in the embedding model's tokens so none are truncated away
+        self.chunk_unit = os.getenv('CHUNK_UNIT', 'words').lower()
+        self.chunk_tokenizer = None
+        if self.chunk_unit == 'tokens':
+            self.chunk_tokenizer = get_chunk_tokenizer(self.embedding_model_name)
+            model_limit = self.embedding_model.max_seq_length - self.chunk_tokenizer.num_special_tokens_to_add()
+            self.chunk_size = min(int(os.getenv('MAX_CHUNK_TOKENS', 0)) or model_limit, model_limit)
+            self.chunk_overlap = int(os.getenv('CHUNK_OVERLAP_TOKENS', self.chunk_size // 5))
+        else:
+            self.chunk_size = int(os.getenv('MAX_CHUNK_SIZE', 500))
+            self.chunk_overlap = int(os.getenv('CHUNK_OVERLAP', 100))
         
-        # Initialize FAISS index
-        self.index = faiss.IndexFlatL2(self.embedding_dimension)
-        self.chunks = []
-        self.chunk_metadata = []
+        # Retrieval caches: query embeddings are shared, results are tied to this engine's index
+        self.query_cache = get_query_cache(self.embedding_model_name)
+        result_cache_ttl = float(os.getenv('RESULT_CACHE_TTL', 600))
+        self.result_cache = LRUCache(
+            max_size=int(os.getenv('RESULT_CACHE_SIZE', 1000)),
+            ttl=result_cache_ttl if result_cache_ttl > 0 else None
+        )
+        self.index_version = 0
+        
+        # Hybrid search (opt-in) fuses the FAISS ranking with a BM25 ranking of the same chunks
+        self.search_mode = os.getenv('SEARCH_MODE', 'vector').lower()
+        if self.search_mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown SEARCH_MODE {self.search_mode!r}, expected one of {SEARCH_MODES}")
+        self.hybrid_candidates = int(os.getenv('HYBRID_CANDIDATES', 20))
+        self.rrf_k = int(os.getenv('RRF_K', RRF_K))
+        self.lexical_weight = float(os.getenv('LEXICAL_WEIGHT', 1.0))
+        
+        # Optional cross-encoder pass over a wider candidate set (enabled by RERANKER_MODEL)
+        self.reranker = get_reranker()
+        self.rerank_candidates = int(os.getenv('RERANK_CANDIDATES', 20))
+        self.rerank_budget_ms = float(os.getenv('RERANK_BUDGET_MS', 300))
+        
+        # Parallel PDF extraction
+        self.extraction_workers = get_extraction_workers()
+        self.last_ingestion_stats = {}
+        
+        # Initialize FAISS index (ID-mapped so chunks keep stable vector IDs)
+        self.index_config = load_index_config()
+        self.index = self._create_index()
+        # Chunk text stays in RAM unless CHUNK_TEXT_PATH points at an on-disk store
+        self.text_store = get_chunk_text_store()
+        self.chunks = ChunkStore(text_store=self.text_store)  # columnar chunk records addressed by vector ID
+        self.lexical_index = BM25Index()  # None until rebuilt after loading a saved index
         self.document_mapping = {}
+        self.deleted_ids = set()  # tombstones for indexes without remove support
+        self.next_vector_id = 0
         
         print(f"✅ RAG Engine initialized with {self.embedding_dimension}D embeddings")
     
+    @property
+    def chunk_metadata(self) -> ChunkStore:
+        """Chunk records (kept for callers of the old name)"""
+        return self.chunks
+    
     def extract_text_from_pdf(self, pdf_file, filename: str) -> str:
-        """Extract clean text from PDF using PyMuPDF"""
+        """Extract clean text from a PDF path or upload, reading pages lazily from disk"""
         try:
-            doc = fitz.open(stream=pdf_file.read(), filetype="pdf")
-            text = ""
-            
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                page_text = page.get_text()
-                
-                # Clean and normalize text
-                page_text = self._clean_text(page_text)
-                text += f"\n--- Page {page_num + 1} ---\n{page_text}\n"
-            
-            doc.close()
+            with pdf_path(pdf_file) as path:
+                text = self._join_pages(page_text for _, page_text in iter_pages(path))
             print(f"📄 Extracted {len(text)} characters from {filename}")
             return text
             
@@ -61,6 +126,13 @@ class AdvancedRAGEngine:
             print(f"❌ Error extracting text from {filename}: {str(e)}")
             return ""
     
+    def _join_pages(self, page_texts) -> str:
+        """Clean page texts and join them with page markers"""
+        return "".join(
+            f"\n--- Page {page_num} ---\n{self._clean_text(page_text)}\n"
+            for page_num, page_text in enumerate(page_texts, start=1)
+        )
+    
     def _clean_text(self, text: str) -> str:
         """Clean and normalize extracted text"""
         # Remove excessive whitespace
@@ -76,158 +148,405 @@ class AdvancedRAGEngine:
         
         return text.strip()
     
+    def _split_pages(self, text: str) -> List[Tuple[int, str]]:
+        """Split text produced by extract_text_from_pdf back into (page number, text) pages"""
+        parts = re.split(r'\n--- Page (\d+) ---\n', text)
+        pages = [(1, parts[0])] if parts[0].strip() else []
+        pages.extend((int(parts[i]), parts[i + 1]) for i in range(1, len(parts) - 1, 2))
+        return pages
+    
     def create_intelligent_chunks(self, text: str, filename: str) -> List[Dict]:
-        """Create intelligent text chunks with metadata"""
-        chunks = []
-        words = text.split()
-        
-        if len(words) <= self.chunk_size:
-            # Single chunk for short texts
-            chunk = {
-                'text': text,
-                'filename': filename,
-                'chunk_id': 0,
-                'page_start': 1,
-                'page_end': 1,
-                'word_count': len(words)
-            }
-            chunks.append(chunk)
-            return chunks
-        
-        # Create overlapping chunks
-        start = 0
-        chunk_id = 0
-        
-        while start < len(words):
-            end = start + self.chunk_size
-            
-            # Try to break at sentence boundary
-            if end < len(words):
-                # Look for sentence endings within the last 50 words
-                for i in range(end, max(start, end - 50), -1):
-                    if i < len(words) and words[i].endswith(('.', '!', '?')):
-                        end = i + 1
-                        break
-            
-            # Extract chunk text
-            chunk_words = words[start:end]
-            chunk_text = ' '.join(chunk_words)
-            
-            # Create chunk with metadata
-            chunk = {
-                'text': chunk_text,
-                'filename': filename,
-                'chunk_id': chunk_id,
-                'page_start': 1,  # Simplified for now
-                'page_end': 1,    # Could be enhanced with actual page mapping
-                'word_count': len(chunk_words),
-                'start_word': start,
-                'end_word': end
-            }
-            
-            chunks.append(chunk)
-            chunk_id += 1
-            
-            # Move start position with overlap
-            start = end - self.chunk_overlap
-            if start >= len(words):
-                break
+        """Create intelligent text chunks with metadata, including the pages each chunk spans"""
+        chunks = list(self.stream_chunks(self._split_pages(text), filename))
         
         print(f"🔪 Created {len(chunks)} chunks from {filename}")
         return chunks
     
+    def _token_counts(self, words: List[str]) -> List[int]:
+        """Number of embedding model tokens in each word of a page"""
+        if not words:
+            return []
+        
+        # One batched call per page; word_ids() maps every token back to its word
+        if self.chunk_tokenizer.is_fast:
+            encoding = self.chunk_tokenizer(words, is_split_into_words=True, add_special_tokens=False, verbose=False)
+            word_ids = [word_id for word_id in encoding.word_ids() if word_id is not None]
+            return np.bincount(word_ids, minlength=len(words)).tolist()
+        encoding = self.chunk_tokenizer(words, add_special_tokens=False, verbose=False)
+        return [len(token_ids) for token_ids in encoding['input_ids']]
+    
+    def stream_chunks(self, pages: Iterable[Tuple[int, str]], filename: str) -> Iterator[Dict]:
+        """Chunk a stream of (page number, text) pages, yielding chunks as soon as they are complete"""
+        cleaned_pages = ((page_num, self._clean_text(page_text)) for page_num, page_text in pages)
+        if self.chunk_unit == 'tokens':
+            return stream_chunks(cleaned_pages, self.chunk_size, self.chunk_overlap, filename,
+                                 weigh=self._token_counts, size_field='token_count')
+        return stream_chunks(cleaned_pages, self.chunk_size, self.chunk_overlap, filename)
+    
+    def encode_texts(self, texts: List[str], **kwargs) -> np.ndarray:
+        """Embed texts with the shared model, one caller at a time (see get_encode_lock)"""
+        with self.encode_lock:
+            return self.embedding_model.encode(texts, **kwargs)
+    
     def generate_embeddings(self, chunks: List[Dict]) -> np.ndarray:
         """Generate embeddings for all text chunks"""
         texts = [chunk['text'] for chunk in chunks]
         
         print(f"🧠 Generating embeddings for {len(texts)} chunks...")
-        embeddings = self.embedding_model.encode(texts, show_progress_bar=True)
+        embeddings = self.embedding_cache.encode(
+            texts,
+            lambda misses: self.encode_texts(misses, show_progress_bar=True),
+            dimension=self.embedding_dimension
+        )
         
         print(f"✅ Generated {embeddings.shape[0]} embeddings of dimension {embeddings.shape[1]}")
         return embeddings
     
+    def _create_index(self, training_vectors: Optional[np.ndarray] = None):
+        """Create an empty index of the configured type, trained on the given vectors if needed"""
+        n_vectors = 0 if training_vectors is None else len(training_vectors)
+        index_type = target_index_type(n_vectors, self.index_config)
+        return build_index(index_type, self.embedding_dimension, self.index_config, training_vectors)
+    
     def build_faiss_index(self, embeddings: np.ndarray, chunks: List[Dict]):
         """Build FAISS index for fast similarity search"""
-        # Clear existing index
-        self.index = faiss.IndexFlatL2(self.embedding_dimension)
+        # Clear existing index (a new one is trained on these embeddings)
+        self.chunks = ChunkStore(text_store=self.text_store)
+        self.lexical_index = BM25Index()
+        self.deleted_ids = set()
+        self.next_vector_id = 0
         
         # Add embeddings to index
-        self.index.add(embeddings.astype('float32'))
-        
-        # Store chunks and metadata
-        self.chunks = chunks
-        self.chunk_metadata = chunks
+        self.add_to_index(embeddings, chunks)
         
         print(f"🔍 FAISS index built with {self.index.ntotal} vectors")
     
-    def semantic_search(self, query: str, top_k: int = 3) -> List[Tuple[Dict, float]]:
-        """Perform semantic search using FAISS"""
-        # Generate query embedding
-        query_embedding = self.embedding_model.encode([query])
+    def add_to_index(self, embeddings: np.ndarray, chunks: List[Dict]) -> List[int]:
+        """Append chunks to the existing index under new stable vector IDs"""
+        embeddings = embeddings.astype('float32')
+        if not self.chunks:
+            # Empty index: choose and train the backend on the first batch
+            self.index = self._create_index(embeddings)
+            self.deleted_ids = set()
+        
+        vector_ids = list(range(self.next_vector_id, self.next_vector_id + len(chunks)))
+        self.next_vector_id += len(chunks)
+        
+        self.index.add_with_ids(embeddings, np.array(vector_ids, dtype='int64'))
+        self._bump_index_version()
+        
+        self.chunks.extend(chunks, vector_ids)
+        if self.lexical_index is not None:
+            self.lexical_index.add(vector_ids, (chunk['text'] for chunk in chunks))
+        
+        # Switch backend (or retrain IVF lists) when the corpus has outgrown the index
+        if needs_rebuild(self.index, len(self.chunks), self.index_config, len(self.deleted_ids)):
+            self.rebuild_index()
+        
+        return vector_ids
+    
+    def _bump_index_version(self):
+        """Mark the index as changed so cached search results are no longer used"""
+        self.index_version += 1
+        self.result_cache.clear()
+    
+    def rebuild_index(self):
+        """Rebuild the index with the backend suited to the current corpus size"""
+        self.chunks = self.chunks.compacted()
+        vector_ids = self.chunks.vector_ids()
+        if not len(vector_ids):
+            self.index = self._create_index()
+            self.deleted_ids = set()
+            return
+        
+        # Move the stored vectors across; only IVF-PQ's lossy codes need the chunks embedded again
+        # (one batched text read, and vectors from the embedding cache in the common case)
+        embeddings = reconstruct_vectors(self.index, vector_ids)
+        if embeddings is None:
+            embeddings = self.generate_embeddings(self.chunks.get_many(vector_ids))
+        
+        self.index = self._create_index(embeddings)
+        self.index.add_with_ids(embeddings, vector_ids)
+        self.deleted_ids = set()
+        self._bump_index_version()
+        
+        print(f"🔁 Rebuilt {describe_index(self.index)} index with {self.index.ntotal} vectors")
+    
+    def remove_document(self, filename: str) -> bool:
+        """Remove a document's vectors and chunks without touching the rest of the index"""
+        vector_ids = self.chunks.ids_for(filename)
+        if not len(vector_ids):
+            print(f"⚠️ Document not in index: {filename}")
+            return False
+        
+        try:
+            self.index.remove_ids(vector_ids)
+        except RuntimeError:
+            # Index type cannot delete in place; hide the vectors at search time instead
+            self.deleted_ids.update(vector_ids.tolist())
+        
+        self.chunks.remove(vector_ids)
+        if self.lexical_index is not None:
+            self.lexical_index.remove(vector_ids)
+        if self.chunks.garbage_ratio() > 0.5:
+            # Reclaim the text and rows of removed documents
+            self.chunks = self.chunks.compacted()
+        self.document_mapping.pop(filename, None)
+        self._bump_index_version()
+        
+        print(f"🗑️ Removed {len(vector_ids)} chunks of {filename} from index")
+        # Tombstones make every search over-fetch; drop them (and fit the backend to the smaller corpus)
+        if needs_rebuild(self.index, len(self.chunks), self.index_config, len(self.deleted_ids)):
+            self.rebuild_index()
+        return True
+    
+    def _candidate_ids(self, filenames: Optional[List[str]] = None,
+                       page_start: Optional[int] = None, page_end: Optional[int] = None) -> np.ndarray:
+        """Vector IDs of chunks in the given documents that overlap the given page range"""
+        return self.chunks.select(filenames, page_start, page_end)
+    
+    def _search_vectors(self, query_embeddings: np.ndarray, top_k: int,
+                        candidate_ids: Optional[np.ndarray] = None) -> List[List[Dict]]:
+        """Search the FAISS index with a matrix of query vectors, one result list per row"""
+        if not self.chunks or (candidate_ids is not None and len(candidate_ids) == 0):
+            return [[] for _ in range(len(query_embeddings))]
         
-        # Search in FAISS index
-        distances, indices = self.index.search(
-            query_embedding.astype('float32'), 
-            min(top_k, len(self.chunks))
+        if candidate_ids is None:
+            # Search in FAISS index (over-fetch to make up for tombstoned vectors)
+            distances, indices = self.index.search(
+                query_embeddings.astype('float32'), 
+                min(top_k + len(self.deleted_ids), self.index.ntotal)
+            )
+        else:
+            # Restrict the search to the candidates inside FAISS; tombstoned
+            # vectors are never candidates, so no over-fetch is needed
+            params, _selector_refs = filtered_search_parameters(self.index, candidate_ids, self.index_config)
+            distances, indices = self.index.search(
+                query_embeddings.astype('float32'),
+                min(top_k, len(candidate_ids)),
+                params=params
+            )
+        
+        all_results = []
+        for row_indices, row_distances in zip(indices, distances):
+            # Return results with metadata and similarity scores
+            results = []
+            for chunk, distance in zip(self.chunks.get_many(row_indices), row_distances):
+                if chunk is not None and len(results) < top_k:
+                    # Convert distance to similarity score (0-1, higher is better)
+                    similarity_score = 1 / (1 + distance)
+                    
+                    result = {
+                        'chunk': chunk,
+                        'similarity_score': similarity_score,
+                        'distance': float(distance)
+                    }
+                    results.append(result)
+            
+            # Sort by similarity score (highest first)
+            results.sort(key=lambda x: x['similarity_score'], reverse=True)
+            all_results.append(results)
+        
+        return all_results
+    
+    @staticmethod
+    def _normalize_query(query: str) -> str:
+        """Normalize a question so trivially different phrasings share cache entries"""
+        return ' '.join(query.lower().split())
+    
+    def _encode_queries(self, queries: List[str], batch_size: int = 64) -> np.ndarray:
+        """Embed normalized queries, encoding only those not in the query embedding cache"""
+        vectors = [self.query_cache.get(query) for query in queries]
+        missing = sorted({query for query, vector in zip(queries, vectors) if vector is None})
+        
+        if missing:
+            encoded = self.encode_texts(missing, batch_size=batch_size)
+            fresh = dict(zip(missing, np.asarray(encoded, dtype='float32')))
+            for query, vector in fresh.items():
+                self.query_cache.put(query, vector)
+            vectors = [fresh[query] if vector is None else vector for query, vector in zip(queries, vectors)]
+        
+        return np.vstack(vectors).astype('float32')
+    
+    def encode_query(self, query: str) -> np.ndarray:
+        """Embedding of a question, shared with semantic_search through the query embedding cache"""
+        return self._encode_queries([self._normalize_query(query)])[0]
+    
+    def corpus_key(self, filenames: Optional[List[str]] = None, page_start: Optional[int] = None,
+                   page_end: Optional[int] = None) -> str:
+        """
+        Fingerprint of the indexed content and retrieval settings a search covers
+        
+        Equal keys mean the same documents, with the same content, are searched the
+        same way, in this or any other session; re-indexing a changed document
+        changes the key. Used to scope cached answers to a document set.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for filename in sorted(self.document_mapping if filenames is None else filenames):
+            info = self.document_mapping.get(filename)
+            if info is None:
+                continue
+            # Indexes saved before content hashes were recorded fall back to the document's sizes
+            fingerprint = info.get('content_hash') or (
+                f"{info.get('file_size')}:{info.get('total_chunks')}:{info.get('total_words')}"
+            )
+            digest.update(f"{filename}\0{fingerprint}\0".encode('utf-8'))
+        digest.update(
+            f"{page_start}:{page_end}:{self.embedding_model_name}:{self.search_mode}:"
+            f"{self.chunk_unit}:{self.chunk_size}:{self.chunk_overlap}".encode('utf-8')
         )
+        return digest.hexdigest()
+    
+    def _get_lexical_index(self) -> BM25Index:
+        """BM25 index of the live chunks, rebuilt from their text after an index was loaded"""
+        if self.lexical_index is None:
+            lexical_index = BM25Index()
+            vector_ids = self.chunks.vector_ids()
+            # Batches keep on-disk chunk text to one read per 1000 chunks
+            for start in range(0, len(vector_ids), 1000):
+                batch = vector_ids[start:start + 1000]
+                lexical_index.add(batch.tolist(), (chunk['text'] for chunk in self.chunks.get_many(batch)))
+            self.lexical_index = lexical_index
+            print(f"🔤 Built lexical index over {len(lexical_index)} chunks")
+        return self.lexical_index
+    
+    def _fuse_results(self, query: str, vector_results: List[Dict], top_k: int,
+                      candidate_ids: Optional[np.ndarray] = None) -> List[Dict]:
+        """Combine a query's FAISS results with its BM25 results by reciprocal rank fusion"""
+        lexical_results = self._get_lexical_index().search(query, max(top_k, self.hybrid_candidates), candidate_ids)
+        bm25_scores = dict(lexical_results)
+        by_id = {result['chunk']['vector_id']: result for result in vector_results}
         
-        # Return results with metadata and similarity scores
+        fused = reciprocal_rank_fusion(
+            [list(by_id), [vector_id for vector_id, _ in lexical_results]],
+            k=self.rrf_k,
+            weights=[1.0, self.lexical_weight]
+        )[:top_k]
+        
+        # Chunks that only the lexical search found still need their records
+        lexical_only = [vector_id for vector_id, _ in fused if vector_id not in by_id]
+        lexical_chunks = dict(zip(lexical_only, self.chunks.get_many(lexical_only)))
+        
+        # Scale fused scores so a chunk ranked first by both searches scores 1.0
+        best_score = (1.0 + self.lexical_weight) / (self.rrf_k + 1)
         results = []
-        for idx, distance in zip(indices[0], distances[0]):
-            if idx < len(self.chunks):
-                # Convert distance to similarity score (0-1, higher is better)
-                similarity_score = 1 / (1 + distance)
-                
-                result = {
-                    'chunk': self.chunks[idx],
-                    'similarity_score': similarity_score,
-                    'distance': float(distance)
-                }
-                results.append(result)
+        for vector_id, score in fused:
+            vector_result = by_id.get(vector_id)
+            chunk = vector_result['chunk'] if vector_result else lexical_chunks.get(vector_id)
+            if chunk is None:
+                continue
+            results.append({
+                'chunk': chunk,
+                'similarity_score': score / best_score,
+                'distance': vector_result['distance'] if vector_result else None,
+                'vector_similarity': vector_result['similarity_score'] if vector_result else None,
+                'bm25_score': bm25_scores.get(vector_id)
+            })
+        return results
+    
+    def semantic_search(self, query: str, top_k: int = 3, filenames: Optional[List[str]] = None,
+                        page_start: Optional[int] = None, page_end: Optional[int] = None,
+                        mode: Optional[str] = None, rerank: Optional[bool] = None) -> List[Tuple[Dict, float]]:
+        """
+        Perform semantic (or hybrid) search, optionally restricted to documents and a page range
         
-        # Sort by similarity score (highest first)
-        results.sort(key=lambda x: x['similarity_score'], reverse=True)
+        With a re-ranker configured (and rerank not False), RERANK_CANDIDATES
+        chunks are retrieved and re-scored by the cross-encoder within
+        RERANK_BUDGET_MS, and the best top_k are returned with a rerank_score.
+        """
+        rerank = self.reranker is not None and rerank is not False
+        depth = max(top_k, self.rerank_candidates) if rerank else top_k
+        results = self.semantic_search_many([query], depth, filenames=filenames,
+                                            page_start=page_start, page_end=page_end, mode=mode)[0]
+        if rerank and results:
+            results = self.reranker.rerank(self._normalize_query(query), results, top_k,
+                                           budget_ms=self.rerank_budget_ms or None)
         
         print(f"🔍 Semantic search returned {len(results)} results")
         return results
     
+    def semantic_search_many(self, queries: List[str], top_k: int = 3, batch_size: int = 64,
+                             filenames: Optional[List[str]] = None, page_start: Optional[int] = None,
+                             page_end: Optional[int] = None, mode: Optional[str] = None) -> List[List[Dict]]:
+        """
+        Semantic search for many queries with one batched encode and one FAISS search
+        
+        When filenames or a page range are given, only chunks from those
+        documents that overlap the pages are searched. The filter is applied
+        inside FAISS, so the requested top_k always comes from the subset.
+        
+        In hybrid mode (opt-in, see SEARCH_MODE) the FAISS and BM25
+        rankings of the top HYBRID_CANDIDATES chunks are fused, so exact terms
+        like course codes and acronyms are found even when their embeddings are
+        not close to the question. similarity_score is then the fused rank
+        score, not a cosine-like similarity (1.0 when both searches rank the
+        chunk first, 0.5 when only one does); vector_similarity and
+        bm25_score hold the individual scores, None where a search missed it.
+        """
+        mode = (mode or self.search_mode).lower()
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode {mode!r}, expected one of {SEARCH_MODES}")
+        normalized = [self._normalize_query(query) for query in queries]
+        filtered = bool(filenames) or page_start is not None or page_end is not None
+        search_filter = (tuple(sorted(filenames or ())), page_start, page_end) if filtered else None
+        
+        all_results: List[Optional[List[Dict]]] = []
+        for query in normalized:
+            cached = self.result_cache.get((query, top_k, search_filter, mode, self.index_version))
+            all_results.append(list(cached) if cached is not None else None)
+        
+        # Encode and search only the queries whose results are not cached
+        pending = [i for i, results in enumerate(all_results) if results is None]
+        if pending:
+            index_version = self.index_version
+            candidate_ids = self._candidate_ids(filenames, page_start, page_end) if filtered else None
+            query_embeddings = self._encode_queries([normalized[i] for i in pending], batch_size)
+            depth = max(top_k, self.hybrid_candidates) if mode == 'hybrid' else top_k
+            for i, results in zip(pending, self._search_vectors(query_embeddings, depth, candidate_ids)):
+                if mode == 'hybrid':
+                    results = self._fuse_results(normalized[i], results, top_k, candidate_ids)
+                self.result_cache.put((normalized[i], top_k, search_filter, mode, index_version), results)
+                all_results[i] = list(results)
+        
+        return all_results
+    
     def process_documents(self, uploaded_files: List) -> bool:
-        """Process multiple PDF documents and build search index"""
+        """Process PDF documents and add only new or changed ones to the search index"""
         try:
-            all_chunks = []
+            new_files = []
+            content_hashes = {}
             
             for uploaded_file in uploaded_files:
                 filename = uploaded_file.name
-                print(f"📚 Processing document: {filename}")
+                content_hashes[filename] = content_hash(uploaded_file)
                 
-                # Extract text
-                text = self.extract_text_from_pdf(uploaded_file, filename)
-                if not text:
+                # Size is the cheap check; same-size uploads are compared by content
+                existing = self.document_mapping.get(filename)
+                if (existing and existing.get('file_size') == uploaded_file.size
+                        and existing.get('content_hash') == content_hashes[filename]):
+                    print(f"⏭️ Already indexed: {filename}")
                     continue
+                if existing:
+                    # Changed upload under the same name replaces the old version
+                    self.remove_document(filename)
                 
-                # Create chunks
-                chunks = self.create_intelligent_chunks(text, filename)
-                all_chunks.extend(chunks)
-                
-                # Store document mapping
-                self.document_mapping[filename] = {
-                    'total_chunks': len(chunks),
-                    'total_words': len(text.split()),
-                    'file_size': uploaded_file.size
-                }
+                new_files.append(uploaded_file)
             
-            if not all_chunks:
+            # Stream new documents through extract -> chunk -> embed -> index;
+            # each batch is searchable as soon as it is added
+            self.last_ingestion_stats = IngestPipeline(self).run(new_files, content_hashes)
+            for failure in self.last_ingestion_stats['failed']:
+                print(f"⚠️ Skipped {failure['filename']}: {failure['error']}")
+            
+            if not self.last_ingestion_stats['chunks']:
+                if self.chunks:
+                    print("✅ All documents already indexed")
+                    return True
                 print("❌ No valid chunks created from documents")
                 return False
             
-            # Generate embeddings
-            embeddings = self.generate_embeddings(all_chunks)
-            
-            # Build FAISS index
-            self.build_faiss_index(embeddings, all_chunks)
-            
-            print(f"✅ Successfully processed {len(uploaded_files)} documents")
-            print(f"📊 Total chunks: {len(all_chunks)}")
+            print(f"✅ Successfully processed {self.last_ingestion_stats['documents']} documents")
+            print(f"📊 New chunks: {self.last_ingestion_stats['chunks']}, total chunks: {len(self.chunks)}")
             print(f"🔍 FAISS index ready for semantic search")
             
             return True
@@ -248,7 +567,7 @@ class AdvancedRAGEngine:
             chunk = result['chunk']
             similarity = result['similarity_score']
             
-            context_part = f"Context {i+1} (Similarity: {similarity:.3f}):\n"
+            context_part = f"Context {i+1} ({score_label(result)}: {similarity:.3f}):\n"
             context_part += f"Source: {chunk['filename']}, Chunk {chunk['chunk_id']}\n"
             context_part += f"Text: {chunk['text'][:300]}...\n"
             context_part += "-" * 50 + "\n"
@@ -257,6 +576,64 @@ class AdvancedRAGEngine:
         
         return "\n".join(context_parts)
     
+    def _index_settings(self) -> Dict:
+        """Settings that determine whether a stored index can be reused"""
+        return {
+            'embedding_model': self.embedding_model_name,
+            'embedding_dimension': self.embedding_dimension,
+            'chunk_size': self.chunk_size,
+            'chunk_overlap': self.chunk_overlap,
+            'chunk_unit': self.chunk_unit,
+            'chunk_text_store': 'sqlite' if self.text_store is not None else 'memory',
+            'index_type': describe_index(self.index)
+        }
+    
+    def save_index(self, directory: Optional[str] = None) -> bool:
+        """Save the FAISS index, chunks and document mapping to disk"""
+        directory = directory or self.index_store_dir
+        try:
+            manifest = IndexStore(directory).save(
+                self.index,
+                self.chunks.to_dicts(),
+                self.document_mapping,
+                self._index_settings(),
+                deleted_ids=sorted(self.deleted_ids),
+                next_vector_id=self.next_vector_id
+            )
+            print(f"💾 Saved index with {manifest['total_vectors']} vectors to {directory}")
+            return True
+        except Exception as e:
+            print(f"❌ Error saving index to {directory}: {str(e)}")
+            return False
+    
+    def load_index(self, directory: Optional[str] = None) -> bool:
+        """Load a previously saved index if it matches the current model and chunking settings"""
+        directory = directory or self.index_store_dir
+        store = IndexStore(directory)
+        if not store.exists():
+            return False
+        
+        try:
+            data = store.load(self._index_settings())
+        except StaleIndexError as e:
+            print(f"⚠️ Ignoring stale index in {directory}: {str(e)}")
+            return False
+        except Exception as e:
+            print(f"❌ Error loading index from {directory}: {str(e)}")
+            return False
+        
+        self.index = data['index']
+        configure_search(self.index, self.index_config)
+        self.chunks = ChunkStore.from_chunks(data['chunks'], text_store=self.text_store)
+        self.lexical_index = None  # rebuilt from the chunk text on first hybrid search
+        self.document_mapping = data['document_mapping']
+        self.deleted_ids = set(data['deleted_ids'])
+        self.next_vector_id = data['next_vector_id']
+        self._bump_index_version()
+        
+        print(f"📂 Loaded index with {self.index.ntotal} vectors from {directory}")
+        return True
+    
     def get_statistics(self) -> Dict:
         """Get statistics about the current RAG system"""
         return {
@@ -264,7 +641,21 @@ class AdvancedRAGEngine:
             'total_documents': len(self.document_mapping),
             'embedding_dimension': self.embedding_dimension,
             'faiss_index_size': self.index.ntotal if hasattr(self.index, 'ntotal') else 0,
+            'deleted_vectors': len(self.deleted_ids),
+            'chunk_store': self.chunks.memory_usage(),
+            'index_type': describe_index(self.index),
+            'index_search_params': search_parameters(self.index),
+            'embedding_cache': self.embedding_cache.stats(),
+            'embedding_model': get_model_info(self.embedding_model_name),
+            'index_version': self.index_version,
+            'ingestion': self.last_ingestion_stats,
+            'query_cache': self.query_cache.stats(),
+            'result_cache': self.result_cache.stats(),
+            'search_mode': self.search_mode,
+            'lexical_index': self.lexical_index.stats() if self.lexical_index is not None else None,
+            'reranker': self.reranker.stats() if self.reranker is not None else None,
             'chunk_size': self.chunk_size,
             'chunk_overlap': self.chunk_overlap,
+            'chunk_unit': self.chunk_unit,
             'documents': self.document_mapping
         }
@@ -0,0 +1,155 @@
+"""
+StudyMate Advanced Re-Ranker
+Cross-encoder re-scoring of retrieved chunks within a latency budget
+Hackathon Project - TripleMind Team
+"""
+
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+from sentence_transformers import CrossEncoder
+
+from chunk_text_store import text_key
+
+# Shared StudyMate modules live in the project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from caching import LRUCache
+
+# Pairs scored first when no per-pair latency has been measured yet
+CALIBRATION_PAIRS = 4
+
+# Weight of the newest measurement in the running per-pair latency estimate
+LATENCY_SMOOTHING = 0.3
+
+
+class Reranker:
+    """
+    Re-scores (question, chunk) pairs with a cross-encoder
+
+    The cross-encoder reads question and chunk together, so it ranks far
+    better than embedding distance but costs a model pass per pair. Pairs
+    are scored in one batch, and only as many as the latency budget allows
+    given the measured cost per pair: the best-retrieved candidates are
+    scored first, and only the leading run of scored candidates is
+    re-ordered while the rest keep their retrieval order behind it.
+    Scores are cached by question and chunk content, so they survive index
+    changes and are shared by every session using the same model.
+    """
+
+    def __init__(self, model_name: str, max_length: int = 512, cache_size: int = 20000,
+                 cache_ttl: Optional[float] = None):
+        """Prepare a re-ranker; the cross-encoder is loaded on first use"""
+        self.model_name = model_name
+        self.max_length = max_length
+        self.score_cache = LRUCache(max_size=cache_size, ttl=cache_ttl)
+        self._model = None
+        # The fast tokenizer cannot be used from two threads at once
+        self._lock = threading.Lock()
+        self.ms_per_pair: Optional[float] = None
+        self.calls = 0
+        self.skipped = 0
+        self.truncated = 0
+        self.pairs_scored = 0
+
+    def _load(self):
+        if self._model is None:
+            print(f"🔄 Loading re-ranking model: {self.model_name}")
+            self._model = CrossEncoder(self.model_name, max_length=self.max_length)
+        return self._model
+
+    def _predict(self, pairs: List[List[str]]) -> List[float]:
+        """Score pairs in one batch and update the per-pair latency estimate"""
+        model = self._load()
+        start = time.perf_counter()
+        scores = model.predict(pairs, batch_size=max(len(pairs), 1), show_progress_bar=False)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        measured = elapsed_ms / len(pairs)
+        if self.ms_per_pair is None:
+            self.ms_per_pair = measured
+        else:
+            self.ms_per_pair += LATENCY_SMOOTHING * (measured - self.ms_per_pair)
+        self.pairs_scored += len(pairs)
+        return [float(score) for score in scores]
+
+    def rerank(self, query: str, results: List[Dict], top_k: int,
+               budget_ms: Optional[float] = None) -> List[Dict]:
+        """
+        Re-order search results by cross-encoder score
+
+        Args:
+            query (str): Normalized question
+            results (List[Dict]): Search results, best retrieved first
+            top_k (int): Number of results to keep
+            budget_ms (Optional[float]): Time allowed for scoring, None for no limit
+
+        Returns:
+            List[Dict]: Top results, each with a 'rerank_score' (None if it was not scored)
+        """
+        start = time.perf_counter()
+        self.calls += 1
+        keys = [(query, text_key(result['chunk']['text'])) for result in results]
+        scores: List[Optional[float]] = [self.score_cache.get(key) for key in keys]
+        missing = [i for i, score in enumerate(scores) if score is None]
+
+        if missing:
+            with self._lock:
+                # Loading the model is a one-time cost and is not charged to the budget
+                load_start = time.perf_counter()
+                self._load()
+                start += time.perf_counter() - load_start
+
+                if budget_ms is not None and self.ms_per_pair is None:
+                    # A small first batch measures the cost per pair
+                    calibration = missing[:CALIBRATION_PAIRS]
+                    self._score(query, results, keys, scores, calibration)
+                    missing = missing[len(calibration):]
+
+                affordable = len(missing)
+                if budget_ms is not None:
+                    # Time spent waiting for another session's batch counts against the budget
+                    remaining_ms = budget_ms - (time.perf_counter() - start) * 1000
+                    affordable = min(affordable, max(int(remaining_ms / max(self.ms_per_pair, 1e-6)), 0))
+                if affordable < len(missing):
+                    if affordable == 0 and len(missing) == len(results):
+                        self.skipped += 1
+                    else:
+                        self.truncated += 1
+                self._score(query, results, keys, scores, missing[:affordable])
+                missing = missing[affordable:]
+
+        # Only the leading run of scored candidates is re-ordered; from the first unscored one
+        # on, retrieval order is kept, so a cached score cannot lift a weak candidate above
+        # better-retrieved ones the budget left unscored
+        prefix = min(missing) if missing else len(results)
+        order = sorted(range(prefix), key=lambda i: scores[i], reverse=True) + list(range(prefix, len(results)))
+
+        reranked = []
+        for i in order[:top_k]:
+            result = dict(results[i])
+            result['rerank_score'] = scores[i]
+            reranked.append(result)
+        return reranked
+
+    def _score(self, query: str, results: List[Dict], keys: List, scores: List, indices: List[int]):
+        if not indices:
+            return
+        fresh = self._predict([[query, results[i]['chunk']['text']] for i in indices])
+        for i, score in zip(indices, fresh):
+            scores[i] = score
+            self.score_cache.put(keys[i], score)
+
+    def stats(self) -> Dict:
+        """Get re-ranking counts, the per-pair latency estimate and cache statistics"""
+        return {
+            'model_name': self.model_name,
+            'loaded': self._model is not None,
+            'calls': self.calls,
+            'skipped_over_budget': self.skipped,
+            'truncated_over_budget': self.truncated,
+            'pairs_scored': self.pairs_scored,
+            'ms_per_pair': round(self.ms_per_pair, 3) if self.ms_per_pair is not None else None,
+            'score_cache': self.score_cache.stats()
+        }
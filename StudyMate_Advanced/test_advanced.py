@@ -6,8 +6,13 @@ Hackathon Project - TripleMind Team
 
 import os
 import sys
+import threading
+import time
 from dotenv import load_dotenv
 
+# Shared StudyMate modules live in the project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 # Load environment variables
 load_dotenv()
 
@@ -123,6 +128,413 @@ def test_rag_engine_initialization():
         print(f"❌ RAG Engine initialization failed: {e}")
         return False
 
+def test_index_store():
+    """Test saving and reloading an index with the on-disk store"""
+    print("\n💾 Testing index store...")
+    
+    try:
+        import tempfile
+        import numpy as np
+        import faiss
+        from index_store import IndexStore, StaleIndexError
+        
+        settings = {
+            'embedding_model': 'test-model',
+            'embedding_dimension': 8,
+            'chunk_size': 500,
+            'chunk_overlap': 100
+        }
+        index = faiss.IndexFlatL2(8)
+        index.add(np.random.rand(3, 8).astype('float32'))
+        chunks = [{'text': f'chunk {i}', 'filename': 'test.pdf', 'chunk_id': i} for i in range(3)]
+        
+        with tempfile.TemporaryDirectory() as directory:
+            store = IndexStore(directory)
+            store.save(index, chunks, {'test.pdf': {'total_chunks': 3}}, settings)
+            
+            data = store.load(settings)
+            if data['index'].ntotal != 3 or len(data['chunks']) != 3:
+                print("❌ Reloaded index does not match saved index")
+                return False
+            print("✅ Index saved and reloaded successfully")
+            
+            try:
+                store.load(dict(settings, chunk_size=250))
+                print("❌ Stale index was not detected")
+                return False
+            except StaleIndexError:
+                print("✅ Stale index detected on settings mismatch")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Index store test failed: {e}")
+        return False
+
+def test_chunking():
+    """Test chunk overlap, page spans and splitting of oversized tokens"""
+    print("\n✂️ Testing shared chunker...")
+    
+    try:
+        from chunking import stream_chunks, stream_character_chunks, chunk_characters, count_characters
+        
+        pages = [(1, 'one two three four five. six seven'), (2, 'eight nine ten eleven twelve')]
+        chunks = list(stream_chunks(pages, 4, 1, 'notes.pdf'))
+        
+        # Every word is covered, and consecutive chunks overlap by at most one word
+        if chunks[0]['start_word'] != 0 or chunks[-1]['end_word'] != 12:
+            print("❌ Chunks do not cover the document")
+            return False
+        for previous, chunk in zip(chunks, chunks[1:]):
+            if not 0 <= previous['end_word'] - chunk['start_word'] <= 1:
+                print(f"❌ Chunks {previous['chunk_id']} and {chunk['chunk_id']} overlap by more than 1 word")
+                return False
+        if any(chunk['word_count'] > 4 for chunk in chunks):
+            print("❌ Chunk larger than chunk_size")
+            return False
+        print("✅ Word chunks cover the text with bounded overlap")
+        
+        # A chunk that crosses the page break spans both pages
+        spans = {(chunk['page_start'], chunk['page_end']) for chunk in chunks}
+        if (1, 2) not in spans or any(chunk['filename'] != 'notes.pdf' for chunk in chunks):
+            print(f"❌ Unexpected page spans: {sorted(spans)}")
+            return False
+        print("✅ Page spans recorded")
+        
+        # Tokens longer than a whole chunk are split instead of producing an oversized chunk
+        url = 'https://example.com/' + 'a' * 60
+        chunks = list(stream_chunks([(1, f'see {url} here')], 20, 5, weigh=count_characters))
+        if any(len(chunk['text']) > 20 for chunk in chunks) or ''.join(c['text'] for c in chunks).count('a') < 60:
+            print("❌ Oversized token not split in word mode")
+            return False
+        pieces = list(chunk_characters('x' * 5000, 100, 20))
+        if len(pieces) < 50 or any(len(piece) > 100 for piece in pieces):
+            print(f"❌ Unspaced text gave {len(pieces)} character chunks")
+            return False
+        chunks = list(stream_character_chunks([(1, 'First page. ' * 10), (2, 'Second page. ' * 10)], 50, 10))
+        if any(len(chunk['text']) > 50 for chunk in chunks) or chunks[-1]['page_end'] != 2:
+            print("❌ Character chunks exceed chunk_size or lose their pages")
+            return False
+        print("✅ Oversized tokens split to fit chunk_size")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Chunking test failed: {e}")
+        return False
+
+def test_reranker_budget():
+    """Test that a budget cut-off only re-orders the scored prefix of the results"""
+    print("\n🎯 Testing re-ranking budget...")
+    
+    try:
+        from reranker import Reranker
+        from chunk_text_store import text_key
+        
+        relevance = {'c0': 0.1, 'c1': 0.9, 'c2': 0.5, 'c3': 0.7, 'c4': 0.2}
+        
+        class FixedScores:
+            """Cross-encoder stand-in with known scores, so no model is downloaded"""
+            def predict(self, pairs, **kwargs):
+                return [relevance[text] for _, text in pairs]
+        
+        reranker = Reranker('test-cross-encoder')
+        reranker._model = FixedScores()
+        results = [{'chunk': {'text': text}} for text in ['c0', 'c1', 'c2', 'c3', 'c4']]
+        
+        # Unlimited budget: every candidate is scored and sorted
+        order = [r['chunk']['text'] for r in reranker.rerank('q', results, 5)]
+        if order != ['c1', 'c3', 'c2', 'c4', 'c0']:
+            print(f"❌ Unexpected full re-ranking order: {order}")
+            return False
+        print("✅ Full budget sorts every candidate")
+        
+        # Budget for two pairs; c4's cached high score must not lift it above unscored c2, c3
+        reranker.score_cache.clear()
+        reranker.score_cache.put(('q2', text_key('c4')), 0.99)
+        reranker.ms_per_pair = 10.0
+        reranked = reranker.rerank('q2', results, 5, budget_ms=25)
+        order = [r['chunk']['text'] for r in reranked]
+        if order != ['c1', 'c0', 'c2', 'c3', 'c4']:
+            print(f"❌ Unexpected order after the budget ran out: {order}")
+            return False
+        if reranked[2]['rerank_score'] is not None or reranker.stats()['truncated_over_budget'] != 1:
+            print("❌ Unscored candidates not reported as such")
+            return False
+        print("✅ Budget cut-off keeps retrieval order after the scored prefix")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Re-ranking budget test failed: {e}")
+        return False
+
+def test_lexical_search():
+    """Test BM25 ranking, compound terms, filters and reciprocal rank fusion"""
+    print("\n🔤 Testing lexical search...")
+    
+    try:
+        from lexical_index import BM25Index, reciprocal_rank_fusion
+        
+        texts = [
+            'machine learning basics',
+            'machine tools and lathes',
+            'learning styles of students',
+            'deep learning networks',
+            'learning to read',
+            'reinforcement learning agents',
+            'Syllabus for CS-101, taught in the fall'
+        ]
+        index = BM25Index()
+        index.add(range(len(texts)), texts)
+        
+        # Both terms matter; the common one ("learning", in most chunks) weighs less but still counts
+        hits = index.search('machine learning', 10)
+        ranked = [doc_id for doc_id, _ in hits]
+        if ranked[0] != 0 or not {1, 2, 3, 4, 5} <= set(ranked):
+            print(f"❌ Unexpected BM25 ranking: {hits}")
+            return False
+        scores = dict(hits)
+        if not scores[1] > scores[2]:
+            print("❌ Common term weighed as much as the rare one")
+            return False
+        print("✅ BM25 scores every query term, weighted by IDF")
+        
+        if [doc_id for doc_id, _ in index.search('cs101', 5)] != [6]:
+            print("❌ Compound course code not matched")
+            return False
+        if [doc_id for doc_id, _ in index.search('machine', 5, candidate_ids=[1, 2])] != [1]:
+            print("❌ Candidate filter not applied")
+            return False
+        index.remove([0])
+        if 0 in [doc_id for doc_id, _ in index.search('machine learning', 10)]:
+            print("❌ Removed document still found")
+            return False
+        print("✅ Compound terms, candidate filters and removal")
+        
+        fused = reciprocal_rank_fusion([[1, 2, 3], [3, 1]], k=60)
+        if [doc_id for doc_id, _ in fused] != [1, 3, 2]:
+            print(f"❌ Unexpected fused ranking: {fused}")
+            return False
+        if abs(fused[0][1] - (1 / 61 + 1 / 62)) > 1e-9:
+            print(f"❌ Unexpected fused score: {fused[0][1]}")
+            return False
+        print("✅ Reciprocal rank fusion rewards agreement between rankings")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Lexical search test failed: {e}")
+        return False
+
+def test_chunk_store():
+    """Test columnar chunk records, in memory and backed by the on-disk text store"""
+    print("\n🗃️ Testing chunk store...")
+    
+    try:
+        import tempfile
+        from chunk_store import ChunkStore
+        from chunk_text_store import ChunkTextStore
+        
+        # More chunks than the initial capacity, so the columns have to grow
+        chunks = [
+            {'text': f'chunk {i} text ✓', 'filename': f'doc{i % 3}.pdf', 'chunk_id': i,
+             'page_start': i // 10 + 1, 'page_end': i // 10 + 1, 'word_count': 3}
+            for i in range(300)
+        ]
+        
+        with tempfile.TemporaryDirectory() as directory:
+            text_store = ChunkTextStore(os.path.join(directory, 'chunks.sqlite'))
+            for label, store in (("in memory", ChunkStore()), ("on disk", ChunkStore(text_store=text_store))):
+                store.extend(chunks, [i * 2 for i in range(300)])
+                
+                view = store[20]
+                if view['text'] != 'chunk 10 text ✓' or view['filename'] != 'doc1.pdf' or view['page_start'] != 2:
+                    print(f"❌ Wrong chunk view {label}: {dict(view)}")
+                    return False
+                views = store.get_many([0, 1, 598])
+                if views[1] is not None or views[2]['chunk_id'] != 299 or views[0]['text'] != 'chunk 0 text ✓':
+                    print(f"❌ Batch lookup {label} returned {views}")
+                    return False
+                
+                removed = store.remove(store.ids_for('doc0.pdf'))
+                if removed != 100 or len(store) != 200 or 0 in store:
+                    print(f"❌ Removal {label} left {len(store)} chunks")
+                    return False
+                on_page_3 = store.select(filenames=['doc1.pdf'], page_start=3, page_end=3)
+                if sorted(store[i]['chunk_id'] for i in on_page_3) != [22, 25, 28]:
+                    print(f"❌ Page filter {label} returned {on_page_3}")
+                    return False
+                
+                compacted = store.compacted()
+                if len(compacted) != 200 or compacted.filename_table != ['doc1.pdf', 'doc2.pdf']:
+                    print(f"❌ Compaction {label} kept {len(compacted)} chunks")
+                    return False
+                if [dict(v) for v in compacted] != [dict(v) for v in store]:
+                    print(f"❌ Compaction {label} changed the chunks")
+                    return False
+                print(f"✅ Chunk store {label}: lookups, removal, page filter and compaction")
+            
+            if text_store.stats()['texts'] != 300:
+                print(f"❌ Text store counted {text_store.stats()['texts']} texts")
+                return False
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Chunk store test failed: {e}")
+        return False
+
+def test_answer_cache():
+    """Test exact and semantic answer cache hits, scoped to a document set"""
+    print("\n♻️ Testing answer cache...")
+    
+    try:
+        import numpy as np
+        from answer_cache import AnswerCache
+        
+        # Exact hits need the same prompt and context
+        answer_cache = AnswerCache()
+        key = AnswerCache.make_key('watsonx', 'granite', {'temperature': 0.7}, 'What is RAG?', 'context A')
+        answer_cache.store(key, 'Retrieval-augmented generation')
+        if answer_cache.lookup(key) != 'Retrieval-augmented generation':
+            print("❌ Exact hit missed")
+            return False
+        changed = AnswerCache.make_key('watsonx', 'granite', {'temperature': 0.7}, 'What is RAG?', 'context B')
+        if answer_cache.lookup(changed) is not None:
+            print("❌ Answer reused for a different context")
+            return False
+        print("✅ Exact hits require the same prompt and context")
+        
+        # Semantic hits: similar questions over the same document set only
+        answer_cache = AnswerCache(similarity_threshold=0.9)
+        question = np.array([1.0, 0.0, 0.0], dtype='float32')
+        similar = np.array([0.99, 0.1, 0.0], dtype='float32')
+        unrelated = np.array([0.0, 1.0, 0.0], dtype='float32')
+        answer_cache.store('k1', 'answer', scope='docs-1', embedding=question)
+        
+        hit = answer_cache.lookup('k2', scope='docs-1', embedding=similar)
+        if hit != 'answer' or hit.source != 'semantic':
+            print(f"❌ Similar question missed: {hit!r}")
+            return False
+        if answer_cache.lookup('k3', scope='docs-1', embedding=unrelated) is not None:
+            print("❌ Unrelated question served a cached answer")
+            return False
+        if answer_cache.lookup('k4', scope='docs-2', embedding=similar) is not None:
+            print("❌ Answer served for a different document set")
+            return False
+        print("✅ Semantic hits stay within their document set")
+        
+        stats = answer_cache.stats()
+        if stats['semantic_hits'] != 1 or stats['misses'] != 2:
+            print(f"❌ Unexpected answer cache stats: {stats}")
+            return False
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Answer cache test failed: {e}")
+        return False
+
+def test_request_coalescing():
+    """Test that identical in-flight answers are shared and cached once complete"""
+    print("\n🤝 Testing request coalescing...")
+    
+    try:
+        from answer_cache import AnswerCache, CachedAnswer, cached_stream
+        from coalescing import RequestCoalescer, LeaderInterrupted
+        
+        coalescer = RequestCoalescer()
+        answer_cache = AnswerCache()
+        calls = []
+        
+        def provider(release=None):
+            calls.append(1)
+            yield "Hello "
+            if release is not None:
+                release.wait(5)
+            yield "world"
+            return True
+        
+        def ask(key, release=None):
+            return coalescer.stream(key, lambda: cached_stream(key, provider(release), answer_cache))
+        
+        def follow(key, received):
+            stream = ask(key)
+            try:
+                received['pieces'] = list(stream)
+                received['result'] = stream.result
+            except Exception as e:
+                received['error'] = e
+        
+        def wait_for_followers(count):
+            deadline = time.monotonic() + 5
+            while coalescer.followers < count and time.monotonic() < deadline:
+                time.sleep(0.01)
+        
+        # Leader: streams the provider's pieces and caches the complete answer
+        leader = ask('q1')
+        pieces = list(leader)
+        if pieces != ["Hello ", "world"] or leader.result is not True or leader.shared:
+            print(f"❌ Leader streamed {pieces} (result {leader.result})")
+            return False
+        if answer_cache.lookup('q1') != "Hello world":
+            print("❌ Complete answer was not cached")
+            return False
+        print("✅ Leader streamed and cached the answer")
+        
+        # Cache hit: one CachedAnswer piece, no provider call
+        calls.clear()
+        hit = ask('q1')
+        pieces = list(hit)
+        if calls or len(pieces) != 1 or not isinstance(pieces[0], CachedAnswer) or hit.result is not True:
+            print(f"❌ Cache hit streamed {pieces} after {len(calls)} provider calls")
+            return False
+        print("✅ Repeated question served from the cache")
+        
+        # Follower: joins mid-answer and receives every piece, with one provider call
+        calls.clear()
+        release, received = threading.Event(), {}
+        leader = iter(ask('q2', release))
+        first = next(leader)
+        follower = threading.Thread(target=follow, args=('q2', received))
+        follower.start()
+        wait_for_followers(1)
+        release.set()
+        rest = list(leader)
+        follower.join(5)
+        if [first] + rest != ["Hello ", "world"] or received.get('pieces') != ["Hello ", "world"]:
+            print(f"❌ Follower received {received}")
+            return False
+        if len(calls) != 1 or received.get('result') is not True:
+            print(f"❌ Follower made {len(calls)} provider calls (result {received.get('result')})")
+            return False
+        print("✅ Follower shared the leader's answer")
+        
+        # Interrupted leader: the follower gets LeaderInterrupted and nothing is cached
+        release, received = threading.Event(), {}
+        leader = iter(ask('q3', release))
+        next(leader)
+        follower = threading.Thread(target=follow, args=('q3', received))
+        follower.start()
+        wait_for_followers(2)
+        release.set()
+        leader.close()
+        follower.join(5)
+        if not isinstance(received.get('error'), LeaderInterrupted):
+            print(f"❌ Follower of an interrupted leader received {received}")
+            return False
+        if answer_cache.lookup('q3') is not None:
+            print("❌ Interrupted answer was cached")
+            return False
+        print("✅ Follower told that the leader was interrupted")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Request coalescing test failed: {e}")
+        return False
+
 def test_watsonx_client():
     """Test Watsonx client initialization"""
     print("\n🧠 Testing Watsonx client...")
@@ -154,6 +566,13 @@ def main():
         ("Environment Configuration", test_environment),
         ("Custom Modules", test_custom_modules),
         ("RAG Engine", test_rag_engine_initialization),
+        ("Index Store", test_index_store),
+        ("Chunking", test_chunking),
+        ("Lexical Search", test_lexical_search),
+        ("Chunk Store", test_chunk_store),
+        ("Re-ranking Budget", test_reranker_budget),
+        ("Answer Cache", test_answer_cache),
+        ("Request Coalescing", test_request_coalescing),
         ("Watsonx Client", test_watsonx_client)
     ]
     
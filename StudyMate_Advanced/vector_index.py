@@ -0,0 +1,226 @@
+"""
+StudyMate Advanced Vector Index
+Configurable FAISS index backends (flat, IVF-Flat, HNSW, IVF-PQ) with automatic selection
+Hackathon Project - TripleMind Team
+"""
+
+import os
+import math
+from typing import Dict, Any, Optional, Tuple
+import numpy as np
+import faiss
+
+INDEX_TYPES = ('flat', 'ivf', 'hnsw', 'ivfpq')
+
+# Points per centroid FAISS wants for stable k-means training
+MIN_POINTS_PER_CENTROID = 39
+PQ_CODEBOOK_SIZE = 256  # 8 bits per sub-quantizer
+MAX_FILTERED_EF_SEARCH = 1024
+
+# Share of an index's vectors that may be tombstoned (HNSW cannot delete) before it is rebuilt
+MAX_TOMBSTONE_RATIO = 0.25
+
+
+def load_index_config() -> Dict[str, Any]:
+    """Read index settings from the environment"""
+    return {
+        'index_type': os.getenv('INDEX_TYPE', 'auto').lower(),
+        'ivf_nlist': int(os.getenv('IVF_NLIST', 0)),
+        'ivf_nprobe': int(os.getenv('IVF_NPROBE', 16)),
+        'hnsw_m': int(os.getenv('HNSW_M', 32)),
+        'hnsw_ef_construction': int(os.getenv('HNSW_EF_CONSTRUCTION', 80)),
+        'hnsw_ef_search': int(os.getenv('HNSW_EF_SEARCH', 64)),
+        'pq_m': int(os.getenv('PQ_M', 0)),
+        'auto_flat_max': int(os.getenv('INDEX_AUTO_FLAT_MAX', 50000)),
+        # 0 keeps auto on IVF-Flat at any size: IVF-PQ loses about half of recall@10
+        'auto_pq_min': int(os.getenv('INDEX_AUTO_PQ_MIN', 0))
+    }
+
+
+def choose_index_type(n_vectors: int, config: Dict[str, Any]) -> str:
+    """Pick an index type for a corpus size (exact search while it is still cheap, IVF-PQ only if opted in)"""
+    if config['index_type'] != 'auto':
+        return config['index_type']
+    if n_vectors <= config['auto_flat_max']:
+        return 'flat'
+    if not config['auto_pq_min'] or n_vectors < config['auto_pq_min']:
+        return 'ivf'
+    return 'ivfpq'
+
+
+def _nlist_for(n_vectors: int, config: Dict[str, Any]) -> int:
+    """Number of IVF lists: configured, or ~4*sqrt(n) capped by the training set size"""
+    nlist = config['ivf_nlist'] or int(4 * math.sqrt(max(n_vectors, 1)))
+    return max(1, min(nlist, n_vectors // MIN_POINTS_PER_CENTROID))
+
+
+def _pq_m_for(dimension: int, config: Dict[str, Any]) -> int:
+    """Number of PQ sub-quantizers: configured, or the largest divisor giving >= 8 dims each"""
+    if config['pq_m']:
+        return config['pq_m']
+    for m in range(max(dimension // 8, 1), 0, -1):
+        if dimension % m == 0:
+            return m
+    return 1
+
+
+def min_training_vectors(index_type: str) -> int:
+    """Smallest corpus an index type can be trained on"""
+    if index_type == 'ivf':
+        return MIN_POINTS_PER_CENTROID
+    if index_type == 'ivfpq':
+        return PQ_CODEBOOK_SIZE
+    return 0
+
+
+def create_index(index_type: str, dimension: int, n_vectors: int, config: Dict[str, Any]):
+    """
+    Create an empty index that accepts add_with_ids
+
+    IVF indexes store IDs natively and support remove_ids; flat and HNSW
+    are wrapped in IndexIDMap2 (HNSW cannot remove, so callers tombstone).
+    """
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"Unknown index type '{index_type}'. Expected one of {INDEX_TYPES} or 'auto'")
+
+    if index_type == 'flat':
+        return faiss.IndexIDMap2(faiss.IndexFlatL2(dimension))
+
+    if index_type == 'hnsw':
+        hnsw = faiss.IndexHNSWFlat(dimension, config['hnsw_m'])
+        hnsw.hnsw.efConstruction = config['hnsw_ef_construction']
+        return faiss.IndexIDMap2(hnsw)
+
+    quantizer = faiss.IndexFlatL2(dimension)
+    nlist = _nlist_for(n_vectors, config)
+    if index_type == 'ivf':
+        return faiss.IndexIVFFlat(quantizer, dimension, nlist)
+    return faiss.IndexIVFPQ(quantizer, dimension, nlist, _pq_m_for(dimension, config), 8)
+
+
+def build_index(index_type: str, dimension: int, config: Dict[str, Any],
+                training_vectors: Optional[np.ndarray] = None):
+    """Create an index, train it on the given vectors if needed and apply search parameters"""
+    n_vectors = 0 if training_vectors is None else len(training_vectors)
+    index = create_index(index_type, dimension, n_vectors, config)
+    if not index.is_trained:
+        print(f"🏋️ Training {index_type} index on {n_vectors} vectors...")
+        index.train(training_vectors)
+    configure_search(index, config)
+    return index
+
+
+def target_index_type(n_vectors: int, config: Dict[str, Any]) -> str:
+    """Index type to use for a corpus, falling back to flat when too small to train"""
+    index_type = choose_index_type(n_vectors, config)
+    if n_vectors < min_training_vectors(index_type):
+        return 'flat'
+    return index_type
+
+
+def needs_rebuild(index, n_vectors: int, config: Dict[str, Any], tombstones: int = 0) -> bool:
+    """
+    Check whether an index should be rebuilt for the current corpus size
+
+    True when auto-selection now prefers another backend, when an IVF
+    index was trained on a much smaller corpus than it now holds (its list
+    count is under a quarter of the ideal), or when more than
+    MAX_TOMBSTONE_RATIO of its vectors are tombstones, which every search
+    has to over-fetch. Rebuilds therefore happen at geometrically spaced
+    sizes, keeping their amortized cost low.
+    """
+    if describe_index(index) != target_index_type(n_vectors, config):
+        return True
+    if tombstones > index.ntotal * MAX_TOMBSTONE_RATIO:
+        return True
+    params = search_parameters(index)
+    if params and 'nlist' in params and not config['ivf_nlist']:
+        return params['nlist'] * 4 < _nlist_for(n_vectors, config)
+    return False
+
+
+def reconstruct_vectors(index, vector_ids: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Stored vectors of the given IDs, to move them to a new index without re-embedding
+
+    Returns None when the index only holds a lossy copy (IVF-PQ codes) or
+    cannot look vectors up by ID; the caller then embeds the chunks again.
+    """
+    base = _base_index(index)
+    if isinstance(base, faiss.IndexIVFPQ):
+        return None
+    try:
+        if isinstance(base, faiss.IndexIVF):
+            # IVF lists are not addressable by ID until a lookup table is built
+            base.set_direct_map_type(faiss.DirectMap.Hashtable)
+        return index.reconstruct_batch(np.ascontiguousarray(vector_ids, dtype='int64'))
+    except RuntimeError:
+        return None
+
+
+def _base_index(index):
+    """Underlying index of an ID map, downcast to its concrete type"""
+    if isinstance(index, faiss.IndexIDMap):
+        return faiss.downcast_index(index.index)
+    return faiss.downcast_index(index)
+
+
+def configure_search(index, config: Dict[str, Any]):
+    """Apply query-time parameters (nprobe for IVF, efSearch for HNSW)"""
+    base = _base_index(index)
+    if isinstance(base, faiss.IndexIVF):
+        base.nprobe = config['ivf_nprobe']
+    elif isinstance(base, faiss.IndexHNSW):
+        base.hnsw.efSearch = config['hnsw_ef_search']
+
+
+def describe_index(index) -> str:
+    """Short name of an index's backend type"""
+    base = _base_index(index)
+    if isinstance(base, faiss.IndexIVFPQ):
+        return 'ivfpq'
+    if isinstance(base, faiss.IndexIVF):
+        return 'ivf'
+    if isinstance(base, faiss.IndexHNSW):
+        return 'hnsw'
+    return 'flat'
+
+
+def filtered_search_parameters(index, candidate_ids: np.ndarray, config: Dict[str, Any]) -> Tuple[Any, list]:
+    """
+    Search parameters restricting a search to the given vector IDs
+
+    Distances are only computed for selected vectors, so a query over a
+    small subset costs far less than a full search. Approximate indexes
+    widen their search (nprobe / efSearch) in proportion to how selective
+    the filter is, so the subset is still reached.
+
+    Returns:
+        Tuple[Any, list]: The parameters and the objects they reference, which
+        must stay alive until the search finishes
+    """
+    candidate_ids = np.ascontiguousarray(candidate_ids, dtype='int64')
+    selector = faiss.IDSelectorBatch(len(candidate_ids), faiss.swig_ptr(candidate_ids))
+    widen = max(1.0, index.ntotal / max(len(candidate_ids), 1))
+
+    base = _base_index(index)
+    if isinstance(base, faiss.IndexIVF):
+        params = faiss.SearchParametersIVF()
+        params.nprobe = min(base.nlist, int(math.ceil(config['ivf_nprobe'] * widen)))
+    elif isinstance(base, faiss.IndexHNSW):
+        params = faiss.SearchParametersHNSW()
+        params.efSearch = min(MAX_FILTERED_EF_SEARCH, int(math.ceil(config['hnsw_ef_search'] * widen)))
+    else:
+        params = faiss.SearchParameters()
+    params.sel = selector
+    return params, [selector, candidate_ids]
+
+
+def search_parameters(index) -> Optional[Dict[str, int]]:
+    """Current query-time parameters of an index, for reporting"""
+    base = _base_index(index)
+    if isinstance(base, faiss.IndexIVF):
+        return {'nlist': base.nlist, 'nprobe': base.nprobe}
+    if isinstance(base, faiss.IndexHNSW):
+        return {'efSearch': base.hnsw.efSearch}
+    return None
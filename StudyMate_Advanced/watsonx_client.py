@@ -5,12 +5,19 @@ Hackathon Project - TripleMind Team
 """
 
 import os
+import sys
 import requests
 import json
 import time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator
 from dotenv import load_dotenv
 
+# Shared StudyMate modules live in the project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from streaming import iter_sse_data
+from iam_token import get_token_manager
+from http_transport import get_transport
+
 # Load environment variables
 load_dotenv()
 
@@ -35,57 +42,69 @@ class WatsonxClient:
         # Validate configuration
         if not all([self.api_key, self.project_id, self.url]):
             raise ValueError("Watsonx API configuration incomplete. Please check your .env file")
+        
+        # IAM tokens are cached until shortly before they expire, across all sessions
+        self.token_manager = get_token_manager(self.api_key)
     
     def _get_auth_token(self) -> str:
-        """Get IBM Cloud authentication token"""
-        auth_url = "https://iam.cloud.ibm.com/identity/token"
-        auth_data = {
-            "grant_type": "urn:ibm:params:oauth:grant-type:apikey",
-            "apikey": self.api_key
+        """Get IBM Cloud authentication token (cached, refreshed before it expires)"""
+        return self.token_manager.get_token()
+    
+    def _reject_token(self, headers: Dict[str, str]):
+        """Forget the token of a request that got 401, so the retry fetches a fresh one"""
+        self.token_manager.invalidate(headers["Authorization"].split(" ", 1)[1])
+    
+    def generation_params(self) -> Dict[str, Any]:
+        """Generation parameters sent with every request"""
+        return {
+            "max_new_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            "top_p": 0.9,
+            "repetition_penalty": 1.1
         }
+    
+    def _generation_request(self, prompt: str, context: str = ""):
+        """Headers and body of a text generation request"""
+        # Get authentication token
+        token = self._get_auth_token()
         
-        response = requests.post(auth_url, data=auth_data)
-        response.raise_for_status()
+        # Prepare the full prompt with context
+        if context:
+            full_prompt = f"Context: {context}\n\nQuestion: {prompt}\n\nAnswer:"
+        else:
+            full_prompt = f"Question: {prompt}\n\nAnswer:"
+        
+        # Request headers
+        headers = {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json"
+        }
         
-        return response.json()["access_token"]
+        # Request body
+        payload = {
+            "model_id": self.model_id,
+            "input": full_prompt,
+            "parameters": self.generation_params(),
+            "project_id": self.project_id
+        }
+        return headers, payload
     
     def generate_response(self, prompt: str, context: str = "") -> Dict[str, Any]:
         """Generate response using IBM Watsonx AI with rate limiting protection"""
         for attempt in range(self.max_retries):
             try:
-                # Get authentication token
-                token = self._get_auth_token()
-                
-                # Prepare the full prompt with context
-                if context:
-                    full_prompt = f"Context: {context}\n\nQuestion: {prompt}\n\nAnswer:"
-                else:
-                    full_prompt = f"Question: {prompt}\n\nAnswer:"
+                headers, payload = self._generation_request(prompt, context)
                 
                 # API endpoint
                 api_url = f"{self.url}/ml/v1/text/generation?version=2024-11-19"
                 
-                # Request headers
-                headers = {
-                    "Authorization": f"Bearer {token}",
-                    "Content-Type": "application/json"
-                }
-                
-                # Request body
-                payload = {
-                    "model_id": self.model_id,
-                    "input": full_prompt,
-                    "parameters": {
-                        "max_new_tokens": self.max_tokens,
-                        "temperature": self.temperature,
-                        "top_p": 0.9,
-                        "repetition_penalty": 1.1
-                    },
-                    "project_id": self.project_id
-                }
-                
                 # Make API request
-                response = requests.post(api_url, headers=headers, json=payload)
+                response = get_transport().post(api_url, headers=headers, json=payload)
+                
+                # A revoked or expired token is replaced once
+                if response.status_code == 401 and attempt < self.max_retries - 1:
+                    self._reject_token(headers)
+                    continue
                 
                 # Handle rate limiting
                 if response.status_code == 429:
@@ -159,6 +178,58 @@ class WatsonxClient:
             "raw_response": None
         }
     
+    def generate_response_stream(self, prompt: str, context: str = "") -> Iterator[str]:
+        """
+        Stream a response from IBM Watsonx AI, yielding text as the model generates it
+        
+        Rate-limited requests are retried with the same backoff as generate_response
+        until the first text arrives.
+        
+        Args:
+            prompt (str): Question
+            context (str): Retrieved context for the question
+        
+        Yields:
+            str: Generated text pieces, in order
+        
+        Raises:
+            RuntimeError: If the request fails or the rate limit is still exceeded after retries
+        """
+        api_url = f"{self.url}/ml/v1/text/generation_stream?version=2024-11-19"
+        
+        for attempt in range(self.max_retries):
+            try:
+                headers, payload = self._generation_request(prompt, context)
+                with get_transport().post(api_url, headers=headers, json=payload, stream=True) as response:
+                    # A revoked or expired token is replaced once
+                    if response.status_code == 401 and attempt < self.max_retries - 1:
+                        self._reject_token(headers)
+                        continue
+                    
+                    # Handle rate limiting
+                    if response.status_code == 429:
+                        if attempt < self.max_retries - 1:
+                            wait_time = self.retry_delay * (2 ** attempt)  # Exponential backoff
+                            print(f"⚠️ Rate limited (429). Waiting {wait_time} seconds before retry {attempt + 1}/{self.max_retries}")
+                            time.sleep(wait_time)
+                            continue
+                        raise RuntimeError("Rate limit exceeded. Please wait a few minutes before trying again.")
+                    
+                    if response.status_code != 200:
+                        raise RuntimeError(f"HTTP Error {response.status_code}: {response.text}")
+                    
+                    for event in iter_sse_data(response):
+                        result = json.loads(event)
+                        for generated in result.get("results", [])[:1]:
+                            if generated.get("generated_text"):
+                                yield generated["generated_text"]
+                    return
+                    
+            except requests.exceptions.RequestException as e:
+                raise RuntimeError(f"API request failed: {str(e)}") from e
+        
+        raise RuntimeError("Max retries exceeded")
+    
     def test_connection(self) -> Dict[str, Any]:
         """Test the Watsonx connection and model availability"""
         try:
@@ -194,7 +265,8 @@ class WatsonxClient:
             "max_tokens": self.max_tokens,
             "temperature": self.temperature,
             "api_url": self.url,
-            "project_id": self.project_id
+            "project_id": self.project_id,
+            "iam_token": self.token_manager.stats()
         }
     
     def update_parameters(self, max_tokens: Optional[int] = None, temperature: Optional[float] = None):
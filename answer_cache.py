@@ -0,0 +1,250 @@
+"""
+Answer caching for StudyMate
+Exact and semantic caches of LLM answers, shared by every session
+Hackathon Project - TripleMind Team
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Generator, Hashable, Iterator, List, Optional, Tuple
+import numpy as np
+
+from caching import LRUCache
+
+# Document sets (scopes) whose questions are kept for semantic lookups
+MAX_SEMANTIC_SCOPES = 64
+
+_answer_cache: Optional["AnswerCache"] = None
+_answer_cache_lock = threading.Lock()
+
+
+class CachedAnswer(str):
+    """An answer served from the cache; streams yield it in place of generated pieces"""
+
+    def __new__(cls, text: str, source: str, similarity: Optional[float] = None):
+        answer = super().__new__(cls, text)
+        answer.source = source  # 'exact' or 'semantic'
+        answer.similarity = similarity
+        return answer
+
+
+class AnswerCache:
+    """
+    Caches LLM answers so repeated questions skip generation
+
+    Exact entries are keyed by provider, model, generation parameters and a
+    hash of the full prompt including its retrieved context. A question
+    over documents whose retrieved context changed therefore never matches
+    an answer generated from the old context, and stale entries simply age
+    out of the LRU. The optional semantic layer also serves an answer when
+    a new question's embedding is within `similarity_threshold` (cosine) of
+    a question already answered over the same document set; the caller
+    names the document set with a content fingerprint (the scope), so
+    re-indexed documents start a fresh scope.
+    """
+
+    def __init__(self, max_size: int = 1000, ttl: Optional[float] = None,
+                 similarity_threshold: Optional[float] = None):
+        """
+        Initialize the cache
+
+        Args:
+            max_size (int): Maximum number of answers, and of questions per semantic scope
+            ttl (Optional[float]): Seconds an answer stays valid, or None for no expiry
+            similarity_threshold (Optional[float]): Minimum cosine similarity for a semantic
+                hit, or None to only serve exact hits
+        """
+        self.max_size = max_size
+        self.similarity_threshold = similarity_threshold
+        self._answers = LRUCache(max_size=max_size, ttl=ttl)
+        # scope -> (unit question embeddings, exact keys of their answers)
+        self._scopes: "OrderedDict[Hashable, Tuple[List[np.ndarray], List[Hashable]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    @property
+    def semantic(self) -> bool:
+        """Whether similar questions are matched, not just identical prompts"""
+        return self.similarity_threshold is not None
+
+    @staticmethod
+    def make_key(provider: str, model: str, params: Dict[str, Any], prompt: str, context: str = "") -> Tuple:
+        """
+        Exact cache key of a generation request
+
+        Args:
+            provider (str): Provider name, e.g. 'watsonx'
+            model (str): Model ID
+            params (Dict[str, Any]): Generation parameters that change the answer
+            prompt (str): Prompt (or serialized chat messages)
+            context (str): Retrieved context sent with the prompt
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(prompt.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(context.encode('utf-8'))
+        return provider, model, json.dumps(params, sort_keys=True), digest.hexdigest()
+
+    def lookup(self, key: Hashable, scope: Optional[Hashable] = None,
+               embedding: Optional[np.ndarray] = None) -> Optional[CachedAnswer]:
+        """
+        Find a cached answer for a request
+
+        Args:
+            key (Hashable): Exact key from make_key
+            scope (Optional[Hashable]): Document set fingerprint, for semantic lookups
+            embedding (Optional[np.ndarray]): Question embedding, for semantic lookups
+
+        Returns:
+            Optional[CachedAnswer]: The answer with its source, or None on a miss
+        """
+        answer = self._answers.get(key)
+        if answer is not None:
+            with self._lock:
+                self.exact_hits += 1
+            return CachedAnswer(answer, 'exact')
+
+        if self.semantic and scope is not None and embedding is not None:
+            match = self._similar(scope, embedding)
+            if match is not None:
+                answer, similarity = match
+                with self._lock:
+                    self.semantic_hits += 1
+                return CachedAnswer(answer, 'semantic', similarity)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _similar(self, scope: Hashable, embedding: np.ndarray) -> Optional[Tuple[str, float]]:
+        """Answer of the most similar question in a scope, if it is above the threshold"""
+        with self._lock:
+            entry = self._scopes.get(scope)
+            if entry is None:
+                return None
+            self._scopes.move_to_end(scope)
+            vectors, keys = entry
+            matrix = np.stack(vectors)
+            candidates = list(keys)
+
+        similarities = matrix @ _unit(embedding)
+        # Best match first; answers evicted from the LRU no longer count
+        for i in np.argsort(-similarities):
+            if similarities[i] < self.similarity_threshold:
+                break
+            answer = self._answers.get(candidates[i])
+            if answer is not None:
+                return answer, round(float(similarities[i]), 3)
+        return None
+
+    def store(self, key: Hashable, answer: str, scope: Optional[Hashable] = None,
+              embedding: Optional[np.ndarray] = None):
+        """
+        Cache a generated answer
+
+        Args:
+            key (Hashable): Exact key from make_key
+            answer (str): Complete generated answer
+            scope (Optional[Hashable]): Document set fingerprint, for semantic lookups
+            embedding (Optional[np.ndarray]): Question embedding, for semantic lookups
+        """
+        if not answer:
+            return
+        self._answers.put(key, str(answer))
+        if not self.semantic or scope is None or embedding is None:
+            return
+
+        with self._lock:
+            entry = self._scopes.get(scope)
+            if entry is None:
+                entry = self._scopes[scope] = ([], [])
+                while len(self._scopes) > MAX_SEMANTIC_SCOPES:
+                    self._scopes.popitem(last=False)
+            self._scopes.move_to_end(scope)
+            vectors, keys = entry
+            vectors.append(_unit(embedding))
+            keys.append(key)
+            if len(keys) > self.max_size:
+                del vectors[0], keys[0]
+
+    def clear(self):
+        """Remove all answers (hit/miss counters are kept)"""
+        self._answers.clear()
+        with self._lock:
+            self._scopes.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the number of cached answers and exact/semantic hit counts"""
+        with self._lock:
+            lookups = self.exact_hits + self.semantic_hits + self.misses
+            return {
+                'answers': len(self._answers),
+                'semantic_scopes': len(self._scopes),
+                'similarity_threshold': self.similarity_threshold,
+                'exact_hits': self.exact_hits,
+                'semantic_hits': self.semantic_hits,
+                'misses': self.misses,
+                'hit_rate': (self.exact_hits + self.semantic_hits) / lookups if lookups else 0.0
+            }
+
+
+def _unit(vector: np.ndarray) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32).ravel()
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+def cached_stream(cache_key: Hashable, pieces: Iterator[str],
+                  answer_cache: Optional[AnswerCache] = None) -> Generator[str, None, Any]:
+    """
+    Serve an answer from the answer cache, or stream it and cache it once complete
+
+    Args:
+        cache_key (Hashable): Exact key from AnswerCache.make_key
+        pieces (Iterator[str]): Provider stream; its generator returns True when the answer completed
+        answer_cache (Optional[AnswerCache]): Cache to use, the shared one by default
+
+    Yields:
+        str: The cached answer as one CachedAnswer piece, or the generated pieces
+
+    Returns:
+        True if the answer is complete (cached or fully generated)
+    """
+    if answer_cache is None:
+        answer_cache = get_answer_cache()
+    cached = answer_cache.lookup(cache_key)
+    if cached is not None:
+        yield cached
+        return True
+
+    parts = []
+    while True:
+        try:
+            piece = next(pieces)
+        except StopIteration as stop:
+            # Failed or interrupted answers are not cached
+            if stop.value:
+                answer_cache.store(cache_key, "".join(parts))
+            return stop.value
+        parts.append(piece)
+        yield piece
+
+
+def get_answer_cache() -> AnswerCache:
+    """Get the answer cache shared by every session in this process"""
+    global _answer_cache
+    with _answer_cache_lock:
+        if _answer_cache is None:
+            ttl = float(os.getenv('ANSWER_CACHE_TTL', 0))
+            threshold = float(os.getenv('ANSWER_CACHE_SIMILARITY', 0))
+            _answer_cache = AnswerCache(
+                max_size=int(os.getenv('ANSWER_CACHE_SIZE', 1000)),
+                ttl=ttl if ttl > 0 else None,
+                similarity_threshold=threshold if threshold > 0 else None
+            )
+        return _answer_cache
@@ -5,16 +5,29 @@ Simplified Working Version - Uses Google Gemini API
 
 import streamlit as st
 import os
-import fitz  # PyMuPDF
-import requests
 import json
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import tempfile
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from dotenv import load_dotenv
+from pdf_extraction import extract_documents, pdf_path, iter_pages, content_hash
+from chunking import stream_character_chunks
+from lexical_index import BM25Index
+from streaming import iter_sse_data, TimedStream
+from http_transport import get_transport
+from answer_cache import AnswerCache, CachedAnswer, get_answer_cache, cached_stream
+from coalescing import get_coalescer, normalize_question
 
 # Load environment variables
 load_dotenv()
 
+# Chunks sent to Gemini per question, chosen by BM25 from all processed documents
+PDF_CONTEXT_CHUNKS = int(os.getenv('PDF_CONTEXT_CHUNKS', 8))
+
 # Page configuration
 st.set_page_config(
     page_title="StudyMate - AI Academic Assistant",
@@ -106,59 +119,89 @@ if 'pdf_texts' not in st.session_state:
     st.session_state.pdf_texts = []
 if 'chat_history' not in st.session_state:
     st.session_state.chat_history = []
+if 'extraction_stats' not in st.session_state:
+    st.session_state.extraction_stats = {}
+if 'pdf_chunks' not in st.session_state:
+    st.session_state.pdf_chunks = []
+if 'retrieval_index' not in st.session_state:
+    st.session_state.retrieval_index = None
+if 'retrieval_key' not in st.session_state:
+    st.session_state.retrieval_key = None
+if 'document_cache' not in st.session_state:
+    st.session_state.document_cache = {}  # content hash -> pages and chunks of a processed PDF
 
 def extract_text_from_pdf(pdf_file):
-    """Extract text from PDF using PyMuPDF with page-level extraction"""
+    """Extract text from a PDF path or upload with page-level extraction, reading pages lazily"""
     try:
-        doc = fitz.open(stream=pdf_file.read(), filetype="pdf")
-        pages_data = []
-        
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            text = page.get_text()
-            if text.strip():  # Only add non-empty pages
-                pages_data.append({
-                    'page': page_num + 1,
-                    'text': text.strip()
-                })
-        
-        doc.close()
-        return pages_data
+        with pdf_path(pdf_file) as path:
+            return build_pages_data(text for _, text in iter_pages(path))
     except Exception as e:
         st.error(f"Error extracting text from PDF: {str(e)}")
         return None
 
+def build_pages_data(page_texts):
+    """Turn raw page texts into page records, skipping empty pages"""
+    pages_data = []
+    for page_num, text in enumerate(page_texts, start=1):
+        if text.strip():  # Only add non-empty pages
+            pages_data.append({
+                'page': page_num,
+                'text': text.strip()
+            })
+    return pages_data
+
 def create_chunks_with_metadata(pages_data, chunk_size=1000, overlap=200):
-    """Create text chunks with metadata for citations"""
+    """Create text chunks with metadata for citations (sizes in characters)"""
+    doc_name = pages_data[0].get('filename', 'Unknown') if pages_data else 'Unknown'
+    pages = ((page_data['page'], page_data['text']) for page_data in pages_data)
+    
+    return [
+        {
+            'doc': doc_name,
+            'page': chunk['page_start'],
+            'page_end': chunk['page_end'],
+            'text': chunk['text'],
+            'start_pos': chunk['start_char']
+        }
+        for chunk in stream_character_chunks(pages, chunk_size, overlap)
+    ]
+
+def process_document(pages_data):
+    """Everything derived from one PDF's pages, computed once per distinct file content"""
+    full_text = "\n\n".join([f"Page {p['page']}: {p['text']}" for p in pages_data])
+    return {
+        'pages_data': pages_data,
+        'full_text': full_text,
+        'text': full_text[:1000] + "..." if len(full_text) > 1000 else full_text,
+        'chunks': create_chunks_with_metadata(pages_data)
+    }
+
+def build_retrieval_index(pdf_texts):
+    """Index the chunks of every processed document for retrieval"""
     chunks = []
+    for doc in pdf_texts:
+        doc_chunks = doc['chunks'] if 'chunks' in doc else create_chunks_with_metadata(doc['pages_data'])
+        # Cached chunks are shared by uploads with the same content, so label copies
+        chunks.extend(dict(chunk, doc=doc['filename']) for chunk in doc_chunks)
     
-    for page_data in pages_data:
-        page_num = page_data['page']
-        text = page_data['text']
-        doc_name = page_data.get('filename', 'Unknown')
-        
-        # Split text into chunks
-        start = 0
-        while start < len(text):
-            end = start + chunk_size
-            chunk_text = text[start:end]
-            
-            # Add overlap for better context
-            if start > 0:
-                chunk_text = text[start-overlap:end]
-            
-            chunks.append({
-                'doc': doc_name,
-                'page': page_num,
-                'text': chunk_text.strip(),
-                'start_pos': start
-            })
-            
-            start = end - overlap
-            if start >= len(text):
-                break
+    index = BM25Index()
+    index.add(range(len(chunks)), (chunk['text'] for chunk in chunks))
+    return chunks, index
+
+def retrieve_chunks(question, chunks, index, top_k=PDF_CONTEXT_CHUNKS):
+    """Most relevant chunks for a question, best first"""
+    hits = index.search(question, top_k)
+    if hits:
+        return [chunks[chunk_index] for chunk_index, _ in hits]
     
-    return chunks
+    # No term in common with the documents (e.g. "summarize this"): use each document's opening chunks
+    per_doc = -(-top_k // max(len({chunk['doc'] for chunk in chunks}), 1))
+    opening, taken = [], {}
+    for chunk in chunks:
+        if taken.get(chunk['doc'], 0) < per_doc and len(opening) < top_k:
+            taken[chunk['doc']] = taken.get(chunk['doc'], 0) + 1
+            opening.append(chunk)
+    return opening
 
 def parse_citations(response_text):
     """Parse citations from AI response text"""
@@ -187,23 +230,15 @@ def parse_citations(response_text):
     
     return citations
 
-def call_gemini_api(prompt, context_chunks, filename=""):
-    """Call Google Gemini API with citations enforcement"""
-    api_key = os.getenv('GOOGLE_API_KEY')
-    if not api_key:
-        st.error("Google API key not found. Please check your .env file.")
-        return None
-    
-    url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
-    
+def build_gemini_prompt(prompt, context_chunks, filename=""):
+    """Gemini prompt with the retrieved chunks and citation instructions"""
     if context_chunks:
         # Build context with citations format
         context_lines = []
         for chunk in context_chunks:
             doc_name = chunk['doc'] or filename
             page_num = chunk['page']
-            snippet = chunk['text'][:500]  # Trim to 500 chars
-            context_lines.append(f"[{doc_name} p.{page_num}] {snippet}")
+            context_lines.append(f"[{doc_name} p.{page_num}] {chunk['text']}")
         
         context_text = "\n\n".join(context_lines)
         
@@ -240,6 +275,17 @@ Please provide a simple, clean response in plain text format:
 - Just plain text like ChatGPT
 - Easy to read line by line
 - Natural conversation style"""
+    return full_prompt
+
+def stream_gemini_api(prompt, context_chunks, filename=""):
+    """Stream a Google Gemini answer with citations enforcement, yielding text as it is generated"""
+    api_key = os.getenv('GOOGLE_API_KEY')
+    if not api_key:
+        st.error("Google API key not found. Please check your .env file.")
+        return
+    
+    url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:streamGenerateContent"
+    full_prompt = build_gemini_prompt(prompt, context_chunks, filename)
 
     headers = {
         "Content-Type": "application/json"
@@ -253,34 +299,110 @@ Please provide a simple, clean response in plain text format:
         }]
     }
     
+    # The prompt holds the retrieved chunks, so changed documents never reuse an old answer
+    cache_key = AnswerCache.make_key("gemini", "gemini-2.0-flash", {}, full_prompt)
+    # Identical questions over the same chunks that are already in flight share that Gemini call
+    flight_key = AnswerCache.make_key(
+        "gemini", "gemini-2.0-flash", {}, normalize_question(prompt), json.dumps(context_chunks, sort_keys=True)
+    )
+    return (yield from get_coalescer().stream(
+        flight_key, lambda: cached_stream(cache_key, request_gemini_stream(url, api_key, headers, data))
+    ))
+
+def request_gemini_stream(url, api_key, headers, data):
+    """Send a Gemini streaming request, yielding text as it is generated; returns True if it completed"""
     try:
-        response = requests.post(
-            f"{url}?key={api_key}",
+        # alt=sse sends each part of the answer as a server-sent event as soon as it is generated
+        with get_transport().post(
+            f"{url}?alt=sse&key={api_key}",
             headers=headers,
             json=data,
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            result = response.json()
-            if 'candidates' in result and len(result['candidates']) > 0:
-                return result['candidates'][0]['content']['parts'][0]['text']
-            else:
-                return "Sorry, I couldn't generate a response. Please try again."
-        else:
-            st.error(f"API Error: {response.status_code} - {response.text}")
-            return None
+            stream=True
+        ) as response:
+            if response.status_code != 200:
+                st.error(f"API Error: {response.status_code} - {response.text}")
+                return
+            
+            for event in iter_sse_data(response):
+                result = json.loads(event)
+                for candidate in result.get('candidates', [])[:1]:
+                    for part in candidate.get('content', {}).get('parts', []):
+                        if part.get('text'):
+                            yield part['text']
+            return True
             
     except Exception as e:
         st.error(f"Error calling Gemini API: {str(e)}")
-        return None
 
-def call_openrouter_api(prompt):
-    """Call OpenRouter API for global knowledge using DeepSeek model"""
+def call_gemini_api(prompt, context_chunks, filename=""):
+    """Call Google Gemini API with citations enforcement"""
+    return "".join(stream_gemini_api(prompt, context_chunks, filename)) or None
+
+def stream_openrouter(url, headers, data, label, error_hint):
+    """
+    Stream an OpenRouter chat completion, yielding content as it is generated
+    
+    Answers are cached by model, parameters and messages, so a repeated
+    question is served from the answer cache instead of OpenRouter, and
+    identical questions already in flight share one OpenRouter call.
+    
+    Args:
+        url: Chat completions endpoint
+        headers: Request headers including the API key
+        data: Request body (stream is turned on here)
+        label: Name used in error messages
+        error_hint: Explanation shown when OpenRouter rejects the request
+    """
+    cache_key = AnswerCache.make_key(
+        "openrouter", data["model"],
+        {"max_tokens": data["max_tokens"], "temperature": data["temperature"]},
+        json.dumps(data["messages"], sort_keys=True)
+    )
+    flight_key = AnswerCache.make_key(
+        "openrouter", data["model"],
+        {"max_tokens": data["max_tokens"], "temperature": data["temperature"]},
+        json.dumps([
+            normalize_question(message["content"]) if message["role"] == "user" else message["content"]
+            for message in data["messages"]
+        ])
+    )
+    return (yield from get_coalescer().stream(
+        flight_key, lambda: cached_stream(cache_key, request_openrouter_stream(url, headers, data, label, error_hint))
+    ))
+
+def request_openrouter_stream(url, headers, data, label, error_hint):
+    """Send an OpenRouter streaming request, yielding content as it is generated; returns True if it completed"""
+    try:
+        with get_transport().post(url, headers=headers, json=dict(data, stream=True), stream=True) as response:
+            if response.status_code != 200:
+                try:
+                    err_json = response.json()
+                except Exception:
+                    err_json = response.text
+                st.error(f"{error_hint}\nStatus {response.status_code}: {err_json}")
+                return
+            
+            for event in iter_sse_data(response):
+                result = json.loads(event)
+                if 'error' in result:
+                    # Errors after the stream started arrive as an event
+                    st.error(f"❌ {label} API error: {result['error']}")
+                    return
+                for choice in result.get('choices', [])[:1]:
+                    content = choice.get('delta', {}).get('content')
+                    if content:
+                        yield content
+            return True
+
+    except Exception as e:
+        st.error(f"❌ Error calling {label} API: {str(e)}")
+
+def stream_openrouter_api(prompt):
+    """Stream an OpenRouter answer for global knowledge using DeepSeek model"""
     api_key = os.getenv('OPENROUTER_API_KEY')
     if not api_key:
         st.error("❌ OpenRouter API key not found. Please check your .env file.")
-        return None
+        return
     
     url = "https://openrouter.ai/api/v1/chat/completions"
     
@@ -307,39 +429,23 @@ def call_openrouter_api(prompt):
         "temperature": 0.7
     }
     
-    try:
-        response = requests.post(url, headers=headers, json=data, timeout=30)
-
-        if response.status_code == 200:
-            result = response.json()
-            if 'choices' in result and len(result['choices']) > 0:
-                return result['choices'][0]['message']['content']
-            else:
-                st.error(f"❌ OpenRouter API returned empty response: {result}")
-                return None
-        else:
-            # Surface common OpenRouter privacy/model errors clearly
-            try:
-                err_json = response.json()
-            except Exception:
-                err_json = response.text
-            st.error(
-                "❌ OpenRouter API error. If you see 'No endpoints found matching your data policy', either switch to a non-free model or enable Prompt Training at https://openrouter.ai/settings/privacy.\n"
-                f"Status {response.status_code}: {err_json}"
-            )
-            return None
+    # Surface common OpenRouter privacy/model errors clearly
+    return (yield from stream_openrouter(
+        url, headers, data, "OpenRouter",
+        "❌ OpenRouter API error. If you see 'No endpoints found matching your data policy', either switch to a non-free model or enable Prompt Training at https://openrouter.ai/settings/privacy."
+    ))
 
-    except Exception as e:
-        st.error(f"❌ Error calling OpenRouter API: {str(e)}")
-        return None
+def call_openrouter_api(prompt):
+    """Call OpenRouter API for global knowledge using DeepSeek model"""
+    return "".join(stream_openrouter_api(prompt)) or None
 
-def call_gpt_oss_api(prompt):
-    """Call OpenRouter API for GPT-OSS-120B model (high-reasoning capabilities)"""
+def stream_gpt_oss_api(prompt):
+    """Stream an OpenRouter answer from the GPT-OSS-120B model (high-reasoning capabilities)"""
     api_key = os.getenv('OPENROUTER_API_KEY')
     
     if not api_key:
         st.error("❌ OpenRouter API key not found. Please check your .env file.")
-        return None
+        return
     
     url = "https://openrouter.ai/api/v1/chat/completions"
     
@@ -366,30 +472,53 @@ def call_gpt_oss_api(prompt):
         "temperature": 0.7
     }
     
-    try:
-        response = requests.post(url, headers=headers, json=data, timeout=30)
-
-        if response.status_code == 200:
-            result = response.json()
-            if result.get('choices') and len(result['choices']) > 0:
-                return result['choices'][0]['message']['content']
-            else:
-                st.error(f"❌ OpenRouter (Qwen) API returned empty response: {result}")
-                return None
-        else:
-            try:
-                err_json = response.json()
-            except Exception:
-                err_json = response.text
-            st.error(
-                "❌ Model unavailable under current data policy. Consider enabling Prompt Training at https://openrouter.ai/settings/privacy or switch to another model (e.g., meta-llama/llama-3.1-70b-instruct).\n"
-                f"Status {response.status_code}: {err_json}"
-            )
-            return None
+    return (yield from stream_openrouter(
+        url, headers, data, "OpenRouter (Qwen)",
+        "❌ Model unavailable under current data policy. Consider enabling Prompt Training at https://openrouter.ai/settings/privacy or switch to another model (e.g., meta-llama/llama-3.1-70b-instruct)."
+    ))
 
-    except Exception as e:
-        st.error(f"❌ Error calling OpenRouter API: {str(e)}")
-        return None
+def call_gpt_oss_api(prompt):
+    """Call OpenRouter API for GPT-OSS-120B model (high-reasoning capabilities)"""
+    return "".join(stream_gpt_oss_api(prompt)) or None
+
+def run_providers(calls):
+    """
+    Stream several AI providers concurrently, yielding their text as it arrives
+    
+    Args:
+        calls: (name, stream function, args) for each selected provider
+    
+    Yields:
+        (name, piece, stream) as pieces arrive from any provider; piece is None once
+        that provider is done, and stream holds its text and timings so far (and its
+        result, True if the answer completed, once it is done)
+    """
+    # Worker threads share this run's script context so the providers' st.error messages still render
+    ctx = get_script_run_ctx()
+    events = queue.Queue()
+    
+    def consume(name, function, args):
+        stream = TimedStream(function(*args))
+        try:
+            for piece in stream:
+                events.put((name, piece, stream))
+        except Exception as e:
+            st.error(f"❌ {name} failed: {str(e)}")
+        finally:
+            events.put((name, None, stream))
+    
+    with ThreadPoolExecutor(
+        max_workers=max(len(calls), 1),
+        initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx)
+    ) as pool:
+        for name, function, args in calls:
+            pool.submit(consume, name, function, args)
+        remaining = len(calls)
+        while remaining:
+            event = events.get()
+            yield event
+            if event[1] is None:
+                remaining -= 1
 
 def main():
     # Header
@@ -420,22 +549,57 @@ def main():
             if st.button("🔍 Process Documents", type="primary"):
                 with st.spinner("Processing PDFs..."):
                     st.session_state.pdf_texts = []
-                    for pdf_file in uploaded_files:
-                        pages_data = extract_text_from_pdf(pdf_file)
+                    document_cache = st.session_state.document_cache
+                    hashes = {pdf_file.name: content_hash(pdf_file) for pdf_file in uploaded_files}
+                    new_files = [pdf_file for pdf_file in uploaded_files if hashes[pdf_file.name] not in document_cache]
+                    
+                    st.session_state.extraction_stats = {}
+                    try:
+                        # Extract only PDFs not processed before, in parallel worker processes
+                        pages_by_file, st.session_state.extraction_stats = extract_documents(
+                            [(pdf_file.name, pdf_file) for pdf_file in new_files]
+                        )
+                    except Exception as e:
+                        st.error(f"Error extracting text from PDF: {str(e)}")
+                        pages_by_file = {}
+                    
+                    for pdf_file in new_files:
+                        pages_data = build_pages_data(pages_by_file.get(pdf_file.name, []))
                         if pages_data:
-                            # Combine all pages for display
-                            full_text = "\n\n".join([f"Page {p['page']}: {p['text']}" for p in pages_data])
-                            display_text = full_text[:1000] + "..." if len(full_text) > 1000 else full_text
-                            
-                            st.session_state.pdf_texts.append({
-                                'filename': pdf_file.name,
-                                'pages_data': pages_data,
-                                'text': display_text,
-                                'full_text': full_text
-                            })
+                            document_cache[hashes[pdf_file.name]] = process_document(pages_data)
+                    
+                    for pdf_file in uploaded_files:
+                        cached = document_cache.get(hashes[pdf_file.name])
+                        if cached:
+                            st.session_state.pdf_texts.append(
+                                dict(cached, filename=pdf_file.name, content_hash=hashes[pdf_file.name])
+                            )
+                    
+                    # Keep only documents in the current upload so the cache stays bounded
+                    current = set(hashes.values())
+                    for key in [key for key in document_cache if key not in current]:
+                        del document_cache[key]
+                    
+                    # Index once here, not on every question; unchanged documents reuse the index
+                    retrieval_key = tuple((doc['content_hash'], doc['filename']) for doc in st.session_state.pdf_texts)
+                    if retrieval_key != st.session_state.retrieval_key or st.session_state.retrieval_index is None:
+                        st.session_state.pdf_chunks, st.session_state.retrieval_index = build_retrieval_index(
+                            st.session_state.pdf_texts
+                        )
+                        st.session_state.retrieval_key = retrieval_key
                     
                     if st.session_state.pdf_texts:
                         st.success(f"✅ {len(st.session_state.pdf_texts)} document(s) processed!")
+                        stats = st.session_state.extraction_stats
+                        reused = len(uploaded_files) - len(new_files)
+                        if stats:
+                            st.caption(
+                                f"⚡ {stats['pages']} pages in {stats['seconds']}s "
+                                f"({stats['pages_per_second']} pages/sec, {stats['workers']} workers), "
+                                f"{len(st.session_state.pdf_chunks)} chunks indexed"
+                            )
+                        if reused:
+                            st.caption(f"♻️ {reused} unchanged document(s) reused without re-extracting")
                     else:
                         st.error("❌ Failed to process PDFs")
         
@@ -446,10 +610,34 @@ def main():
                 st.info(f"📄 {doc['filename']}")
                 st.caption(f"Text length: {len(doc['full_text'])} characters")
         
+        # Answers and keep-alive connections to the AI providers, shared by all sessions
+        answer_cache_stats = get_answer_cache().stats()
+        if answer_cache_stats['exact_hits'] + answer_cache_stats['misses']:
+            st.caption(
+                f"⚡ Answer cache: {answer_cache_stats['hit_rate']:.0%} hit rate, "
+                f"{answer_cache_stats['answers']} answers cached"
+            )
+        coalescing_stats = get_coalescer().stats()
+        if coalescing_stats['coalesced_requests']:
+            st.caption(
+                f"🤝 {coalescing_stats['coalesced_requests']} identical questions joined an answer "
+                f"already in progress ({coalescing_stats['upstream_calls']} model calls)"
+            )
+        for host, host_stats in get_transport().stats()['hosts'].items():
+            if host_stats['avg_ms'] is not None:
+                st.caption(
+                    f"🔌 {host}: {host_stats['requests']} requests, "
+                    f"{host_stats['reuse_rate']:.0%} on reused connections, {host_stats['avg_ms']:.0f} ms avg"
+                )
+        
         # Clear data
         if st.button("🗑️ Clear All Data"):
             st.session_state.pdf_texts = []
             st.session_state.chat_history = []
+            st.session_state.pdf_chunks = []
+            st.session_state.retrieval_index = None
+            st.session_state.retrieval_key = None
+            st.session_state.document_cache = {}
             st.experimental_rerun()
         
         # Sources Overview
@@ -524,53 +712,71 @@ def main():
         
         if question and st.button("🚀 Get Answer", type="primary"):
             with st.spinner("🤔 Thinking..."):
-                # Initialize response variables
-                pdf_response = None
-                global_response = None
-                citations = []
-                
-                # Initialize response variables
-                pdf_response = None
-                deepseek_response = None
-                gpt_oss_response = None
                 citations = []
+                calls = []
                 
-                # 1. Get PDF-specific answer from Gemini (if requested)
+                # 1. PDF-specific answer from Gemini (if requested)
                 if pdf_only or gemini_deepseek or gemini_gptoss or all_three:
                     if st.session_state.pdf_texts:
-                        # Create chunks with metadata for citations
-                        all_chunks = []
-                        for doc in st.session_state.pdf_texts:
-                            if 'pages_data' in doc:
-                                chunks = create_chunks_with_metadata(doc['pages_data'])
-                                for chunk in chunks:
-                                    chunk['doc'] = doc['filename']
-                                all_chunks.extend(chunks)
+                        if st.session_state.retrieval_index is None:
+                            st.session_state.pdf_chunks, st.session_state.retrieval_index = build_retrieval_index(
+                                st.session_state.pdf_texts
+                            )
                         
-                        # Get PDF-specific response with citations
-                        pdf_response = call_gemini_api(question, all_chunks)
-                        if pdf_response:
-                            citations = parse_citations(pdf_response)
+                        # Send only the chunks most relevant to the question, with their pages for citations
+                        context_chunks = retrieve_chunks(
+                            question, st.session_state.pdf_chunks, st.session_state.retrieval_index
+                        )
+                        calls.append(("Gemini", stream_gemini_api, (question, context_chunks)))
                     else:
                         st.warning("⚠️ No PDFs uploaded. Please upload documents first for PDF-specific answers.")
                         if pdf_only:
                             return
                 
-                # 2. Get global knowledge answer from DeepSeek (if requested)
+                # 2. Global knowledge answer from DeepSeek (if requested)
                 if deepseek_only or gemini_deepseek or all_three:
-                    deepseek_response = call_openrouter_api(question)
-                    if deepseek_response:
-                        st.success("✅ DeepSeek AI response received!")
-                    else:
-                        st.error("❌ DeepSeek AI response failed!")
+                    calls.append(("DeepSeek", stream_openrouter_api, (question,)))
                 
-                # 3. Get high-reasoning answer from GPT-OSS-120B (if requested)
+                # 3. High-reasoning answer from GPT-OSS-120B (if requested)
                 if gpt_oss_only or gemini_gptoss or all_three:
-                    gpt_oss_response = call_gpt_oss_api(question)
-                    if gpt_oss_response:
-                        st.success("✅ GPT-OSS-120B response received!")
+                    calls.append(("GPT-OSS-120B", stream_gpt_oss_api, (question,)))
+                
+                # Run the selected models concurrently and render each answer as it streams in,
+                # so the first words show up in about a second and combined modes take as long
+                # as the slowest model instead of the sum
+                start_time = time.perf_counter()
+                placeholders = {name: st.empty() for name, _, _ in calls}
+                responses, timings = {}, {}
+                for name, piece, stream in run_providers(calls):
+                    if piece is not None:
+                        with placeholders[name].container():
+                            st.info(f"✍️ {name} is answering (first token after {stream.first_token_seconds:.1f}s)")
+                            st.markdown(stream.text + "▌")
+                        continue
+                    
+                    # An answer that did not complete (its call failed, or the identical question
+                    # it joined was interrupted) is not shown as if it were whole
+                    responses[name] = (stream.text or None) if stream.result else None
+                    cached = bool(stream.parts) and isinstance(stream.parts[0], CachedAnswer)
+                    timings[name] = dict(stream.timings(), cached=cached)
+                    if responses[name] and cached:
+                        with placeholders[name].container():
+                            st.success(f"⚡ {name} answer from cache (this question was already answered)")
+                            st.markdown(responses[name])
+                    elif responses[name]:
+                        with placeholders[name].container():
+                            st.success(f"✅ {name} response received in {stream.total_seconds:.1f}s "
+                                       f"(first token after {stream.first_token_seconds:.1f}s)")
+                            st.markdown(responses[name])
                     else:
-                        st.error("❌ GPT-OSS-120B response failed!")
+                        placeholders[name].error(f"❌ {name} response failed after {stream.total_seconds:.1f}s")
+                total_seconds = time.perf_counter() - start_time
+                
+                pdf_response = responses.get("Gemini")
+                deepseek_response = responses.get("DeepSeek")
+                gpt_oss_response = responses.get("GPT-OSS-120B")
+                if pdf_response:
+                    citations = parse_citations(pdf_response)
                 
                 # 4. Combine responses and add to chat history
                 if pdf_response or deepseek_response or gpt_oss_response:
@@ -596,6 +802,8 @@ def main():
                         'answer': combined_response,
                         'citations': citations,
                         'response_type': response_type,
+                        'timings': timings,
+                        'total_seconds': round(total_seconds, 2),
                         'timestamp': datetime.now().strftime("%H:%M")
                     })
                     
@@ -647,6 +855,18 @@ def main():
                         elif "GPT-OSS" in response_types:
                             st.info("🤖 **GPT-OSS Response:** High-reasoning capabilities")
                     
+                    # Per-model time to first token and latency; models run concurrently,
+                    # so the total is about the slowest one
+                    if chat.get('timings'):
+                        model_times = ", ".join(
+                            f"{name} from cache" if timing.get('cached')
+                            else f"{name} first token {timing['first_token_seconds']:.1f}s / {timing['total_seconds']:.1f}s"
+                            if timing['first_token_seconds'] is not None
+                            else f"{name} {timing['total_seconds']:.1f}s"
+                            for name, timing in chat['timings'].items()
+                        )
+                        st.caption(f"⏱️ {model_times} (total {chat['total_seconds']:.1f}s)")
+                    
                     # Display sources if citations exist
                     if 'citations' in chat and chat['citations']:
                         st.markdown("---")
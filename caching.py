@@ -0,0 +1,92 @@
+"""
+Caching helpers for StudyMate
+Hackathon Project - TripleMind Team
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache with optional time-to-live"""
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None):
+        """
+        Initialize the cache
+
+        Args:
+            max_size (int): Maximum number of entries kept before evicting the oldest
+            ttl (Optional[float]): Seconds an entry stays valid, or None for no expiry
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Look up a key, marking it as recently used
+
+        Args:
+            key (Hashable): Cache key
+            default (Any): Value returned on a miss
+
+        Returns:
+            Any: Cached value or default
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                if self.ttl is None or time.monotonic() - stored_at < self.ttl:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any):
+        """
+        Store a value, evicting the least recently used entries if full
+
+        Args:
+            key (Hashable): Cache key
+            value (Any): Value to store
+        """
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries (hit/miss counters are kept)"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache size and hit statistics
+
+        Returns:
+            Dict[str, Any]: Size, capacity, hits, misses and hit rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'max_size': self.max_size,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,297 @@
+"""
+Text chunking for StudyMate
+One streaming chunker over page streams, shared by both apps
+Hackathon Project - TripleMind Team
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from itertools import accumulate, islice, repeat
+from operator import add
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+SENTENCE_ENDINGS = ('.', '!', '?')
+
+# Words searched back from a chunk's end for a sentence boundary
+SENTENCE_WINDOW = 50
+
+# Characters searched back from a chunk's end for a sentence boundary (chunk_characters)
+SENTENCE_WINDOW_CHARACTERS = 100
+
+WHITESPACE = (' ', '\n', '\t', '\r')
+SPACE_PATTERN = re.compile(r'\s')
+SENTENCE_END_PATTERN = re.compile(r'[.!?](?=\s|$)')
+
+# Dropped words kept in the buffer before it is compacted
+COMPACT_THRESHOLD = 4096
+
+
+def count_words(words: List[str]) -> List[int]:
+    """
+    Size of each word when chunks are measured in words
+
+    Args:
+        words (List[str]): Words of a page
+
+    Returns:
+        List[int]: 1 for every word
+    """
+    return [1] * len(words)
+
+
+def count_characters(words: List[str]) -> List[int]:
+    """
+    Size of each word when chunks are measured in characters
+
+    Args:
+        words (List[str]): Words of a page
+
+    Returns:
+        List[int]: Length of each word plus the space joining it to the next
+    """
+    return list(map(add, map(len, words), repeat(1)))
+
+
+def _split_oversized(words: List[str], sizes: List[int], chunk_size: int,
+                     weigh: Callable[[List[str]], List[int]]) -> Tuple[List[str], List[int]]:
+    """Hard-split words bigger than a whole chunk (unspaced CJK text, long URLs, base64)"""
+    split_words: List[str] = []
+    split_sizes: List[int] = []
+    for word, size in zip(words, sizes):
+        if size <= chunk_size:
+            split_words.append(word)
+            split_sizes.append(size)
+            continue
+        # Cut by characters in proportion to the word's size, then re-weigh the pieces
+        step = max(1, len(word) * chunk_size // size)
+        pieces = [word[i:i + step] for i in range(0, len(word), step)]
+        piece_sizes = weigh(pieces)
+        if step > 1 and max(piece_sizes) > chunk_size:
+            pieces, piece_sizes = _split_oversized(pieces, piece_sizes, chunk_size, weigh)
+        split_words.extend(pieces)
+        split_sizes.extend(piece_sizes)
+    return split_words, split_sizes
+
+
+def stream_chunks(pages: Iterable[Tuple[int, str]], chunk_size: int, overlap: int,
+                  filename: str = '', weigh: Callable[[List[str]], List[int]] = count_words,
+                  size_field: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Chunk a stream of (page number, text) pages, yielding chunks as soon as they are complete
+
+    Pages are split into words and buffered only until a full chunk is
+    available, so the document is never held or re-split as a whole. A
+    chunk ends at a sentence boundary when one is within the last
+    SENTENCE_WINDOW words. The next chunk starts so that it repeats at most
+    `overlap` units of the previous one, and always advances by at least
+    one word. A word bigger than a whole chunk is split into pieces that
+    fit. Chunks may span pages and record the pages they cover.
+
+    Args:
+        pages (Iterable[Tuple[int, str]]): 1-based page numbers and page texts, in order
+        chunk_size (int): Maximum chunk size in the units given by weigh
+        overlap (int): Maximum size repeated from the previous chunk
+        filename (str): Document name stored on every chunk
+        weigh (Callable[[List[str]], List[int]]): Size of each word of a page (count_words,
+            count_characters, or e.g. token counts from a tokenizer)
+        size_field (Optional[str]): Key under which each chunk's size is stored, if any
+
+    Yields:
+        Dict: text, filename, chunk_id, page_start, page_end, word_count, start_word, end_word
+    """
+    words: List[str] = []
+    word_pages: List[int] = []
+    prefix: List[int] = [0]  # prefix[i] = size of the buffered words before words[i]
+    start = 0          # first buffered word of the next chunk
+    emitted_end = 0    # buffered words up to here were already included in a chunk
+    buffer_offset = 0  # document word offset of words[0]
+    chunk_id = 0
+
+    def make_chunk(end: int) -> Dict:
+        chunk = {
+            'text': ' '.join(words[start:end]),
+            'filename': filename,
+            'chunk_id': chunk_id,
+            'page_start': word_pages[start],
+            'page_end': word_pages[end - 1],
+            'word_count': end - start,
+            'start_word': buffer_offset + start,
+            'end_word': buffer_offset + end
+        }
+        if size_field:
+            chunk[size_field] = prefix[end] - prefix[start]
+        return chunk
+
+    for page_num, page_text in pages:
+        page_words = page_text.split()
+        if not page_words:
+            continue
+        sizes = weigh(page_words)
+        if max(sizes) > chunk_size:
+            page_words, sizes = _split_oversized(page_words, sizes, chunk_size, weigh)
+        words.extend(page_words)
+        word_pages.extend([page_num] * len(page_words))
+        prefix.extend(islice(accumulate(sizes, initial=prefix[-1]), 1, None))
+
+        # Emit while a full chunk plus some lookahead is buffered
+        while prefix[-1] - prefix[start] > chunk_size:
+            end = max(bisect_right(prefix, prefix[start] + chunk_size) - 1, start + 1)
+            # A sentence end inside the previous chunk would only shrink this one into its overlap
+            for i in range(end - 1, max(start, end - 1 - SENTENCE_WINDOW, emitted_end - 1), -1):
+                if words[i].endswith(SENTENCE_ENDINGS):
+                    end = i + 1
+                    break
+
+            yield make_chunk(end)
+            chunk_id += 1
+            emitted_end = end
+            start = max(bisect_left(prefix, prefix[end] - overlap), start + 1)
+
+        # Drop words that no future chunk can include, in amortized constant time
+        if start > COMPACT_THRESHOLD and start * 2 > len(words):
+            del words[:start]
+            del word_pages[:start]
+            del prefix[:start]
+            buffer_offset += start
+            emitted_end -= start
+            start = 0
+
+    # Final chunk, unless everything left was already emitted as overlap
+    if len(words) > emitted_end:
+        yield make_chunk(len(words))
+
+
+def _sentence_end(text: str, low: int, high: int) -> int:
+    """Position just after the last sentence ending in text[low:high] that ends a word, or -1"""
+    best = -1
+    # One character past high is searched so the lookahead can see what follows an ending at high - 1
+    for match in SENTENCE_END_PATTERN.finditer(text, low, high + 1):
+        if match.start() < high:
+            best = match.end()
+    return best
+
+
+def _character_cut(text: str, start: int, chunk_size: int, overlap: int, previous_cut: int = 0) -> Tuple[int, int]:
+    """
+    End of the chunk starting at start (text must extend past start + chunk_size), and the next start
+
+    The end is always past previous_cut, so chunks never shrink into the previous chunk's overlap.
+    """
+    end = start + chunk_size
+    cut = _sentence_end(text, max(start, end - SENTENCE_WINDOW_CHARACTERS, previous_cut), end)
+    if cut <= start:
+        cut = max(text.rfind(space, max(start, previous_cut) + 1, end + 1) for space in WHITESPACE)
+        if cut <= start or text[max(start, previous_cut):cut].isspace():
+            # A token longer than the chunk is split exactly at chunk_size
+            cut = end
+
+    next_start = max(cut - overlap, start + 1)
+    if next_start < cut and not text[next_start - 1].isspace():
+        # Start the overlap at the next word; unspaced text overlaps mid-token
+        space = SPACE_PATTERN.search(text, next_start, cut)
+        if space:
+            next_start = space.end()
+    return cut, next_start
+
+
+def chunk_characters(text: str, chunk_size: int, overlap: int) -> Iterator[str]:
+    """
+    Chunk one string by characters, for callers that need no page metadata
+
+    Works on string slices instead of a word list, so it runs at close to
+    memory speed. Chunks end at a sentence boundary within the last
+    SENTENCE_WINDOW_CHARACTERS characters, else at the last whitespace,
+    else (a token longer than the chunk) exactly at chunk_size. The next
+    chunk repeats at most `overlap` characters, starting at a word.
+
+    Args:
+        text (str): Text to chunk
+        chunk_size (int): Maximum chunk length in characters
+        overlap (int): Maximum characters repeated from the previous chunk
+
+    Yields:
+        str: Chunks, stripped of surrounding whitespace
+    """
+    start = cut = 0
+    while start + chunk_size < len(text):
+        cut, next_start = _character_cut(text, start, chunk_size, overlap, cut)
+        chunk = text[start:cut].strip()
+        if chunk:
+            yield chunk
+        start = next_start
+    chunk = text[start:].strip()
+    if chunk:
+        yield chunk
+
+
+def stream_character_chunks(pages: Iterable[Tuple[int, str]], chunk_size: int, overlap: int,
+                            filename: str = '') -> Iterator[Dict]:
+    """
+    Chunk a stream of (page number, text) pages by characters, yielding chunks as soon as they are complete
+
+    The character-sized counterpart of stream_chunks, with chunk_characters'
+    boundaries: pages are joined into a string buffer that holds only the
+    text not yet chunked, so no word list is built. Chunks may span pages
+    and record the pages they cover.
+
+    Args:
+        pages (Iterable[Tuple[int, str]]): 1-based page numbers and page texts, in order
+        chunk_size (int): Maximum chunk length in characters
+        overlap (int): Maximum characters repeated from the previous chunk
+        filename (str): Document name stored on every chunk
+
+    Yields:
+        Dict: text, filename, chunk_id, page_start, page_end, start_char, end_char
+    """
+    text = ''
+    page_offsets: List[int] = []  # where each buffered page starts in text
+    page_numbers: List[int] = []
+    start = 0          # start of the next chunk in text
+    emitted_end = 0    # text up to here was already included in a chunk
+    buffer_offset = 0  # document character offset of text[0]
+    chunk_id = 0
+
+    def make_chunk(end: int) -> Dict:
+        return {
+            'text': text[start:end].strip(),
+            'filename': filename,
+            'chunk_id': chunk_id,
+            'page_start': page_numbers[bisect_right(page_offsets, start) - 1],
+            'page_end': page_numbers[bisect_right(page_offsets, end - 1) - 1],
+            'start_char': buffer_offset + start,
+            'end_char': buffer_offset + end
+        }
+
+    for page_num, page_text in pages:
+        if not page_text or page_text.isspace():
+            continue
+        if text:
+            text += ' '
+        page_offsets.append(len(text))
+        page_numbers.append(page_num)
+        text += page_text
+
+        while start + chunk_size < len(text):
+            cut, next_start = _character_cut(text, start, chunk_size, overlap, emitted_end)
+            chunk = make_chunk(cut)
+            if chunk['text']:
+                yield chunk
+                chunk_id += 1
+            emitted_end = cut
+            start = next_start
+
+        # Keep only the text future chunks can include
+        if start:
+            first_page = bisect_right(page_offsets, start) - 1
+            page_offsets = [max(offset - start, 0) for offset in page_offsets[first_page:]]
+            page_numbers = page_numbers[first_page:]
+            text = text[start:]
+            buffer_offset += start
+            emitted_end -= start
+            start = 0
+
+    # Final chunk, unless everything left was already emitted as overlap
+    if len(text) > emitted_end:
+        chunk = make_chunk(len(text))
+        if chunk['text']:
+            yield chunk
@@ -0,0 +1,176 @@
+"""
+Request coalescing for StudyMate
+Single-flight sharing of identical in-flight LLM answers across sessions
+Hackathon Project - TripleMind Team
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional
+
+
+class LeaderInterrupted(RuntimeError):
+    """Raised to followers when the request running their shared call stopped before it finished"""
+
+
+def normalize_question(question: str) -> str:
+    """Normalize a question so trivially different phrasings coalesce"""
+    return ' '.join(question.lower().split())
+
+
+class InFlight:
+    """Pieces of one upstream answer so far, readable by every request waiting on it"""
+
+    def __init__(self):
+        self.parts: List[str] = []
+        self.done = False
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+        self._condition = threading.Condition()
+
+    def publish(self, piece: str):
+        with self._condition:
+            self.parts.append(piece)
+            self._condition.notify_all()
+
+    def finish(self, result: Any = None, error: Optional[BaseException] = None):
+        with self._condition:
+            self.done = True
+            self.result = result
+            self.error = error
+            self._condition.notify_all()
+
+    def follow(self) -> Iterator[str]:
+        """Replay the pieces so far, then each new one as it arrives; returns the leader's result"""
+        index = 0
+        while True:
+            with self._condition:
+                while index >= len(self.parts) and not self.done:
+                    self._condition.wait()
+                if index >= len(self.parts):
+                    if self.error is not None:
+                        raise self.error
+                    return self.result
+                piece = self.parts[index]
+            index += 1
+            yield piece
+
+
+class CoalescedStream:
+    """
+    One request's view of a coalesced answer stream
+
+    The request joins when iteration starts: the first one for its key
+    becomes the leader and runs the upstream call, later ones follow it.
+    `shared` tells which one this was (None before iteration starts), and
+    `result` holds the upstream generator's return value once it ended
+    (None if the leader failed). If the leader stops consuming before the
+    upstream call ends (its page was rerun or stopped, or its consumer
+    raised), the call is abandoned and followers get LeaderInterrupted
+    instead of a truncated answer that looks complete.
+    """
+
+    def __init__(self, coalescer: "RequestCoalescer", key: Hashable, start: Callable[[], Iterator[str]]):
+        self._coalescer = coalescer
+        self._key = key
+        self._start = start
+        self.shared: Optional[bool] = None
+        self.result: Any = None
+
+    def __iter__(self) -> Iterator[str]:
+        flight, leader = self._coalescer._join(self._key)
+        self.shared = not leader
+        if not leader:
+            self.result = yield from flight.follow()
+            return self.result
+
+        pieces, error, completed = None, None, False
+        try:
+            pieces = self._start()
+            while True:
+                try:
+                    piece = next(pieces)
+                except StopIteration as stop:
+                    self.result = stop.value
+                    completed = True
+                    return self.result
+                flight.publish(piece)
+                yield piece
+        except Exception as e:
+            # Followers get the same failure
+            error = e
+            raise
+        finally:
+            if pieces is not None:
+                pieces.close()
+            if not completed and error is None:
+                error = LeaderInterrupted("The identical question this one joined was interrupted")
+            self._coalescer._leave(self._key, flight)
+            flight.finish(self.result, error)
+
+
+class RequestCoalescer:
+    """
+    Single-flight coalescing of identical concurrent requests
+
+    When a class is told to ask the same question, dozens of identical
+    requests arrive within seconds. The first starts the upstream call;
+    every identical request that arrives while it is in flight follows it,
+    receiving the same pieces as they stream in instead of making its own
+    call. Once the call ends, the next identical request starts a new one
+    (by then the answer cache usually serves it).
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, InFlight] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.followers = 0
+
+    def stream(self, key: Hashable, start: Callable[[], Iterator[str]]) -> CoalescedStream:
+        """
+        Stream an answer, sharing the upstream call with identical requests in flight
+
+        Args:
+            key (Hashable): Identity of the request (normalized question, document set, model)
+            start (Callable[[], Iterator[str]]): Starts the upstream call; only called by the leader
+
+        Returns:
+            CoalescedStream: Pieces of the answer; its generator returns the upstream result
+        """
+        return CoalescedStream(self, key, start)
+
+    def _join(self, key: Hashable):
+        with self._lock:
+            flight = self._in_flight.get(key)
+            if flight is None:
+                flight = self._in_flight[key] = InFlight()
+                self.leaders += 1
+                return flight, True
+            flight.followers += 1
+            self.followers += 1
+            return flight, False
+
+    def _leave(self, key: Hashable, flight: InFlight):
+        with self._lock:
+            if self._in_flight.get(key) is flight:
+                del self._in_flight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the number of upstream calls, coalesced requests and calls in flight"""
+        with self._lock:
+            requests_seen = self.leaders + self.followers
+            return {
+                'upstream_calls': self.leaders,
+                'coalesced_requests': self.followers,
+                'in_flight': len(self._in_flight),
+                'coalesced_rate': self.followers / requests_seen if requests_seen else 0.0
+            }
+
+
+_coalescer = RequestCoalescer()
+
+
+def get_coalescer() -> RequestCoalescer:
+    """Get the request coalescer shared by every session in this process"""
+    return _coalescer
@@ -0,0 +1,284 @@
+"""
+HTTP transport for StudyMate
+Keep-alive connection pools shared by every LLM provider client
+Hackathon Project - TripleMind Team
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# Seconds to establish a connection, and to wait for each read (for streams, between pieces)
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT = 30.0
+
+# Hosts with a cached pool, and kept-alive connections per host
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 20
+
+_transport: Optional["HTTPTransport"] = None
+_transport_lock = threading.Lock()
+
+
+class HTTP2Response:
+    """
+    requests-style view of an httpx response
+
+    Exposes what the provider clients use (status_code, text, json(),
+    iter_lines(), raise_for_status(), use as a context manager) and raises
+    requests exceptions, so callers do not depend on the HTTP version.
+    """
+
+    def __init__(self, response):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.url = str(response.url)
+
+    @property
+    def text(self) -> str:
+        with _requests_errors():
+            self._response.read()
+        return self._response.text
+
+    def json(self) -> Any:
+        with _requests_errors():
+            self._response.read()
+        return self._response.json()
+
+    def iter_lines(self):
+        """Lines of the body as bytes, like requests' iter_lines"""
+        with _requests_errors():
+            for line in self._response.iter_lines():
+                yield line.encode('utf-8')
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+    def close(self):
+        self._response.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+@contextmanager
+def _requests_errors():
+    """Re-raise httpx transport errors as the requests exceptions the clients handle"""
+    import httpx
+    try:
+        yield
+    except httpx.TimeoutException as e:
+        raise requests.exceptions.Timeout(str(e)) from e
+    except httpx.TransportError as e:
+        raise requests.exceptions.ConnectionError(str(e)) from e
+
+
+class CountingHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose connection pools report each connection they open
+
+    Counting as connections open keeps the counts of hosts whose pool the
+    pool manager has since evicted (it keeps `pool_connections` hosts).
+    """
+
+    def __init__(self, on_new_connection: Callable[[str], None], **kwargs):
+        # Set first: HTTPAdapter.__init__ creates the pool manager
+        self._on_new_connection = on_new_connection
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        on_new_connection = self._on_new_connection
+
+        class CountingHTTPConnectionPool(HTTPConnectionPool):
+            def _new_conn(self):
+                on_new_connection(_host_key(self.host, self.port, 80))
+                return super()._new_conn()
+
+        class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+            def _new_conn(self):
+                on_new_connection(_host_key(self.host, self.port, 443))
+                return super()._new_conn()
+
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': CountingHTTPConnectionPool,
+            'https': CountingHTTPSConnectionPool
+        }
+
+
+class HTTPTransport:
+    """
+    One set of keep-alive connection pools for every outbound API call
+
+    Calling requests.post directly opens a new connection per request, so
+    every answer paid DNS, TCP and TLS handshakes to Gemini, OpenRouter,
+    IAM or Watsonx. Requests made here reuse idle connections to the same
+    host, apply the same connect and read timeouts unless a call sets its
+    own, and are counted per host: requests, new connections (the rest
+    reused one) and time until the response headers arrived. With
+    `http2=True` and httpx installed (`pip install httpx[http2]`), requests
+    go over HTTP/2, which multiplexes concurrent streams to a host on one
+    connection.
+    """
+
+    def __init__(self, pool_connections: int = POOL_CONNECTIONS, pool_maxsize: int = POOL_MAXSIZE,
+                 connect_timeout: float = CONNECT_TIMEOUT, read_timeout: float = READ_TIMEOUT,
+                 http2: bool = False):
+        """Create the connection pools; no connection is opened until the first request"""
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._lock = threading.Lock()
+        self._host_stats: Dict[str, Dict[str, float]] = {}
+        self._http2_streams: Dict[str, set] = {}
+
+        self._client = None
+        if http2:
+            try:
+                import httpx
+                self._client = httpx.Client(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=pool_connections * pool_maxsize,
+                                        max_keepalive_connections=pool_maxsize),
+                    timeout=httpx.Timeout(read_timeout, connect=connect_timeout)
+                )
+            except ImportError:
+                print("⚠️ HTTP/2 needs httpx with HTTP/2 support (pip install httpx[http2]); using HTTP/1.1")
+        self.http2 = self._client is not None
+
+        self._session = requests.Session()
+        self._adapter = CountingHTTPAdapter(self._connection_opened, pool_connections=pool_connections,
+                                            pool_maxsize=pool_maxsize)
+        self._session.mount('https://', self._adapter)
+        self._session.mount('http://', self._adapter)
+
+    def _timeout(self, timeout) -> Tuple[float, float]:
+        """(connect, read) timeout of a call; a single number sets the read timeout"""
+        if timeout is None:
+            return self.connect_timeout, self.read_timeout
+        if isinstance(timeout, tuple):
+            return timeout
+        return self.connect_timeout, timeout
+
+    def post(self, url: str, timeout=None, stream: bool = False, **kwargs):
+        """
+        POST through the shared pools, with the same arguments as requests.post
+
+        Args:
+            url (str): Request URL
+            timeout: None for the transport's timeouts, a read timeout, or (connect, read)
+            stream (bool): Return before the body is read, for iter_lines()
+
+        Returns:
+            A requests response, or a requests-style HTTP2Response over HTTP/2
+        """
+        host = urlsplit(url).netloc
+        connect_timeout, read_timeout = self._timeout(timeout)
+        start_time = time.perf_counter()
+        try:
+            if self._client is not None:
+                response = self._post_http2(url, host, connect_timeout, read_timeout, stream, **kwargs)
+            else:
+                response = self._session.post(url, timeout=(connect_timeout, read_timeout),
+                                              stream=stream, **kwargs)
+        except Exception:
+            self._record(host, None)
+            raise
+        self._record(host, time.perf_counter() - start_time)
+        return response
+
+    def _post_http2(self, url, host, connect_timeout, read_timeout, stream, **kwargs):
+        import httpx
+        with _requests_errors():
+            request = self._client.build_request(
+                'POST', url,
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout), **kwargs
+            )
+            response = self._client.send(request, stream=True)
+            # Streams are told apart by their network connection, to count new connections
+            network_stream = response.extensions.get('network_stream')
+            with self._lock:
+                seen = self._http2_streams.setdefault(host, set())
+                new_stream = network_stream is not None and id(network_stream) not in seen
+                if new_stream:
+                    seen.add(id(network_stream))
+            if new_stream:
+                self._connection_opened(host)
+            if not stream:
+                response.read()
+        return HTTP2Response(response)
+
+    def _record(self, host: str, seconds: Optional[float]):
+        with self._lock:
+            host_stats = self._host_stats.setdefault(host, _empty_host_stats())
+            host_stats['requests'] += 1
+            if seconds is None:
+                host_stats['errors'] += 1
+            else:
+                host_stats['total_seconds'] += seconds
+                host_stats['max_seconds'] = max(host_stats['max_seconds'], seconds)
+
+    def _connection_opened(self, host: str):
+        """Count a new connection to a host, as it is opened"""
+        with self._lock:
+            self._host_stats.setdefault(host, _empty_host_stats())['new_connections'] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get per-host request counts, connection reuse rate and latency until response headers"""
+        with self._lock:
+            hosts = {}
+            for host, host_stats in self._host_stats.items():
+                requests_made = int(host_stats['requests'])
+                opened = host_stats['new_connections']
+                completed = requests_made - int(host_stats['errors'])
+                hosts[host] = {
+                    'requests': requests_made,
+                    'errors': int(host_stats['errors']),
+                    'new_connections': int(opened),
+                    'reuse_rate': max(completed - opened, 0) / completed if completed else 0.0,
+                    'avg_ms': round(host_stats['total_seconds'] / completed * 1000, 1) if completed else None,
+                    'max_ms': round(host_stats['max_seconds'] * 1000, 1) if completed else None
+                }
+            return {
+                'http2': self.http2,
+                'pool_maxsize': self.pool_maxsize,
+                'connect_timeout': self.connect_timeout,
+                'read_timeout': self.read_timeout,
+                'hosts': hosts
+            }
+
+
+def _host_key(host: str, port: Optional[int], default_port: int) -> str:
+    """Host as it appears in a request URL's netloc (with the port only if it is not the default)"""
+    return host if port in (None, default_port) else f"{host}:{port}"
+
+
+def _empty_host_stats() -> Dict[str, float]:
+    return {'requests': 0, 'errors': 0, 'new_connections': 0, 'total_seconds': 0.0, 'max_seconds': 0.0}
+
+
+def get_transport() -> HTTPTransport:
+    """Get the HTTP transport shared by every provider client in this process"""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = HTTPTransport(
+                pool_connections=int(os.getenv('HTTP_POOL_CONNECTIONS', POOL_CONNECTIONS)),
+                pool_maxsize=int(os.getenv('HTTP_POOL_MAXSIZE', POOL_MAXSIZE)),
+                connect_timeout=float(os.getenv('HTTP_CONNECT_TIMEOUT', CONNECT_TIMEOUT)),
+                read_timeout=float(os.getenv('HTTP_READ_TIMEOUT', READ_TIMEOUT)),
+                http2=os.getenv('HTTP2', 'false').lower() in ('1', 'true', 'yes')
+            )
+        return _transport
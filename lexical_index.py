@@ -0,0 +1,254 @@
+"""
+Lexical search for StudyMate
+Incremental in-memory BM25 inverted index and reciprocal rank fusion
+Hackathon Project - TripleMind Team
+"""
+
+import math
+import re
+import threading
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+
+# Words, and compounds such as course codes, acronyms and dotted names ("CS-101", "U.S.A.", "H2O.2")
+TOKEN_PATTERN = re.compile(r'\w+(?:[-./]\w+)*')
+COMPOUND_SEPARATORS = re.compile(r'[-./]')
+
+STOP_WORDS = frozenset(
+    "a an and are as at be but by for from has have he her his i if in into is it its "
+    "of on or she so that the their them then there these they this to was we were what "
+    "when where which who will with you your".split()
+)
+
+# Rank offset of reciprocal rank fusion; 60 is the value from the original paper
+RRF_K = 60
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase index terms
+
+    Args:
+        text (str): Chunk text or query
+
+    Returns:
+        List[str]: Words and joined compounds, without stop words
+    """
+    terms = TOKEN_PATTERN.findall(text.lower())
+    compounds = [term for term in terms if not term.isalnum() and COMPOUND_SEPARATORS.search(term)]
+    if compounds:
+        # Index each part and the joined form, so "CS101" finds "CS-101" and "cs" finds both
+        compound_set = set(compounds)
+        terms = [term for term in terms if term not in compound_set]
+        for compound in compounds:
+            terms.extend(COMPOUND_SEPARATORS.split(compound))
+            terms.append(COMPOUND_SEPARATORS.sub('', compound))
+    return [term for term in terms if term not in STOP_WORDS]
+
+
+class BM25Index:
+    """
+    Okapi BM25 over an inverted index that grows with every add
+
+    Documents are identified by caller-chosen integer IDs (the engine uses
+    vector IDs), which must be added in increasing order. Postings are
+    compact C arrays of (row, term frequency) pairs, so a query only touches
+    the postings of its own terms. Removed documents are masked at query
+    time and dropped from the postings once they are half of the index.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """Create an empty index with the given BM25 parameters"""
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._postings: Dict[str, Tuple[array, array]] = {}  # term -> (rows, term frequencies)
+        self._doc_ids = array('q')
+        self._doc_lengths = array('i')
+        self._live = bytearray()
+        self._live_count = 0
+        self._live_length = 0
+
+    def __len__(self) -> int:
+        return self._live_count
+
+    def add(self, doc_ids: Sequence[int], texts: Iterable[str]):
+        """Index texts under the given IDs (larger than any ID already added)"""
+        with self._lock:
+            for doc_id, text in zip(doc_ids, texts):
+                self._add_document(int(doc_id), Counter(tokenize(text)))
+
+    def _add_document(self, doc_id: int, term_counts: Counter):
+        if self._doc_ids and doc_id <= self._doc_ids[-1]:
+            raise ValueError(f"Document IDs must be added in increasing order, got {doc_id}")
+        row = len(self._doc_ids)
+        length = sum(term_counts.values())
+        self._doc_ids.append(doc_id)
+        self._doc_lengths.append(length)
+        self._live.append(1)
+        self._live_count += 1
+        self._live_length += length
+
+        for term, count in term_counts.items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = (array('i'), array('i'))
+            posting[0].append(row)
+            posting[1].append(count)
+
+    def _rows_of(self, doc_ids) -> np.ndarray:
+        """Rows of the given IDs that are in the index"""
+        known = np.frombuffer(self._doc_ids, dtype=np.int64)
+        doc_ids = np.asarray(doc_ids, dtype=np.int64)
+        rows = np.searchsorted(known, doc_ids)
+        inside = rows < len(known)
+        rows = rows[inside]
+        return rows[known[rows] == doc_ids[inside]]
+
+    def remove(self, doc_ids) -> int:
+        """Remove documents by ID, returning how many were in the index"""
+        with self._lock:
+            removed = 0
+            for row in self._rows_of(doc_ids).tolist():
+                if self._live[row]:
+                    self._live[row] = 0
+                    self._live_count -= 1
+                    self._live_length -= self._doc_lengths[row]
+                    removed += 1
+
+            if self._live_count * 2 < len(self._doc_ids):
+                self._compact()
+            return removed
+
+    def _compact(self):
+        """Drop removed documents from the postings and renumber the rows"""
+        live = np.frombuffer(self._live, dtype=bool).copy()
+        new_rows = np.cumsum(live, dtype=np.int64) - 1
+        postings = self._postings
+        doc_ids = np.frombuffer(self._doc_ids, dtype=np.int64)[live]
+        doc_lengths = np.frombuffer(self._doc_lengths, dtype=np.int32)[live]
+
+        self._reset()
+        self._doc_ids.frombytes(doc_ids.tobytes())
+        self._doc_lengths.frombytes(doc_lengths.tobytes())
+        self._live = bytearray(b'\x01' * len(doc_ids))
+        self._live_count = len(doc_ids)
+        self._live_length = int(doc_lengths.sum())
+
+        for term, (rows, counts) in postings.items():
+            rows = np.frombuffer(rows, dtype=np.int32)
+            keep = live[rows]
+            if keep.any():
+                self._postings[term] = (array('i', new_rows[rows[keep]].astype(np.int32).tobytes()),
+                                        array('i', np.frombuffer(counts, dtype=np.int32)[keep].tobytes()))
+
+    def search(self, query: str, top_k: int, candidate_ids=None) -> List[Tuple[int, float]]:
+        """
+        Best-matching documents for a query
+
+        Args:
+            query (str): Query text
+            top_k (int): Number of results
+            candidate_ids: If given, only these document IDs are considered
+
+        Returns:
+            List[Tuple[int, float]]: (document ID, BM25 score), best first
+        """
+        terms = set(tokenize(query))
+        if not terms or top_k <= 0:
+            return []
+        with self._lock:
+            return self._search(terms, top_k, candidate_ids)
+
+    def _search(self, terms: Iterable[str], top_k: int, candidate_ids) -> List[Tuple[int, float]]:
+        # Buffers of the arrays are only viewed while the lock is held
+        if not self._live_count:
+            return []
+        n_docs = self._live_count
+        average_length = self._live_length / n_docs
+        doc_lengths = np.frombuffer(self._doc_lengths, dtype=np.int32)
+
+        # Every query term is scored; IDF already makes common terms count for little
+        postings = [self._postings[term] for term in terms if term in self._postings]
+        matched_rows, matched_scores = [], []
+        for posting in postings:
+            rows = np.frombuffer(posting[0], dtype=np.int32)
+            counts = np.frombuffer(posting[1], dtype=np.int32).astype(np.float32)
+            # Postings of removed documents still count until the next compaction
+            df = min(len(rows), n_docs)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * doc_lengths[rows] / average_length)
+            matched_rows.append(rows)
+            matched_scores.append(idf * counts * (self.k1 + 1) / (counts + norm))
+
+        if not matched_rows:
+            return []
+
+        rows = np.concatenate(matched_rows)
+        scores = np.concatenate(matched_scores)
+        n_rows = len(self._doc_ids)
+        if len(rows) * 8 > n_rows:
+            # Common terms: summing into one slot per document is cheapest
+            totals = np.bincount(rows, weights=scores, minlength=n_rows)
+            rows = np.flatnonzero(totals)
+            scores = totals[rows]
+        else:
+            # Rare terms: sum over the matched postings only, never over the whole corpus
+            rows, inverse = np.unique(rows, return_inverse=True)
+            scores = np.bincount(inverse, weights=scores)
+
+        keep = np.frombuffer(self._live, dtype=bool)[rows]
+        if candidate_ids is not None:
+            candidates = np.zeros(n_rows, dtype=bool)
+            candidates[self._rows_of(candidate_ids)] = True
+            keep &= candidates[rows]
+        rows, scores = rows[keep], scores[keep]
+
+        if len(rows) > top_k:
+            best = np.argpartition(-scores, top_k - 1)[:top_k]
+            rows, scores = rows[best], scores[best]
+        order = np.argsort(-scores, kind='stable')
+        doc_ids = np.frombuffer(self._doc_ids, dtype=np.int64)[rows[order]]
+        return list(zip(doc_ids.tolist(), scores[order].tolist()))
+
+    def stats(self) -> Dict:
+        """Get the size of the index"""
+        with self._lock:
+            postings = sum(len(rows) for rows, _ in self._postings.values())
+            return {
+                'documents': self._live_count,
+                'removed_documents': len(self._doc_ids) - self._live_count,
+                'terms': len(self._postings),
+                'postings': postings,
+                'memory_bytes': postings * 8 + len(self._doc_ids) * 13
+            }
+
+
+def reciprocal_rank_fusion(rankings: List[List[int]], k: int = RRF_K,
+                           weights: Optional[List[float]] = None) -> List[Tuple[int, float]]:
+    """
+    Fuse several rankings of the same documents into one
+
+    Each document scores sum(weight / (k + rank)) over the rankings it
+    appears in, so agreement between rankings matters more than the raw
+    scores, which are not comparable across rankers.
+
+    Args:
+        rankings (List[List[int]]): Document IDs of each ranking, best first
+        k (int): Rank offset; larger values flatten the difference between ranks
+        weights (Optional[List[float]]): Weight of each ranking (default 1.0 each)
+
+    Returns:
+        List[Tuple[int, float]]: (document ID, fused score), best first
+    """
+    weights = weights or [1.0] * len(rankings)
+    fused: Dict[int, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, doc_id in enumerate(ranking, start=1):
+            fused[doc_id] = fused.get(doc_id, 0.0) + weight / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
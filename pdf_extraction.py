@@ -0,0 +1,338 @@
+"""
+PDF text extraction for StudyMate
+Bounded-memory, parallel extraction across documents and page ranges with PyMuPDF
+Hackathon Project - TripleMind Team
+"""
+
+import os
+import hashlib
+import shutil
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+import fitz  # PyMuPDF
+
+# Plain text only: no images, ligatures expanded, no CID fallback glyphs
+TEXT_FLAGS = fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_MEDIABOX_CLIP
+
+# Pages read before MuPDF's object store (fonts, decoded streams) is emptied
+STORE_SHRINK_INTERVAL = 50
+
+
+def get_extraction_workers() -> int:
+    """
+    Number of extraction processes to use
+
+    Returns:
+        int: PDF_EXTRACTION_WORKERS from the environment, default one per CPU core
+    """
+    return max(1, int(os.getenv('PDF_EXTRACTION_WORKERS', os.cpu_count() or 1)))
+
+
+def spool_to_temp_file(pdf_file) -> str:
+    """
+    Copy an uploaded file object to a temporary file in fixed-size blocks
+
+    Args:
+        pdf_file: File-like object (e.g. a Streamlit UploadedFile)
+
+    Returns:
+        str: Path of the temporary PDF file (the caller removes it)
+    """
+    if hasattr(pdf_file, 'seek'):
+        pdf_file.seek(0)
+    with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp:
+        shutil.copyfileobj(pdf_file, tmp, length=1024 * 1024)
+        return tmp.name
+
+
+def content_hash(pdf_file) -> str:
+    """Hash of an uploaded file's bytes, read in 1 MB blocks"""
+    digest = hashlib.blake2b(digest_size=16)
+    pdf_file.seek(0)
+    for block in iter(lambda: pdf_file.read(1024 * 1024), b''):
+        digest.update(block)
+    pdf_file.seek(0)
+    return digest.hexdigest()
+
+
+@contextmanager
+def pdf_path(pdf_source) -> Iterator[str]:
+    """
+    Path of a PDF on disk, spooling file objects to a temporary file
+
+    PyMuPDF reads pages from the file on demand, so the whole upload is
+    never held in memory as one bytes object.
+
+    Args:
+        pdf_source: Path of a PDF file, or a file-like object (e.g. a Streamlit UploadedFile)
+
+    Yields:
+        str: Path of the PDF (a spooled copy is removed on exit)
+    """
+    if isinstance(pdf_source, (str, os.PathLike)):
+        yield os.fspath(pdf_source)
+        return
+
+    path = spool_to_temp_file(pdf_source)
+    try:
+        yield path
+    finally:
+        os.remove(path)
+
+
+def page_text(page) -> str:
+    """
+    Text of one page using the fast text-only extraction flags
+
+    Args:
+        page: PyMuPDF page
+
+    Returns:
+        str: Raw page text
+    """
+    return page.get_text("text", flags=TEXT_FLAGS)
+
+
+def extract_page_range(path: str, start: int, end: int) -> List[str]:
+    """
+    Extract the text of pages [start, end) of a PDF
+
+    Args:
+        path (str): Path of the PDF file
+        start (int): First page index (0-based)
+        end (int): Page index after the last page
+
+    Returns:
+        List[str]: Raw text of each page, in page order
+    """
+    doc = fitz.open(path)
+    try:
+        return [page_text(doc.load_page(page_num)) for page_num in range(start, end)]
+    finally:
+        doc.close()
+
+
+def _page_ranges(page_count: int, pages_per_task: int) -> List[Tuple[int, int]]:
+    return [(start, min(start + pages_per_task, page_count)) for start in range(0, page_count, pages_per_task)]
+
+
+def iter_pages(path: str, pool: Optional[ProcessPoolExecutor] = None,
+               pages_per_task: int = 50, max_in_flight: int = 4) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (page number, text) for each page of a PDF, in page order
+
+    Pages are read lazily from the file. With a process pool, page ranges
+    are extracted in parallel but at most max_in_flight ranges are pending
+    at once, so memory stays bounded. Without one, MuPDF's object store is
+    emptied every STORE_SHRINK_INTERVAL pages.
+
+    Args:
+        path (str): Path of the PDF file
+        pool (Optional[ProcessPoolExecutor]): Pool for parallel extraction, or None for serial
+        pages_per_task (int): Pages per parallel task
+        max_in_flight (int): Maximum pending page ranges
+
+    Yields:
+        Tuple[int, str]: 1-based page number and raw page text
+    """
+    with fitz.open(path) as doc:
+        page_count = len(doc)
+        if pool is None:
+            for page_num in range(page_count):
+                yield page_num + 1, page_text(doc.load_page(page_num))
+                if (page_num + 1) % STORE_SHRINK_INTERVAL == 0:
+                    fitz.TOOLS.store_shrink(100)
+            return
+
+    pending = deque()
+    try:
+        for start, end in _page_ranges(page_count, pages_per_task):
+            pending.append((start, pool.submit(extract_page_range, path, start, end)))
+            if len(pending) >= max_in_flight:
+                range_start, future = pending.popleft()
+                for offset, text in enumerate(future.result()):
+                    yield range_start + offset + 1, text
+        while pending:
+            range_start, future = pending.popleft()
+            for offset, text in enumerate(future.result()):
+                yield range_start + offset + 1, text
+    finally:
+        # Abandoned early (e.g. a page range failed): don't extract the rest
+        for _, future in pending:
+            future.cancel()
+
+
+def iter_document_pages(sources: List, pool: Optional[ProcessPoolExecutor] = None, pages_per_task: int = 50,
+                        max_in_flight: int = 4) -> Iterator[Tuple[int, Optional[Tuple[int, str]], Optional[Exception]]]:
+    """
+    Pages of several PDFs, in document then page order, skipping documents that cannot be read
+
+    With a process pool, page ranges of every document are queued on the
+    same pool, so a batch of many small PDFs keeps every worker busy rather
+    than only the ranges of one document. At most max_in_flight ranges are
+    pending at once and only documents with pending ranges are spooled, so
+    memory and temporary disk use stay bounded.
+
+    Args:
+        sources (List): Paths of PDF files or file-like objects (e.g. Streamlit UploadedFiles)
+        pool (Optional[ProcessPoolExecutor]): Pool for parallel extraction, or None for serial
+        pages_per_task (int): Pages per parallel task
+        max_in_flight (int): Maximum pending page ranges
+
+    Yields:
+        Tuple[int, Optional[Tuple[int, str]], Optional[Exception]]: Index of the document in sources, and
+            (1-based page number, raw page text) for each page, None once all its pages were yielded, or
+            None and the error if it could not be read (nothing more is yielded for it)
+    """
+    if pool is None:
+        for index, source in enumerate(sources):
+            try:
+                with pdf_path(source) as path:
+                    for page in iter_pages(path):
+                        yield index, page, None
+            except Exception as e:
+                yield index, None, e
+                continue
+            yield index, None, None
+        return
+
+    spooled: Dict[int, str] = {}
+    failed = set()
+    # (index, first page, future) for each page range, (index, None, error) or (index, None, None)
+    pending = deque()
+
+    def release(index: int):
+        path = spooled.pop(index, None)
+        if path is not None and not isinstance(sources[index], (str, os.PathLike)):
+            os.remove(path)
+
+    def queue_documents() -> Iterator[None]:
+        """Queue each document's page ranges, pausing whenever the pending window is full"""
+        for index, source in enumerate(sources):
+            try:
+                path = spooled[index] = (os.fspath(source) if isinstance(source, (str, os.PathLike))
+                                         else spool_to_temp_file(source))
+                with fitz.open(path) as doc:
+                    page_count = len(doc)
+            except Exception as e:
+                release(index)
+                pending.append((index, None, e))
+                yield
+                continue
+            for start, end in _page_ranges(page_count, pages_per_task):
+                if index in failed:
+                    break
+                pending.append((index, start, pool.submit(extract_page_range, path, start, end)))
+                yield
+            pending.append((index, None, None))
+            yield
+
+    def ready() -> Iterator[Tuple[int, Optional[Tuple[int, str]], Optional[Exception]]]:
+        index, start, payload = pending.popleft()
+        if index in failed:
+            if isinstance(payload, Future):
+                payload.cancel()
+            elif payload is None:
+                release(index)
+            return
+        if start is None:
+            if payload is None:
+                release(index)
+            yield index, None, payload
+            return
+        try:
+            page_texts = payload.result()
+        except Exception as e:
+            # Later ranges of this document are dropped as they come up
+            failed.add(index)
+            yield index, None, e
+            return
+        for offset, text in enumerate(page_texts):
+            yield index, (start + offset + 1, text), None
+
+    try:
+        for _ in queue_documents():
+            while sum(isinstance(payload, Future) for _, _, payload in pending) >= max_in_flight:
+                yield from ready()
+        while pending:
+            yield from ready()
+    finally:
+        # Abandoned early: don't extract the rest, and remove spooled copies once no worker reads them
+        for _, _, payload in pending:
+            if isinstance(payload, Future):
+                payload.cancel()
+        for _, _, payload in pending:
+            if isinstance(payload, Future) and not payload.cancelled():
+                wait([payload])
+        for index in list(spooled):
+            release(index)
+
+
+def extract_documents(files: List[Tuple[str, object]], workers: Optional[int] = None,
+                      pages_per_task: Optional[int] = None) -> Tuple[Dict[str, List[str]], Dict]:
+    """
+    Extract page texts from several PDFs in parallel
+
+    Large documents are split into page ranges so one big textbook can use
+    every worker. Results are reassembled in page order regardless of the
+    order in which workers finish.
+
+    Args:
+        files (List[Tuple[str, object]]): (name, file-like object) pairs
+        workers (Optional[int]): Worker processes, default get_extraction_workers()
+        pages_per_task (Optional[int]): Pages per task, default PDF_PAGES_PER_TASK or 50
+
+    Returns:
+        Tuple[Dict[str, List[str]], Dict]: Page texts per document name, and throughput stats
+    """
+    if not files:
+        return {}, {}
+
+    workers = workers or get_extraction_workers()
+    pages_per_task = pages_per_task or int(os.getenv('PDF_PAGES_PER_TASK', 50))
+    start_time = time.perf_counter()
+
+    paths = {}
+    tasks = []  # (name, start, end)
+    pages: Dict[str, List[str]] = {}
+    try:
+        for name, pdf_file in files:
+            try:
+                paths[name] = spool_to_temp_file(pdf_file)
+                with fitz.open(paths[name]) as doc:
+                    page_count = len(doc)
+            except Exception as e:
+                print(f"❌ Error opening {name}: {str(e)}")
+                continue
+            pages[name] = [''] * page_count
+            tasks.extend((name, start, end) for start, end in _page_ranges(page_count, pages_per_task))
+
+        if workers <= 1 or len(tasks) <= 1:
+            results = [extract_page_range(paths[name], start, end) for name, start, end in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+                futures = [pool.submit(extract_page_range, paths[name], start, end) for name, start, end in tasks]
+                results = [future.result() for future in futures]
+
+        for (name, start, end), page_texts in zip(tasks, results):
+            pages[name][start:end] = page_texts
+    finally:
+        for path in paths.values():
+            os.remove(path)
+
+    elapsed = time.perf_counter() - start_time
+    total_pages = sum(len(page_texts) for page_texts in pages.values())
+    stats = {
+        'documents': len(pages),
+        'pages': total_pages,
+        'workers': workers,
+        'seconds': round(elapsed, 3),
+        'pages_per_second': round(total_pages / elapsed, 1) if elapsed > 0 else 0.0
+    }
+    print(f"📄 Extracted {total_pages} pages from {len(pages)} documents "
+          f"in {elapsed:.2f}s ({stats['pages_per_second']} pages/sec, {workers} workers)")
+    return pages, stats
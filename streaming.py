@@ -0,0 +1,98 @@
+"""
+Streaming helpers for StudyMate
+Server-sent event parsing and latency measurement for streamed LLM answers
+Hackathon Project - TripleMind Team
+"""
+
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+def iter_sse_data(response) -> Iterator[str]:
+    """
+    Data payloads of a server-sent event stream, as they arrive
+
+    Used for Gemini (`alt=sse`), OpenRouter (`stream: true`) and Watsonx
+    (`generation_stream`). Comment lines (OpenRouter's keep-alives) and the
+    OpenAI-style `[DONE]` terminator are skipped. Lines are decoded as UTF-8
+    here because requests assumes ISO-8859-1 for text/event-stream.
+
+    Args:
+        response: Streaming requests response (`stream=True`)
+
+    Yields:
+        str: The data of each event (multi-line data joined with newlines)
+    """
+    data_lines: List[str] = []
+    for raw_line in response.iter_lines():
+        line = raw_line.decode('utf-8')
+        if not line:
+            # A blank line ends the event
+            if data_lines:
+                data = '\n'.join(data_lines)
+                data_lines = []
+                if data != '[DONE]':
+                    yield data
+            continue
+        if line.startswith(':'):
+            continue
+        field, _, value = line.partition(':')
+        if field == 'data':
+            data_lines.append(value[1:] if value.startswith(' ') else value)
+
+    if data_lines and '\n'.join(data_lines) != '[DONE]':
+        yield '\n'.join(data_lines)
+
+
+class TimedStream:
+    """
+    Iterates a stream of text pieces, recording time to first token and total time
+
+    The clock starts when iteration starts, which is when a lazy provider
+    generator sends its request. `result` holds the wrapped generator's
+    return value once it ended (provider streams return True when the
+    answer completed).
+    """
+
+    def __init__(self, pieces: Iterable[str]):
+        """Wrap an iterable of text pieces"""
+        self._pieces = pieces
+        self.parts: List[str] = []
+        self.first_token_seconds: Optional[float] = None
+        self.total_seconds: Optional[float] = None
+        self.result: Any = None
+
+    def __iter__(self) -> Iterator[str]:
+        start_time = time.perf_counter()
+        pieces = iter(self._pieces)
+        try:
+            while True:
+                try:
+                    piece = next(pieces)
+                except StopIteration as stop:
+                    self.result = stop.value
+                    return
+                if not piece:
+                    continue
+                if self.first_token_seconds is None:
+                    self.first_token_seconds = time.perf_counter() - start_time
+                self.parts.append(piece)
+                yield piece
+        finally:
+            # Stopping early closes the provider stream (and its connection) right away
+            close = getattr(pieces, 'close', None)
+            if close is not None:
+                close()
+            self.total_seconds = time.perf_counter() - start_time
+
+    @property
+    def text(self) -> str:
+        """Everything received so far"""
+        return ''.join(self.parts)
+
+    def timings(self) -> Dict[str, Optional[float]]:
+        """Time to first token and total time in seconds (None if not reached)"""
+        return {
+            'first_token_seconds': round(self.first_token_seconds, 2) if self.first_token_seconds is not None else None,
+            'total_seconds': round(self.total_seconds, 2) if self.total_seconds is not None else None
+        }
@@ -4,10 +4,11 @@ Hackathon Project - TripleMind Team
 """
 
 import os
-import requests
 import json
 from typing import Dict, List, Optional
 from dotenv import load_dotenv
+from chunking import chunk_characters
+from http_transport import get_transport
 
 # Load environment variables
 load_dotenv()
@@ -53,7 +54,7 @@ class WatsonxClient:
                 'prompt': f"Context: {context}\n\nQuestion: {prompt}\n\nAnswer:"
             }
             
-            response = requests.post(self.url, headers=headers, json=data, timeout=30)
+            response = get_transport().post(self.url, headers=headers, json=data)
             
             if response.status_code == 200:
                 result = response.json()
@@ -89,7 +90,7 @@ class WatsonxClient:
                 'prompt': "Test connection"
             }
             
-            response = requests.post(self.url, headers=headers, json=data, timeout=10)
+            response = get_transport().post(self.url, headers=headers, json=data, timeout=10)
             return response.status_code == 200
             
         except Exception as e:
@@ -130,8 +131,8 @@ def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 200) -> List[st
     
     Args:
         text (str): Input text to chunk
-        chunk_size (int): Size of each chunk
-        overlap (int): Overlap between chunks
+        chunk_size (int): Maximum size of each chunk in characters
+        overlap (int): Maximum characters repeated from the previous chunk
         
     Returns:
         List[str]: List of text chunks
@@ -139,29 +140,7 @@ def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 200) -> List[st
     if len(text) <= chunk_size:
         return [text]
     
-    chunks = []
-    start = 0
-    
-    while start < len(text):
-        end = start + chunk_size
-        
-        # Try to break at sentence boundary
-        if end < len(text):
-            # Look for sentence endings
-            for i in range(end, max(start, end - 100), -1):
-                if text[i] in '.!?':
-                    end = i + 1
-                    break
-        
-        chunk = text[start:end].strip()
-        if chunk:
-            chunks.append(chunk)
-        
-        start = end - overlap
-        if start >= len(text):
-            break
-    
-    return chunks
+    return list(chunk_characters(text, chunk_size, overlap))
 
 def extract_metadata_from_filename(filename: str) -> Dict[str, str]:
     """